@@ -99,6 +99,27 @@ class TestValues:
 # Import the unified decoder
 import sys
 from pathlib import Path
+
+
+def _fallback_decode_hierarchical_voltage(digital_value: int, platform_range_mv: float = 5000.0):
+    """Fallback decoder implementation (same results as tools/decoder/hierarchical_decoder.py)"""
+    fault = digital_value < 0
+    magnitude = abs(digital_value)
+    base_state = magnitude // 200
+    remainder = magnitude % 200
+    # Smallest status_lower with (status_lower * 100) // 128 == offset, i.e.
+    # hierarchical_offset_table.OFFSET_TO_STATUS (offsets past 99 clamp to 127)
+    status_lower = (min(remainder, 99) * 128 + 99) // 100
+    status = 0x80 | status_lower if fault else status_lower
+    voltage_mv = (digital_value / 32768.0) * platform_range_mv
+    return {
+        'state': base_state,
+        'status': status,
+        'fault': fault,
+        'voltage_mv': voltage_mv
+    }
+
+
 # Add tools/decoder to path for hierarchical_decoder
 tools_decoder = Path(__file__).parent.parent.parent.parent.parent.parent / "tools" / "decoder"
 if tools_decoder.exists():
@@ -106,21 +127,7 @@ if tools_decoder.exists():
     from hierarchical_decoder import decode_hierarchical_voltage, decode_oscilloscope_voltage
 else:
     # Fallback implementation if import fails
-    def decode_hierarchical_voltage(digital_value: int, platform_range_mv: float = 5000.0):
-        """Fallback decoder implementation"""
-        fault = digital_value < 0
-        magnitude = abs(digital_value)
-        base_state = magnitude // 200
-        remainder = magnitude % 200
-        status_lower = min(127, (remainder * 128 + 50) // 100) if remainder > 0 else 0
-        status = 0x80 | status_lower if fault else status_lower
-        voltage_mv = (digital_value / 32768.0) * platform_range_mv
-        return {
-            'state': base_state,
-            'status': status,
-            'fault': fault,
-            'voltage_mv': voltage_mv
-        }
+    decode_hierarchical_voltage = _fallback_decode_hierarchical_voltage
 
 
 # Voltage conversion utilities
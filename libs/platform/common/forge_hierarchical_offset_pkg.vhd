@@ -0,0 +1,62 @@
+------------------------------------------------------------------------------
+-- forge_hierarchical_offset_pkg.vhd
+--
+-- Status offset ROM for forge_hierarchical_encoder
+--
+-- Generated by: python -m forge_codegen.generator.type_utilities --offset-rom
+-- DO NOT EDIT: regenerate instead. tools/decoder/hierarchical_offset_table.py
+-- holds the same table for the Python decoder.
+--
+-- HIER_STATUS_OFFSET_ROM(s) = (s * 100) / 128 for status[6:0] = s, precomputed
+-- so the encoder needs no multiplier (a 128 x 7-bit ROM maps to LUTs).
+--
+-- Usage in the encoder:
+--     offset := hier_status_offset(status_vector(6 downto 0));
+------------------------------------------------------------------------------
+
+library IEEE;
+use IEEE.STD_LOGIC_1164.ALL;
+use IEEE.NUMERIC_STD.ALL;
+
+package forge_hierarchical_offset_pkg is
+
+    constant HIER_OFFSET_BITS : natural := 7;
+
+    type hier_offset_rom_t is array (0 to 127) of unsigned(HIER_OFFSET_BITS-1 downto 0);
+
+    constant HIER_STATUS_OFFSET_ROM : hier_offset_rom_t := (
+        to_unsigned( 0, 7), to_unsigned( 0, 7), to_unsigned( 1, 7), to_unsigned( 2, 7), to_unsigned( 3, 7), to_unsigned( 3, 7), to_unsigned( 4, 7), to_unsigned( 5, 7),  --   0..  7
+        to_unsigned( 6, 7), to_unsigned( 7, 7), to_unsigned( 7, 7), to_unsigned( 8, 7), to_unsigned( 9, 7), to_unsigned(10, 7), to_unsigned(10, 7), to_unsigned(11, 7),  --   8.. 15
+        to_unsigned(12, 7), to_unsigned(13, 7), to_unsigned(14, 7), to_unsigned(14, 7), to_unsigned(15, 7), to_unsigned(16, 7), to_unsigned(17, 7), to_unsigned(17, 7),  --  16.. 23
+        to_unsigned(18, 7), to_unsigned(19, 7), to_unsigned(20, 7), to_unsigned(21, 7), to_unsigned(21, 7), to_unsigned(22, 7), to_unsigned(23, 7), to_unsigned(24, 7),  --  24.. 31
+        to_unsigned(25, 7), to_unsigned(25, 7), to_unsigned(26, 7), to_unsigned(27, 7), to_unsigned(28, 7), to_unsigned(28, 7), to_unsigned(29, 7), to_unsigned(30, 7),  --  32.. 39
+        to_unsigned(31, 7), to_unsigned(32, 7), to_unsigned(32, 7), to_unsigned(33, 7), to_unsigned(34, 7), to_unsigned(35, 7), to_unsigned(35, 7), to_unsigned(36, 7),  --  40.. 47
+        to_unsigned(37, 7), to_unsigned(38, 7), to_unsigned(39, 7), to_unsigned(39, 7), to_unsigned(40, 7), to_unsigned(41, 7), to_unsigned(42, 7), to_unsigned(42, 7),  --  48.. 55
+        to_unsigned(43, 7), to_unsigned(44, 7), to_unsigned(45, 7), to_unsigned(46, 7), to_unsigned(46, 7), to_unsigned(47, 7), to_unsigned(48, 7), to_unsigned(49, 7),  --  56.. 63
+        to_unsigned(50, 7), to_unsigned(50, 7), to_unsigned(51, 7), to_unsigned(52, 7), to_unsigned(53, 7), to_unsigned(53, 7), to_unsigned(54, 7), to_unsigned(55, 7),  --  64.. 71
+        to_unsigned(56, 7), to_unsigned(57, 7), to_unsigned(57, 7), to_unsigned(58, 7), to_unsigned(59, 7), to_unsigned(60, 7), to_unsigned(60, 7), to_unsigned(61, 7),  --  72.. 79
+        to_unsigned(62, 7), to_unsigned(63, 7), to_unsigned(64, 7), to_unsigned(64, 7), to_unsigned(65, 7), to_unsigned(66, 7), to_unsigned(67, 7), to_unsigned(67, 7),  --  80.. 87
+        to_unsigned(68, 7), to_unsigned(69, 7), to_unsigned(70, 7), to_unsigned(71, 7), to_unsigned(71, 7), to_unsigned(72, 7), to_unsigned(73, 7), to_unsigned(74, 7),  --  88.. 95
+        to_unsigned(75, 7), to_unsigned(75, 7), to_unsigned(76, 7), to_unsigned(77, 7), to_unsigned(78, 7), to_unsigned(78, 7), to_unsigned(79, 7), to_unsigned(80, 7),  --  96..103
+        to_unsigned(81, 7), to_unsigned(82, 7), to_unsigned(82, 7), to_unsigned(83, 7), to_unsigned(84, 7), to_unsigned(85, 7), to_unsigned(85, 7), to_unsigned(86, 7),  -- 104..111
+        to_unsigned(87, 7), to_unsigned(88, 7), to_unsigned(89, 7), to_unsigned(89, 7), to_unsigned(90, 7), to_unsigned(91, 7), to_unsigned(92, 7), to_unsigned(92, 7),  -- 112..119
+        to_unsigned(93, 7), to_unsigned(94, 7), to_unsigned(95, 7), to_unsigned(96, 7), to_unsigned(96, 7), to_unsigned(97, 7), to_unsigned(98, 7), to_unsigned(99, 7)  -- 120..127
+    );
+
+    -- Offset (0..99) added to state * 200 for status[6:0]
+    function hier_status_offset(
+        status_lower : std_logic_vector(6 downto 0)
+    ) return unsigned;
+
+end package forge_hierarchical_offset_pkg;
+
+package body forge_hierarchical_offset_pkg is
+
+    function hier_status_offset(
+        status_lower : std_logic_vector(6 downto 0)
+    ) return unsigned is
+    begin
+        return HIER_STATUS_OFFSET_ROM(to_integer(unsigned(status_lower)));
+    end function;
+
+end package body forge_hierarchical_offset_pkg;
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+lazy_imports: shared lightweight entry layer for the scripts/ CLIs
+
+Heavy dependencies (pydantic models, moku, rich, loguru, zeroconf, yaml)
+are bound at module level as lazy proxies and only imported when a command
+first uses them, so `--help`, `list` and argument errors start fast.
+
+    from lazy_imports import lazy_import, lazy_attr, lazy_object
+
+    yaml = lazy_import("yaml")                          # module, body runs on first attribute access
+    logger = lazy_attr("loguru", "logger")              # object, imported on first use
+    MultiInstrument = lazy_attr("moku.instruments", "MultiInstrument",
+                                hint="moku library not installed. Run: uv sync")
+    console = lazy_object(lambda: lazy_attr("rich.console", "Console")())
+
+Only use lazy_attr for objects that are called or have attributes read;
+pass real objects (lazy_attr(...).resolve()) where identity or type
+matters, e.g. as pydantic field values or isinstance() targets.
+
+Measure with: python tools/forge-codegen/benchmarks/bench_import_time.py
+"""
+
+import importlib
+import importlib.util
+import sys
+from typing import Any, Callable, Optional
+
+
+def lazy_import(name: str):
+    """
+    Module `name`, executed on first attribute access (importlib LazyLoader).
+
+    Parent packages are imported eagerly, so prefer top-level or light
+    parent packages (e.g. "yaml", not "moku.instruments").
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class lazy_object:
+    """
+    Proxy for the object returned by factory(), created on first use
+    (attribute access or call).
+    """
+
+    __slots__ = ("_factory", "_value")
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_value", None)
+
+    def resolve(self) -> Any:
+        """The real object (created on first call)."""
+        factory = object.__getattribute__(self, "_factory")
+        if factory is not None:
+            object.__setattr__(self, "_value", factory())
+            object.__setattr__(self, "_factory", None)
+        return object.__getattribute__(self, "_value")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.resolve(), name, value)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        if object.__getattribute__(self, "_factory") is not None:
+            return "<lazy (not loaded)>"
+        return repr(self.resolve())
+
+
+def lazy_attr(module: str, name: str, hint: Optional[str] = None) -> lazy_object:
+    """
+    Proxy for `from module import name`, imported on first use.
+
+    If hint is given, a missing module prints "Error: <hint>" and exits(1)
+    (the scripts' behaviour for missing optional packages) instead of
+    raising ImportError.
+    """
+    def load() -> Any:
+        try:
+            return getattr(importlib.import_module(module), name)
+        except ImportError:
+            if hint is None:
+                raise
+            print(f"Error: {hint}", file=sys.stderr)
+            sys.exit(1)
+
+    return lazy_object(load)
@@ -41,27 +41,29 @@ from pathlib import Path
 from typing import Optional
 
 import typer
-import yaml
-from loguru import logger
-from rich.console import Console
-from rich.table import Table
-from zeroconf import ServiceBrowser, ServiceStateChange, Zeroconf
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / "libs" / "moku-models"))
 
-from moku_models import (
-    MokuConfig,
-    MokuConnection,
-    MokuDeviceCache,
-    MokuDeviceInfo,
-    SlotConfig,
-    MOKU_GO_PLATFORM,
-    MOKU_LAB_PLATFORM,
-    MOKU_PRO_PLATFORM,
-    MOKU_DELTA_PLATFORM,
-)
+# Heavy dependencies are imported on first use (see lazy_imports.py), so
+# --help, argument errors and `list` skip moku, zeroconf and loguru
+from lazy_imports import lazy_attr, lazy_import, lazy_object
+
+yaml = lazy_import("yaml")
+logger = lazy_attr("loguru", "logger")
+Console = lazy_attr("rich.console", "Console")
+Table = lazy_attr("rich.table", "Table")
+
+MokuConfig = lazy_attr("moku_models", "MokuConfig")
+MokuConnection = lazy_attr("moku_models", "MokuConnection")
+MokuDeviceCache = lazy_attr("moku_models", "MokuDeviceCache")
+MokuDeviceInfo = lazy_attr("moku_models", "MokuDeviceInfo")
+SlotConfig = lazy_attr("moku_models", "SlotConfig")
+MOKU_GO_PLATFORM = lazy_attr("moku_models", "MOKU_GO_PLATFORM")
+MOKU_LAB_PLATFORM = lazy_attr("moku_models", "MOKU_LAB_PLATFORM")
+MOKU_PRO_PLATFORM = lazy_attr("moku_models", "MOKU_PRO_PLATFORM")
+MOKU_DELTA_PLATFORM = lazy_attr("moku_models", "MOKU_DELTA_PLATFORM")
 
 # Platform string identifier to platform object mapping
 PLATFORM_MAP = {
@@ -92,12 +94,9 @@ PLATFORM_NAME_TO_OBJECT = {
 # Reverse mapping: platform_id -> platform name
 PLATFORM_ID_TO_NAME = {v: k for k, v in PLATFORM_ID_MAP.items()}
 
-try:
-    from moku.instruments import MultiInstrument
-    from moku import Moku
-except ImportError:
-    print("Error: moku library not installed. Run: uv sync")
-    sys.exit(1)
+MOKU_HINT = "moku library not installed. Run: uv sync"
+MultiInstrument = lazy_attr("moku.instruments", "MultiInstrument", hint=MOKU_HINT)
+Moku = lazy_attr("moku", "Moku", hint=MOKU_HINT)
 
 
 # Initialize Typer app
@@ -107,8 +106,8 @@ app = typer.Typer(
     add_completion=False,
 )
 
-# Initialize Rich console
-console = Console()
+# Initialize Rich console (created on first print)
+console = lazy_object(Console)
 
 # Cache file path
 CACHE_DIR = Path.home() / ".moku-deploy"
@@ -398,6 +397,8 @@ def display_state_diff(diff: dict) -> None:
 @app.command()
 def discover(timeout: int = typer.Option(2, help="Discovery timeout in seconds")):
     """Discover Moku devices on the network via zeroconf."""
+    from zeroconf import ServiceBrowser, ServiceStateChange, Zeroconf
+
     console.print("[bold blue]Discovering Moku devices...[/bold blue]")
 
     cache = MokuDeviceCache()
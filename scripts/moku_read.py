@@ -24,19 +24,20 @@ from typing import Any
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / "libs" / "moku-models"))
 
-from moku_models import MokuConfig, SlotConfig, MokuConnection
-from moku_models import (
-    MOKU_GO_PLATFORM,
-    MOKU_LAB_PLATFORM,
-    MOKU_PRO_PLATFORM,
-    MOKU_DELTA_PLATFORM,
-)
+# The models and the moku library are imported on first use (see
+# lazy_imports.py), so --help and argument errors return immediately
+from lazy_imports import lazy_attr
 
-try:
-    from moku.instruments import MultiInstrument, CloudCompile, Oscilloscope
-except ImportError:
-    print("Error: moku library not installed. Run: uv sync", file=sys.stderr)
-    sys.exit(1)
+MokuConfig = lazy_attr("moku_models", "MokuConfig")
+SlotConfig = lazy_attr("moku_models", "SlotConfig")
+MokuConnection = lazy_attr("moku_models", "MokuConnection")
+MOKU_GO_PLATFORM = lazy_attr("moku_models", "MOKU_GO_PLATFORM")
+MOKU_LAB_PLATFORM = lazy_attr("moku_models", "MOKU_LAB_PLATFORM")
+MOKU_PRO_PLATFORM = lazy_attr("moku_models", "MOKU_PRO_PLATFORM")
+MOKU_DELTA_PLATFORM = lazy_attr("moku_models", "MOKU_DELTA_PLATFORM")
+
+MultiInstrument = lazy_attr("moku.instruments", "MultiInstrument",
+                            hint="moku library not installed. Run: uv sync")
 
 
 def connect_politely(device_ip: str, force: bool = False) -> tuple[MultiInstrument, int] | None:
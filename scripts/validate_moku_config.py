@@ -8,14 +8,11 @@ Usage:
 
 import sys
 from pathlib import Path
-import yaml
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / "libs" / "moku-models"))
 
-from moku_models import MokuConfig, MOKU_GO_PLATFORM
-
 
 def validate_config(yaml_path: Path) -> tuple[bool, str]:
     """
@@ -24,6 +21,10 @@ def validate_config(yaml_path: Path) -> tuple[bool, str]:
     Returns:
         (success: bool, message: str)
     """
+    # Imported here so usage errors do not wait for yaml/pydantic
+    import yaml
+    from moku_models import MokuConfig, MOKU_GO_PLATFORM
+
     try:
         # Load YAML
         with open(yaml_path) as f:
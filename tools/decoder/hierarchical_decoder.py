@@ -12,6 +12,8 @@ Status: Production-ready
 import warnings
 from typing import Dict, Union
 
+from hierarchical_offset_table import OFFSET_TO_STATUS
+
 
 def decode_hierarchical_voltage(
     digital_value: int,
@@ -67,14 +69,11 @@ def decode_hierarchical_voltage(
     remainder = magnitude % 200
 
     # Decode status lower bits
-    # The encoder uses: offset = (status_lower * 100) / 128
-    # So we reverse: status_lower = (offset * 128) / 100
-    # Using integer arithmetic to match VHDL exactly
-    if remainder > 0:
-        # Round to nearest integer for better accuracy
-        status_lower = min(127, (remainder * 128 + 50) // 100)
-    else:
-        status_lower = 0
+    # The encoder looks up offset = (status_lower * 100) / 128 in the
+    # generated ROM (forge_hierarchical_offset_pkg); invert the same table
+    # so decode(encode(s)) re-encodes bit-exactly. Offsets past the table
+    # (noise) clamp to the last entry (status_lower = 127).
+    status_lower = OFFSET_TO_STATUS[min(remainder, len(OFFSET_TO_STATUS) - 1)]
 
     # Reconstruct full status byte
     if fault:
@@ -0,0 +1,31 @@
+"""
+Status offset table for forge_hierarchical_encoder (generated, DO NOT EDIT).
+
+Generated by `python -m forge_codegen.generator.type_utilities --offset-rom`
+from the same table as libs/platform/common/forge_hierarchical_offset_pkg.vhd.
+
+STATUS_OFFSET_ROM[s] is the encoder offset for status[6:0] = s
+((s * 100) // 128). OFFSET_TO_STATUS[offset] is the smallest status
+with that offset, so STATUS_OFFSET_ROM[OFFSET_TO_STATUS[o]] == o.
+"""
+
+STATUS_OFFSET_ROM = (
+      0,   0,   1,   2,   3,   3,   4,   5,   6,   7,   7,   8,   9,  10,  10,  11,
+     12,  13,  14,  14,  15,  16,  17,  17,  18,  19,  20,  21,  21,  22,  23,  24,
+     25,  25,  26,  27,  28,  28,  29,  30,  31,  32,  32,  33,  34,  35,  35,  36,
+     37,  38,  39,  39,  40,  41,  42,  42,  43,  44,  45,  46,  46,  47,  48,  49,
+     50,  50,  51,  52,  53,  53,  54,  55,  56,  57,  57,  58,  59,  60,  60,  61,
+     62,  63,  64,  64,  65,  66,  67,  67,  68,  69,  70,  71,  71,  72,  73,  74,
+     75,  75,  76,  77,  78,  78,  79,  80,  81,  82,  82,  83,  84,  85,  85,  86,
+     87,  88,  89,  89,  90,  91,  92,  92,  93,  94,  95,  96,  96,  97,  98,  99,
+)
+
+OFFSET_TO_STATUS = (
+      0,   2,   3,   4,   6,   7,   8,   9,  11,  12,  13,  15,  16,  17,  18,  20,
+     21,  22,  24,  25,  26,  27,  29,  30,  31,  32,  34,  35,  36,  38,  39,  40,
+     41,  43,  44,  45,  47,  48,  49,  50,  52,  53,  54,  56,  57,  58,  59,  61,
+     62,  63,  64,  66,  67,  68,  70,  71,  72,  73,  75,  76,  77,  79,  80,  81,
+     82,  84,  85,  86,  88,  89,  90,  91,  93,  94,  95,  96,  98,  99, 100, 102,
+    103, 104, 105, 107, 108, 109, 111, 112, 113, 114, 116, 117, 118, 120, 121, 122,
+    123, 125, 126, 127,
+)
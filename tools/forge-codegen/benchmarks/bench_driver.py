@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark the generated Python register driver against RegisterCodec.
+
+Generates the driver for a small BPD-style spec, then times one campaign
+step (set two fields, write the changed CRs) with:
+- the generated driver (property setters + flush())
+- RegisterCodec.encode + DeltaPlanner-style diff of the words
+
+Usage:
+    python benchmarks/bench_driver.py
+    python benchmarks/bench_driver.py --steps 200000
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from forge_codegen.basic_serialized_datatypes import DeltaPlanner  # noqa: E402
+from forge_codegen.generator.codegen import create_register_package, generate_vhdl, load_yaml_spec  # noqa: E402
+
+SPEC = """
+app_name: "BenchProbe"
+platform: "moku_go"
+mapping_strategy: "best_fit"
+datatypes:
+  - name: "intensity"
+    datatype: "voltage_output_05v_s16"
+  - name: "delay"
+    datatype: "pulse_duration_ns_u32"
+  - name: "timeout"
+    datatype: "pulse_duration_ns_u48"
+  - name: "arm"
+    datatype: "boolean"
+"""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the generated register driver")
+    parser.add_argument("--steps", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        yaml_path = tmp / "bench.yaml"
+        yaml_path.write_text(SPEC)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_vhdl(yaml_path, tmp / "out", Path(__file__).resolve().parent.parent / "forge_codegen" / "templates")
+        spec = importlib.util.spec_from_file_location("bench_driver", tmp / "out" / "BenchProbe_driver.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        codec = create_register_package(load_yaml_spec(yaml_path)).codec()
+
+    writes = [0]
+
+    def write(cr, word):
+        writes[0] += 1
+
+    drv = module.BenchProbeDriver(write)
+    drv.flush()
+    start = time.perf_counter()
+    for step in range(args.steps):
+        drv.intensity = step % 5000
+        drv.arm = step & 1
+        drv.flush()
+    driver_time = time.perf_counter() - start
+    driver_writes, writes[0] = writes[0], 0
+
+    planner = DeltaPlanner(codec)
+    start = time.perf_counter()
+    for step in range(args.steps):
+        for cr, word in planner.update({"intensity": step % 5000, "arm": bool(step & 1)}).items():
+            write(cr, word)
+    codec_time = time.perf_counter() - start
+
+    print(f"Steps: {args.steps}")
+    print()
+    print(f"{'path':<28} {'us/step':>8} {'writes':>8}")
+    print("-" * 46)
+    print(f"{'generated driver':<28} {driver_time / args.steps * 1e6:>8.2f} {driver_writes:>8}")
+    print(f"{'DeltaPlanner.update':<28} {codec_time / args.steps * 1e6:>8.2f} {writes[0]:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI startup: import time of each entry point under `-X importtime`.
+
+Runs each command in a fresh interpreter and checks two budgets:
+- total import time (sum of the top-level cumulative times), in ms
+- heavy modules that must not be imported at all for that command
+  (e.g. codegen --help must not load jinja2, pydantic, yaml or numpy)
+
+Commands whose dependencies are not installed are reported as skipped.
+Exits 1 if any command is over budget, so it can run in CI.
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --repeat 5 --top 10
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+REPO_ROOT = PACKAGE_ROOT.parent.parent
+SCRIPTS = REPO_ROOT / "scripts"
+
+HEAVY = ["jinja2", "pydantic", "yaml", "numpy"]
+MOKU_HEAVY = ["moku", "moku_models", "pydantic", "zeroconf", "loguru", "rich", "yaml"]
+
+# (name, argv after `python -X importtime`, import budget in ms, modules that must not be imported)
+COMMANDS: List[Tuple[str, List[str], float, List[str]]] = [
+    ("codegen --help", ["-m", "forge_codegen.generator.codegen", "--help"], 200, HEAVY),
+    ("batch --help", ["-m", "forge_codegen.generator.batch", "--help"], 200, HEAVY),
+    ("moku-deploy --help", [str(SCRIPTS / "moku-deploy.py"), "--help"], 250, MOKU_HEAVY),
+    ("moku_read --help", [str(SCRIPTS / "moku_read.py"), "--help"], 120, MOKU_HEAVY),
+    ("validate_moku_config (usage)", [str(SCRIPTS / "validate_moku_config.py")], 60, MOKU_HEAVY),
+]
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """Top-level imports from -X importtime output: name -> (self µs, cumulative µs)."""
+    top = {}
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            top[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return top
+
+
+def imported_modules(stderr: str) -> List[str]:
+    """Every module imported, at any depth."""
+    return [match.group(4) for match in map(_LINE.match, stderr.splitlines()) if match]
+
+
+def run(argv: List[str]) -> Tuple[Optional[str], str]:
+    """(skip reason or None, importtime stderr) for one run of the command."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(PACKAGE_ROOT),
+                                                                      os.environ.get("PYTHONPATH")])))
+    result = subprocess.run([sys.executable, "-X", "importtime", *argv], cwd=PACKAGE_ROOT, env=env,
+                            capture_output=True, text=True)
+    missing = re.search(r"ModuleNotFoundError: No module named '([^']+)'", result.stderr)
+    if missing:
+        return f"{missing.group(1)} not installed", result.stderr
+    if result.returncode not in (0, 1, 2):  # --help exits 0, usage errors 1 or 2
+        return f"exit code {result.returncode}", result.stderr
+    return None, result.stderr
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check CLI import-time budgets")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per command; the fastest counts")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest top-level imports to list per command")
+    args = parser.parse_args()
+
+    baseline = min(sum(c for _, c in parse_importtime(run(["-c", "pass"])[1]).values())
+                   for _ in range(args.repeat)) / 1000
+    print(f"Interpreter startup imports: {baseline:.1f} ms\n")
+    print(f"{'Command':<30} {'Import ms':>10} {'Budget':>8}  Result")
+    print("-" * 72)
+
+    failures = 0
+    details = []
+    for name, argv, budget, forbidden in COMMANDS:
+        best = None
+        for _ in range(args.repeat):
+            skip, stderr = run(argv)
+            if skip:
+                break
+            top = parse_importtime(stderr)
+            total = sum(c for _, c in top.values()) / 1000
+            if best is None or total < best[0]:
+                best = (total, top, imported_modules(stderr))
+        if skip:
+            print(f"{name:<30} {'-':>10} {budget:>8.0f}  skipped ({skip})")
+            continue
+
+        total, top, modules = best
+        loaded = sorted({m.split(".")[0] for m in modules} & set(forbidden))
+        problems = []
+        if total > budget:
+            problems.append("over budget")
+        if loaded:
+            problems.append(f"imports {', '.join(loaded)}")
+        failures += bool(problems)
+        print(f"{name:<30} {total:>10.1f} {budget:>8.0f}  {'; '.join(problems) or 'ok'}")
+        heaviest = sorted(top.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+        details.append((name, heaviest))
+
+    for name, heaviest in details:
+        print(f"\n{name}: heaviest top-level imports")
+        for module, (_, cumulative) in heaviest:
+            print(f"  {cumulative / 1000:>8.1f} ms  {module}")
+
+    if failures:
+        print(f"\n❌ {failures} command(s) over budget")
+        return 1
+    print("\n✅ All commands within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
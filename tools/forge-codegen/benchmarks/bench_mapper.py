@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark RegisterMapper on large synthetic register files.
+
+Builds a synthetic geometry with many registers, fills it with a random mix
+of field widths up to a target utilisation, and times every strategy plus
+an incremental remap (5% of fields removed, the same number added) against
+the previous mapping.
+
+The "placement" column names the model each path places fields with:
+FreeSpace (bitset free-space model: update_frequency and incremental/pinned
+placement, the paths that search all registers for room), a single
+sequential cursor (first_fit, best_fit, type_clustering), or whole-register
+bins from the branch-and-bound search (optimal).
+
+Usage:
+    python benchmarks/bench_mapper.py
+    python benchmarks/bench_mapper.py --registers 4096 --fields 10000 --fill 0.8
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from forge_codegen.basic_serialized_datatypes import (  # noqa: E402
+    BasicAppDataTypes,
+    RegisterGeometry,
+    RegisterMapper,
+    TYPE_REGISTRY,
+)
+
+STRATEGIES = ("first_fit", "best_fit", "type_clustering", "optimal", "update_frequency")
+
+PLACEMENT = {
+    "first_fit": "cursor",
+    "best_fit": "cursor",
+    "type_clustering": "cursor",
+    "optimal": "bins",
+    "update_frequency": "FreeSpace",
+}
+
+
+def synthetic_items(count: int, max_bits: int, seed: int) -> List[Tuple[str, BasicAppDataTypes]]:
+    """Random fields (<= 32 bits) totalling at most max_bits."""
+    rng = random.Random(seed)
+    dtypes = [d for d in BasicAppDataTypes if TYPE_REGISTRY[d].bit_width <= 32]
+    items = []
+    bits = 0
+    for index in range(count):
+        dtype = rng.choice(dtypes)
+        width = TYPE_REGISTRY[dtype].bit_width
+        if bits + width > max_bits:
+            break
+        items.append((f"field_{index:05d}", dtype))
+        bits += width
+    return items
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark RegisterMapper scaling")
+    parser.add_argument("--registers", type=int, default=1024, help="Registers in the synthetic geometry")
+    parser.add_argument("--fields", type=int, default=2000, help="Maximum number of fields")
+    parser.add_argument("--fill", type=float, default=0.9, help="Maximum fraction of bits used")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    geometry = RegisterGeometry("synthetic", first_cr=0, last_cr=args.registers - 1)
+    items = synthetic_items(args.fields, int(geometry.total_bits * args.fill), args.seed)
+    bits = sum(TYPE_REGISTRY[d].bit_width for _, d in items)
+    rates = {name: (i % 10) / 10 for i, (name, _) in enumerate(items)}
+    mapper = RegisterMapper(geometry=geometry)
+
+    print(f"Geometry: {geometry.describe()}")
+    print(f"Fields:   {len(items)} ({bits} bits, {100 * bits / geometry.total_bits:.1f}% of capacity)")
+    print()
+    print(f"{'strategy':<20} {'time (ms)':>10} {'registers':>10}  placement")
+    print("-" * 53)
+
+    baseline = None
+    for strategy in STRATEGIES:
+        try:
+            mappings, elapsed = timed(lambda: mapper.map(items, strategy=strategy, update_rates=rates))
+        except ValueError as e:
+            print(f"{strategy:<20} {'-':>10} {'-':>10}  {PLACEMENT[strategy]:<10} {e}")
+            continue
+        registers = len({cr for m in mappings for cr in m.cr_numbers()})
+        print(f"{strategy:<20} {elapsed * 1000:>10.1f} {registers:>10}  {PLACEMENT[strategy]}")
+        if strategy == "best_fit":
+            baseline = mappings
+    if baseline is None:
+        return 1
+
+    # Incremental remap: drop 5% of fields and add as many new ones
+    churn = max(1, len(items) // 20)
+    kept = items[churn:]
+    added = [(f"new_{index:05d}", dtype) for index, (_, dtype) in enumerate(items[:churn])]
+    mappings, elapsed = timed(lambda: mapper.map(kept + added, previous=baseline))
+    old_slots = {m.name: (m.cr_number, m.bit_slice) for m in baseline}
+    moved = sum(1 for m in mappings if m.name in old_slots and old_slots[m.name] != (m.cr_number, m.bit_slice))
+    print(f"{'incremental (5%)':<20} {elapsed * 1000:>10.1f} "
+          f"{len({cr for m in mappings for cr in m.cr_numbers()}):>10}  FreeSpace  moved: {moved}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
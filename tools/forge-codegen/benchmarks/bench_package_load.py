@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark BasicAppsRegPackage loading: full validation vs trusted snapshot.
+
+Writes a synthetic YAML spec with many fields, then times:
+- from_yaml (YAML parse + every validator)
+- from_yaml_trusted, cold (same, plus writing the snapshot)
+- from_yaml_trusted, warm (snapshot + model_construct, no validators)
+- generate_mapping on the validated and the trusted package
+- BasicAppsRegPackage.from_binary and load_codec on a binary snapshot
+- the duplicate-name check on its own
+
+Usage:
+    python benchmarks/bench_package_load.py
+    python benchmarks/bench_package_load.py --fields 200 --repeat 20
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from forge_codegen.basic_serialized_datatypes import BasicAppDataTypes, load_codec  # noqa: E402
+from forge_codegen.models.package import BasicAppsRegPackage, DataTypeSpec  # noqa: E402
+
+
+def synthetic_package(count: int) -> BasicAppsRegPackage:
+    """Package of `count` fields (mostly booleans) that fits the cloud_compile geometry."""
+    datatypes = []
+    for index in range(count):
+        if index % 10 == 0:
+            datatypes.append(DataTypeSpec(name=f"level_{index:04d}", datatype=BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S8,
+                                          default_value=0, min_value=0, max_value=5000, units="mV"))
+        else:
+            datatypes.append(DataTypeSpec(name=f"flag_{index:04d}", datatype=BasicAppDataTypes.BOOLEAN,
+                                          default_value=False, description="Synthetic flag"))
+    return BasicAppsRegPackage(app_name="Synthetic", datatypes=datatypes, register_geometry="cloud_compile")
+
+
+def best_of(repeat: int, fn) -> float:
+    """Fastest of `repeat` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark trusted package loading")
+    parser.add_argument("--fields", type=int, default=300, help="Number of fields (<= 300 to fit 512 bits)")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        yaml_path = tmp / "synthetic.yaml"
+        synthetic_package(args.fields).to_yaml(yaml_path)
+        names = [f"field_{i}" for i in range(args.fields)]
+        binary = BasicAppsRegPackage.from_yaml(yaml_path).to_binary()
+
+        def cold():
+            for snapshot in (tmp / "snapshots").glob("*.pkg"):
+                snapshot.unlink()
+            BasicAppsRegPackage.from_yaml_trusted(yaml_path, tmp / "snapshots")
+
+        rows = [
+            ("from_yaml (validated)", lambda: BasicAppsRegPackage.from_yaml(yaml_path)),
+            ("trusted, cold", cold),
+            ("trusted, warm", lambda: BasicAppsRegPackage.from_yaml_trusted(yaml_path, tmp / "snapshots")),
+            ("mapping (validated)", lambda: BasicAppsRegPackage.from_yaml(yaml_path).generate_mapping()),
+            ("mapping (trusted)",
+             lambda: BasicAppsRegPackage.from_yaml_trusted(yaml_path, tmp / "snapshots").generate_mapping()),
+            ("from_binary + codec", lambda: BasicAppsRegPackage.from_binary(binary).codec()),
+            ("load_codec", lambda: load_codec(binary)),
+            ("duplicates, count()", lambda: [n for n in names if names.count(n) > 1]),
+            ("duplicates, Counter", lambda: [n for n, c in Counter(names).items() if c > 1]),
+        ]
+
+        print(f"Fields: {args.fields} (best of {args.repeat})")
+        print()
+        print(f"{'step':<24} {'time (ms)':>10}")
+        print("-" * 35)
+        for label, fn in rows:
+            print(f"{label:<24} {best_of(args.repeat, fn):>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
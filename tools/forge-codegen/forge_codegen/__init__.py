@@ -7,6 +7,13 @@ with type-safe register serialization.
 
 __version__ = "1.0.0"
 
-from forge_codegen.models.app_spec import CustomInstrumentApp
-
 __all__ = ["CustomInstrumentApp"]
+
+
+def __getattr__(name):
+    # Imported on first access (PEP 562), so `import forge_codegen.<submodule>`
+    # (and the CLIs built on it) does not pay for pydantic and the models
+    if name == "CustomInstrumentApp":
+        from forge_codegen.models.app_spec import CustomInstrumentApp
+        return CustomInstrumentApp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
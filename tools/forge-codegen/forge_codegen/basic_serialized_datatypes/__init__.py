@@ -44,8 +44,30 @@ from .time import (
 # Conversion utilities
 from .converters import TypeConverter
 
+# Register file geometry
+from .geometry import RegisterGeometry, GEOMETRY_PROFILES, DEFAULT_GEOMETRY, FreeSpace, get_geometry
+
 # Register mapping (Phase 2)
-from .mapper import RegisterMapper, RegisterMapping, MappingReport
+from .mapper import RegisterMapper, RegisterMapping, MappingReport, StrategyComparison, MAPPER_VERSION
+
+# Persistent mapping cache
+from .cache import MappingCache, default_cache_dir
+
+# Register codec (typed values <-> CR words)
+from .codec import RegisterCodec, FieldCodec
+
+# Binary snapshots (fast loading of mapping + codec)
+from .binary import (
+    BinaryWriter,
+    BinaryReader,
+    FORMAT_VERSION,
+    dump_snapshot,
+    load_report,
+    load_codec,
+)
+
+# Delta planning (minimal CR writes between updates)
+from .delta import DeltaPlanner, DeltaSchedule
 
 __all__ = [
     # Enums and metadata
@@ -62,10 +84,39 @@ __all__ = [
     # Converters
     'TypeConverter',
 
+    # Register file geometry
+    'RegisterGeometry',
+    'GEOMETRY_PROFILES',
+    'DEFAULT_GEOMETRY',
+    'FreeSpace',
+    'get_geometry',
+
     # Register mapping (Phase 2)
     'RegisterMapper',
     'RegisterMapping',
     'MappingReport',
+    'StrategyComparison',
+    'MAPPER_VERSION',
+
+    # Mapping cache
+    'MappingCache',
+    'default_cache_dir',
+
+    # Register codec
+    'RegisterCodec',
+    'FieldCodec',
+
+    # Binary snapshots
+    'BinaryWriter',
+    'BinaryReader',
+    'FORMAT_VERSION',
+    'dump_snapshot',
+    'load_report',
+    'load_codec',
+
+    # Delta planning
+    'DeltaPlanner',
+    'DeltaSchedule',
 ]
 
 __version__ = '1.0.0'
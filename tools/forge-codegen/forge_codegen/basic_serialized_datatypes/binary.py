@@ -0,0 +1,356 @@
+"""
+Compact binary snapshot format for register interfaces.
+
+A snapshot is a small header followed by tagged sections, so each tool
+reads only what it needs (a campaign loop only needs the codec):
+
+    header   '<4sHH'  magic b'FGRB', format version, section count
+    table    '<4sII'  per section: tag, offset, length (offsets from file start)
+    sections 'MAP '   MappingReport (geometry, update rates, mappings)
+             'CDC '   RegisterCodec (precomputed FieldCodec shifts/masks)
+             'PKG '   BasicAppsRegPackage fields (written by models.package)
+
+All integers are little-endian; strings are u16 length + UTF-8. Readers
+ignore unknown sections and reject newer format versions, so sections can
+be added without a version bump.
+
+Architecture:
+- Zero dependencies (pure Python + stdlib struct)
+- Loading skips mapping, codec compilation and validation entirely
+
+Design References:
+- Mapper: mapper.py
+- Codec: codec.py
+"""
+
+import struct
+from typing import Dict, List, Optional, Tuple, Union
+
+from .types import BasicAppDataTypes
+from .geometry import RegisterGeometry
+from .mapper import MappingReport, RegisterMapping
+from .codec import FieldCodec, RegisterCodec
+
+
+MAGIC = b"FGRB"
+FORMAT_VERSION = 1
+
+SECTION_MAPPING = b"MAP "
+SECTION_CODEC = b"CDC "
+SECTION_PACKAGE = b"PKG "
+
+_HEADER = struct.Struct("<4sHH")
+_SECTION = struct.Struct("<4sII")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_SLOT = struct.Struct("<HBB")  # cr_number, msb, lsb  (codec: cr_number, lsb, width)
+_SEGMENT = struct.Struct("<HBBB")  # codec segment: cr_number, lsb, width, shift
+_BIT = struct.Struct("<HB")  # commit bit: cr_number, bit
+
+# Tagged scalar kinds for optional values
+_NONE, _BOOL, _INT, _FLOAT = range(4)
+
+Scalar = Union[None, bool, int, float]
+
+
+class BinaryWriter:
+    """Append-only encoder for snapshot sections."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def u8(self, value: int) -> None:
+        self.buffer += _U8.pack(value)
+
+    def u16(self, value: int) -> None:
+        self.buffer += _U16.pack(value)
+
+    def u32(self, value: int) -> None:
+        self.buffer += _U32.pack(value)
+
+    def f64(self, value: float) -> None:
+        self.buffer += _F64.pack(value)
+
+    def string(self, value: str) -> None:
+        data = value.encode()
+        self.buffer += _U16.pack(len(data)) + data
+
+    def optional_string(self, value: Optional[str]) -> None:
+        self.u8(value is not None)
+        if value is not None:
+            self.string(value)
+
+    def scalar(self, value: Scalar) -> None:
+        """None, bool, int (64-bit) or float, tagged with its kind."""
+        if value is None:
+            self.u8(_NONE)
+        elif isinstance(value, bool):
+            self.u8(_BOOL)
+            self.u8(value)
+        elif isinstance(value, int):
+            self.u8(_INT)
+            self.buffer += _I64.pack(value)
+        else:
+            self.u8(_FLOAT)
+            self.f64(value)
+
+    def pack(self, fmt: struct.Struct, *values: int) -> None:
+        self.buffer += fmt.pack(*values)
+
+    def optional_bit(self, bit: Optional[Tuple[int, int]]) -> None:
+        self.u8(bit is not None)
+        if bit is not None:
+            self.pack(_BIT, *bit)
+
+
+class BinaryReader:
+    """Sequential decoder over one section."""
+
+    def __init__(self, data: Union[bytes, memoryview], offset: int = 0):
+        self.data = data
+        self.offset = offset
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def u8(self) -> int:
+        return self.unpack(_U8)[0]
+
+    def u16(self) -> int:
+        return self.unpack(_U16)[0]
+
+    def u32(self) -> int:
+        return self.unpack(_U32)[0]
+
+    def f64(self) -> float:
+        return self.unpack(_F64)[0]
+
+    def string(self) -> str:
+        length = self.u16()
+        start = self.offset
+        self.offset += length
+        if self.offset > len(self.data):
+            raise struct.error("string runs past end of section")
+        return bytes(self.data[start:self.offset]).decode()
+
+    def optional_string(self) -> Optional[str]:
+        return self.string() if self.u8() else None
+
+    def scalar(self) -> Scalar:
+        kind = self.u8()
+        if kind == _NONE:
+            return None
+        if kind == _BOOL:
+            return bool(self.u8())
+        if kind == _INT:
+            return self.unpack(_I64)[0]
+        if kind == _FLOAT:
+            return self.f64()
+        raise ValueError(f"Unknown scalar kind {kind}")
+
+    def optional_bit(self) -> Optional[Tuple[int, int]]:
+        return self.unpack(_BIT) if self.u8() else None
+
+
+# ============================================================================
+# CONTAINER
+# ============================================================================
+
+def pack_sections(sections: Dict[bytes, bytes]) -> bytes:
+    """Assemble header, section table and section payloads."""
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections)))
+    for tag, payload in sections.items():
+        table += _SECTION.pack(tag, offset, len(payload))
+        offset += len(payload)
+    return bytes(table) + b"".join(sections.values())
+
+
+def unpack_sections(data: bytes) -> Dict[bytes, memoryview]:
+    """
+    Split a snapshot into tag -> payload views.
+
+    Raises:
+        ValueError: If the magic, version or section table is invalid
+    """
+    view = memoryview(data)
+    try:
+        magic, version, count = _HEADER.unpack_from(view, 0)
+    except struct.error:
+        raise ValueError("Not a register interface snapshot (truncated header)") from None
+    if magic != MAGIC:
+        raise ValueError(f"Not a register interface snapshot (magic {bytes(magic)!r})")
+    if version > FORMAT_VERSION:
+        raise ValueError(
+            f"Snapshot format version {version} is newer than supported ({FORMAT_VERSION})"
+        )
+
+    sections = {}
+    for index in range(count):
+        try:
+            tag, offset, length = _SECTION.unpack_from(view, _HEADER.size + index * _SECTION.size)
+        except struct.error:
+            raise ValueError("Truncated snapshot section table") from None
+        if offset + length > len(view):
+            raise ValueError(f"Snapshot section {tag!r} runs past end of data")
+        sections[tag] = view[offset:offset + length]
+    return sections
+
+
+def _section(data: bytes, tag: bytes) -> memoryview:
+    sections = unpack_sections(data)
+    if tag not in sections:
+        raise ValueError(f"Snapshot has no {tag.decode().strip()} section")
+    return sections[tag]
+
+
+# ============================================================================
+# MAPPING REPORT
+# ============================================================================
+
+def _write_mapping(writer: BinaryWriter, mapping: RegisterMapping) -> None:
+    writer.string(mapping.name)
+    writer.string(mapping.datatype.value)
+    writer.pack(_SLOT, mapping.cr_number, *mapping.bit_slice)
+    writer.u8(len(mapping.segments))
+    for segment in mapping.segments:
+        writer.pack(_SLOT, *segment)
+    writer.optional_bit(mapping.commit_bit)
+
+
+def _read_mapping(reader: BinaryReader) -> RegisterMapping:
+    name = reader.string()
+    datatype = BasicAppDataTypes(reader.string())
+    cr_number, msb, lsb = reader.unpack(_SLOT)
+    segments = tuple(reader.unpack(_SLOT) for _ in range(reader.u8()))
+    return RegisterMapping(name, datatype, cr_number, (msb, lsb), segments, reader.optional_bit())
+
+
+def encode_report(report: MappingReport) -> bytes:
+    """MAP section payload for a MappingReport."""
+    writer = BinaryWriter()
+    geometry = report.geometry
+    writer.string(geometry.name)
+    writer.u16(geometry.first_cr)
+    writer.u16(geometry.last_cr)
+    writer.u16(geometry.bits_per_register)
+    writer.u32(report.total_bits_available)
+
+    rates = report.update_rates
+    writer.u8(rates is not None)
+    if rates is not None:
+        writer.u16(len(rates))
+        for name, rate in rates.items():
+            writer.string(name)
+            writer.f64(rate)
+
+    writer.u16(len(report.mappings))
+    for mapping in report.mappings:
+        _write_mapping(writer, mapping)
+    return bytes(writer.buffer)
+
+
+def decode_report(payload: Union[bytes, memoryview]) -> MappingReport:
+    """Rebuild a MappingReport from a MAP section payload."""
+    reader = BinaryReader(payload)
+    name = reader.string()
+    first_cr = reader.u16()
+    last_cr = reader.u16()
+    geometry = RegisterGeometry(name, first_cr, last_cr, reader.u16())
+    total_bits_available = reader.u32()
+
+    rates = None
+    if reader.u8():
+        rates = {}
+        for _ in range(reader.u16()):
+            rate_name = reader.string()
+            rates[rate_name] = reader.f64()
+
+    mappings = [_read_mapping(reader) for _ in range(reader.u16())]
+    return MappingReport(
+        mappings=mappings,
+        total_bits_used=sum(m.bit_width() for m in mappings),
+        total_bits_available=total_bits_available,
+        update_rates=rates,
+        geometry=geometry
+    )
+
+
+# ============================================================================
+# CODEC
+# ============================================================================
+
+def encode_codec(codec: RegisterCodec) -> bytes:
+    """CDC section payload: every FieldCodec with its precomputed layout."""
+    writer = BinaryWriter()
+    writer.u16(len(codec.fields))
+    for field in codec.fields.values():
+        writer.string(field.name)
+        writer.string(field.datatype.value)
+        writer.pack(_SLOT, field.cr_number, field.lsb, field.width)
+        writer.u8(field.signed)
+        writer.scalar(field.full_scale_raw)
+        writer.scalar(field.full_scale_mv)
+        writer.u8(len(field.segments))
+        for segment in field.segments:
+            writer.pack(_SEGMENT, *segment)
+        writer.optional_bit(field.commit)
+    return bytes(writer.buffer)
+
+
+def decode_codec(payload: Union[bytes, memoryview]) -> RegisterCodec:
+    """Rebuild a RegisterCodec from a CDC section payload (no recompilation)."""
+    reader = BinaryReader(payload)
+    fields: List[FieldCodec] = []
+    for _ in range(reader.u16()):
+        name = reader.string()
+        datatype = BasicAppDataTypes(reader.string())
+        cr_number, lsb, width = reader.unpack(_SLOT)
+        signed = bool(reader.u8())
+        full_scale_raw = reader.scalar()
+        full_scale_mv = reader.scalar()
+        segments = tuple(reader.unpack(_SEGMENT) for _ in range(reader.u8()))
+        commit = reader.optional_bit()
+        fields.append(FieldCodec(name, datatype, cr_number, lsb, width, signed,
+                                 full_scale_raw, full_scale_mv, segments, commit))
+    return RegisterCodec.from_fields(fields)
+
+
+# ============================================================================
+# CONVENIENCE
+# ============================================================================
+
+def dump_snapshot(report: MappingReport,
+                  codec: Optional[RegisterCodec] = None,
+                  extra: Optional[Dict[bytes, bytes]] = None) -> bytes:
+    """
+    Snapshot with a MAP section, a CDC section (built from the report if
+    not given) and any extra sections (e.g. PKG).
+    """
+    sections = {
+        SECTION_MAPPING: encode_report(report),
+        SECTION_CODEC: encode_codec(codec if codec is not None else RegisterCodec(report.mappings)),
+    }
+    sections.update(extra or {})
+    return pack_sections(sections)
+
+
+def load_report(data: bytes) -> MappingReport:
+    """MappingReport from a snapshot's MAP section."""
+    try:
+        return decode_report(_section(data, SECTION_MAPPING))
+    except struct.error as e:
+        raise ValueError(f"Corrupt snapshot mapping section: {e}") from e
+
+
+def load_codec(data: bytes) -> RegisterCodec:
+    """RegisterCodec from a snapshot's CDC section (the fast path for host tools)."""
+    try:
+        return decode_codec(_section(data, SECTION_CODEC))
+    except struct.error as e:
+        raise ValueError(f"Corrupt snapshot codec section: {e}") from e
@@ -0,0 +1,168 @@
+"""
+Persistent on-disk cache of register mapping results.
+
+Mapping is a pure function of its inputs, so results are stored under a
+canonical hash of (fields, strategy, hints, pins, previous mapping,
+geometry, mapper version) and reused across processes: codegen runs,
+deploy scripts and test sessions that point at the same directory share
+entries. Entries are MappingReport.to_json() files; the least recently used
+ones are evicted beyond max_entries.
+
+Architecture:
+- Zero dependencies (pure Python + stdlib only)
+- Plugged into RegisterMapper via RegisterMapper(cache=...)
+- Best effort: unreadable entries are misses, unwritable directories are ignored
+
+Design References:
+- Mapper: mapper.py
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .types import BasicAppDataTypes
+from .geometry import RegisterGeometry, DEFAULT_GEOMETRY
+from .mapper import MAPPER_VERSION, MappingReport, RegisterMapping
+
+
+CACHE_DIR_ENV = "FORGE_CODEGEN_CACHE_DIR"
+
+
+def default_cache_dir() -> Path:
+    """$FORGE_CODEGEN_CACHE_DIR, else $XDG_CACHE_HOME/forge-codegen/mappings (~/.cache by default)."""
+    if os.environ.get(CACHE_DIR_ENV):
+        return Path(os.environ[CACHE_DIR_ENV])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "forge-codegen" / "mappings"
+
+
+class MappingCache:
+    """
+    Directory of cached mapping results, one JSON file per key.
+
+    Example:
+        >>> cache = MappingCache()              # shared default directory
+        >>> mapper = RegisterMapper(cache=cache)
+        >>> mapper.map(items)                   # computed and stored
+        >>> RegisterMapper(cache=cache).map(items)  # loaded from disk
+    """
+
+    DEFAULT_MAX_ENTRIES = 512
+
+    def __init__(self, directory: Optional[Path] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            directory: Cache directory (default: default_cache_dir())
+            max_entries: Entries kept after each store; least recently used go first
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(items: Sequence[Tuple[str, BasicAppDataTypes]],
+            strategy: str,
+            geometry: RegisterGeometry,
+            update_rates: Optional[Dict[str, float]] = None,
+            pins: Optional[Dict[str, Tuple[int, Tuple[int, int]]]] = None,
+            previous: Optional[Sequence[RegisterMapping]] = None,
+            time_budget: Optional[float] = None) -> str:
+        """Canonical SHA-256 of everything a mapping result depends on."""
+        canonical = {
+            "version": MAPPER_VERSION,
+            "geometry": [geometry.first_cr, geometry.last_cr, geometry.bits_per_register],
+            "strategy": strategy,
+            "time_budget": time_budget,
+            "items": [[name, dtype.value] for name, dtype in items],
+            "update_rates": sorted((update_rates or {}).items()),
+            "pins": sorted((name, [cr, list(bits)]) for name, (cr, bits) in (pins or {}).items()),
+            "previous": None if previous is None else [
+                [m.name, m.datatype.value, m.cr_number, list(m.bit_slice),
+                 [list(segment) for segment in m.segments], m.commit_bit and list(m.commit_bit)]
+                for m in previous
+            ],
+        }
+        payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[List[RegisterMapping]]:
+        """Cached mappings for key, or None (corrupt entries are removed)."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                mappings = MappingReport.from_json(json.load(f)).mappings
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError):
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return mappings
+
+    def put(self, key: str, mappings: Sequence[RegisterMapping],
+            geometry: RegisterGeometry = DEFAULT_GEOMETRY) -> None:
+        """Store mappings atomically (as a MappingReport), then evict down to max_entries."""
+        report = MappingReport(
+            mappings=list(mappings),
+            total_bits_used=sum(m.bit_width() for m in mappings),
+            total_bits_available=geometry.total_bits,
+            geometry=geometry
+        )
+        import tempfile  # only stores need it; keeps CLI startup lean
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", dir=self.directory, suffix=".tmp", delete=False) as f:
+                json.dump(report.to_json(), f)
+            os.replace(f.name, self._path(key))
+        except OSError:
+            if 'f' in locals():
+                Path(f.name).unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def entries(self) -> List[Path]:
+        """Entry files, least recently used first."""
+        try:
+            paths = list(self.directory.glob("*.json"))
+        except OSError:
+            return []
+        stamped = []
+        for path in paths:
+            try:
+                stamped.append((path.stat().st_mtime_ns, path.name, path))
+            except FileNotFoundError:
+                continue
+        return [path for _, _, path in sorted(stamped)]
+
+    def evict(self, max_entries: Optional[int] = None) -> int:
+        """Remove least recently used entries beyond max_entries; returns how many."""
+        limit = self.max_entries if max_entries is None else max_entries
+        stale = self.entries()
+        stale = stale[:max(0, len(stale) - limit)]
+        for path in stale:
+            path.unlink(missing_ok=True)
+        return len(stale)
+
+    def clear(self) -> int:
+        """Remove every entry; returns how many."""
+        return self.evict(0)
+
+    def __len__(self) -> int:
+        return len(self.entries())
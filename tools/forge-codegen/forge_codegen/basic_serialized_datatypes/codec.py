@@ -0,0 +1,425 @@
+"""
+Register codec for BasicAppDataTypes.
+
+Packs typed values (mV, time units, booleans) into Control Register words
+and unpacks CR words back into typed values, using a list of
+RegisterMapping objects produced by RegisterMapper.
+
+Architecture:
+- Zero required dependencies (pure Python + stdlib only)
+- numpy is used opportunistically by decode_batch() when installed, so
+  large register logs decode column-at-a-time without per-row loops; it is
+  imported on the first decode_batch() call, not at import time
+- Scalar conversions delegate to TypeConverter; the vectorized path uses
+  the same float expressions so both paths are bit-exact
+
+Spanning fields (wider than one CR):
+- Split across segments as laid out by RegisterMapper, MS part first
+- encode() flips the field's commit bit whenever its value changes
+  relative to `base`, so always encode on top of the last written words
+  (DeltaPlanner does) and write CRs in ascending order: the commit bit
+  sits in the last CR of the span, and the shim latches the value when it
+  toggles
+
+Design References:
+- Mapper: mapper.py
+- Conversions: converters.py
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .types import BasicAppDataTypes
+from .metadata import TYPE_REGISTRY
+from .converters import TypeConverter
+from .mapper import RegisterMapping
+
+_UNLOADED: Any = object()
+
+# Optional acceleration for batch decoding: the numpy module, None if not
+# installed, or _UNLOADED until the first decode_batch() (see _numpy())
+np: Any = _UNLOADED
+
+
+def _numpy() -> Any:
+    """numpy (imported on first use), or None if it is not installed."""
+    global np
+    if np is _UNLOADED:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - exercised only without numpy
+            numpy = None
+        np = numpy
+    return np
+
+
+TypedValue = Union[int, bool]
+
+
+@dataclass(frozen=True)
+class FieldCodec:
+    """
+    Precomputed shift/mask/scale description for one mapped field.
+
+    Attributes:
+        name: Field name (matches RegisterMapping.name)
+        datatype: BasicAppDataTypes enum value
+        cr_number: Control register holding the field
+        lsb: Bit position of the field LSB within the CR word
+        width: Field width in bits
+        signed: True if the raw value is two's complement
+        full_scale_raw: Raw full-scale value (voltage types only)
+        full_scale_mv: Full-scale voltage in mV (voltage types only)
+        segments: Spanning fields only: (cr_number, lsb, width, shift) per CR,
+                  where shift is the segment's offset within the raw value
+        commit: Spanning fields only: (cr_number, bit) of the commit toggle
+    """
+    name: str
+    datatype: BasicAppDataTypes
+    cr_number: int
+    lsb: int
+    width: int
+    signed: bool
+    full_scale_raw: Optional[int] = None
+    full_scale_mv: Optional[int] = None
+    segments: Tuple[Tuple[int, int, int, int], ...] = ()
+    commit: Optional[Tuple[int, int]] = None
+
+    @classmethod
+    def from_mapping(cls, mapping: RegisterMapping) -> 'FieldCodec':
+        """Build field codec from a RegisterMapping."""
+        metadata = TYPE_REGISTRY[mapping.datatype]
+        width = mapping.bit_width()
+        signed = metadata.signedness == 'signed'
+
+        full_scale_raw = None
+        full_scale_mv = None
+        if metadata.unit == 'mV':
+            # Converters scale against the largest positive raw code
+            full_scale_raw = (1 << (width - 1)) - 1 if signed else (1 << width) - 1
+            full_scale_mv = metadata.max_value
+
+        segments = []
+        if mapping.is_spanning:
+            shift = width
+            for cr_number, msb, lsb in mapping.parts():
+                shift -= msb - lsb + 1
+                segments.append((cr_number, lsb, msb - lsb + 1, shift))
+
+        return cls(
+            name=mapping.name,
+            datatype=mapping.datatype,
+            cr_number=mapping.cr_number,
+            lsb=mapping.bit_slice[1],
+            width=width,
+            signed=signed,
+            full_scale_raw=full_scale_raw,
+            full_scale_mv=full_scale_mv,
+            segments=tuple(segments),
+            commit=mapping.commit_bit,
+        )
+
+    @property
+    def mask(self) -> int:
+        """Unshifted bit mask for the field."""
+        return (1 << self.width) - 1
+
+    @property
+    def cr_numbers(self) -> Tuple[int, ...]:
+        """Every CR holding part of the field (including the commit bit)."""
+        if not self.segments:
+            return (self.cr_number,)
+        crs = tuple(segment[0] for segment in self.segments)
+        if self.commit is not None and self.commit[0] not in crs:
+            crs += (self.commit[0],)
+        return crs
+
+    @property
+    def is_boolean(self) -> bool:
+        return self.datatype == BasicAppDataTypes.BOOLEAN
+
+    @property
+    def is_voltage(self) -> bool:
+        return self.full_scale_raw is not None
+
+    def to_raw(self, value: TypedValue) -> int:
+        """Convert typed value to raw field bits (unsigned, masked)."""
+        if self.is_boolean:
+            raw = 1 if value else 0
+        elif self.is_voltage:
+            raw = getattr(TypeConverter, f"{self.datatype.value}_to_raw")(value)
+        else:
+            # Time types are stored in their declared unit
+            metadata = TYPE_REGISTRY[self.datatype]
+            if not (metadata.min_value <= value <= metadata.max_value):
+                raise ValueError(
+                    f"Value {value} out of range for '{self.name}' ({self.datatype.value})"
+                )
+            raw = value
+        return raw & self.mask
+
+    def extract(self, word: int) -> int:
+        """Extract raw field bits from a CR word (sign-extended if signed)."""
+        return self._sign_extend((word >> self.lsb) & self.mask)
+
+    def read(self, words: Mapping[int, int]) -> int:
+        """Extract raw field bits from a CR snapshot (all segments, sign-extended)."""
+        if not self.segments:
+            return self.extract(_lookup(words, self.cr_number))
+        raw = 0
+        for cr_number, lsb, width, shift in self.segments:
+            raw |= ((_lookup(words, cr_number) >> lsb) & ((1 << width) - 1)) << shift
+        return self._sign_extend(raw)
+
+    def _sign_extend(self, raw: int) -> int:
+        if self.signed:
+            sign_bit = 1 << (self.width - 1)
+            raw = (raw ^ sign_bit) - sign_bit
+        return raw
+
+    def from_raw(self, raw: int) -> TypedValue:
+        """Convert sign-extended raw field bits to a typed value."""
+        if self.is_boolean:
+            return bool(raw)
+        if self.is_voltage:
+            return getattr(TypeConverter, f"raw_to_{self.datatype.value}")(raw)
+        return raw
+
+    def insert(self, word: int, value: TypedValue) -> int:
+        """Return CR word with this field replaced by value."""
+        cleared = word & ~(self.mask << self.lsb)
+        return cleared | (self.to_raw(value) << self.lsb)
+
+    def write(self, words: Dict[int, int], value: TypedValue) -> None:
+        """Replace this field in a dict of CR words (in place), flipping the commit bit on change."""
+        if not self.segments:
+            words[self.cr_number] = self.insert(words[self.cr_number], value)
+            return
+
+        raw = self.to_raw(value)
+        if raw == self.read(words) & self.mask:
+            return
+        for cr_number, lsb, width, shift in self.segments:
+            segment_mask = ((1 << width) - 1) << lsb
+            words[cr_number] = (words[cr_number] & ~segment_mask) | (((raw >> shift) << lsb) & segment_mask)
+        if self.commit is not None:
+            cr_number, bit = self.commit
+            words[cr_number] ^= 1 << bit
+
+
+class RegisterCodec:
+    """
+    Encode/decode typed field values to and from Control Register words.
+
+    Built from the mapping produced by RegisterMapper (or
+    BasicAppsRegPackage.generate_mapping()).
+
+    Snapshots are dictionaries of CR number -> 32-bit word, as logged by
+    scripts/moku_read.py. Keys may be int or decimal strings (JSON round-trip),
+    and missing CRs read as zero (moku_read only records non-zero words).
+
+    Example:
+        >>> codec = RegisterCodec(package.generate_mapping())
+        >>> words = codec.encode({"intensity": 2400, "arm": True})
+        >>> codec.decode(words)
+        {'intensity': 2399, 'arm': True}
+        >>> columns = codec.decode_batch(snapshots)  # one column per field
+    """
+
+    def __init__(self, mappings: Sequence[RegisterMapping]):
+        self._set_fields(FieldCodec.from_mapping(m) for m in mappings)
+
+    @classmethod
+    def from_fields(cls, fields: Iterable[FieldCodec]) -> 'RegisterCodec':
+        """Codec from already-compiled FieldCodecs (e.g. a binary snapshot)."""
+        codec = cls.__new__(cls)
+        codec._set_fields(fields)
+        return codec
+
+    def _set_fields(self, fields: Iterable[FieldCodec]) -> None:
+        self.fields: Dict[str, FieldCodec] = {f.name: f for f in fields}
+        self.cr_numbers: Tuple[int, ...] = tuple(sorted(
+            {cr for f in self.fields.values() for cr in f.cr_numbers}
+        ))
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.fields
+
+    def _field(self, name: str) -> FieldCodec:
+        try:
+            return self.fields[name]
+        except KeyError:
+            raise KeyError(f"Unknown field: '{name}'") from None
+
+    # ========================================================================
+    # ENCODING
+    # ========================================================================
+
+    def encode(self,
+               values: Mapping[str, TypedValue],
+               base: Optional[Mapping[int, int]] = None
+               ) -> Dict[int, int]:
+        """
+        Pack typed values into CR words.
+
+        Args:
+            values: Field name -> typed value. Fields not present keep the
+                    bits from `base` (or zero).
+            base: Optional starting CR words (e.g., last written state)
+
+        Returns:
+            Dictionary of CR number -> 32-bit word for every mapped CR
+        """
+        words = {cr: 0 for cr in self.cr_numbers}
+        if base is not None:
+            for cr in self.cr_numbers:
+                words[cr] = _lookup(base, cr)
+
+        for name, value in values.items():
+            self._field(name).write(words, value)
+
+        return words
+
+    def encode_batch(self,
+                     rows: Iterable[Mapping[str, TypedValue]],
+                     base: Optional[Mapping[int, int]] = None
+                     ) -> List[Dict[int, int]]:
+        """
+        Pack many parameter sets, in write order (see encode_sequence()).
+
+        Field bits come from each row on top of `base`; commit bits of
+        spanning fields follow the previous row, so writing the rows in
+        sequence latches every row's wide values.
+        """
+        return list(self.encode_sequence(rows, base))
+
+    def encode_sequence(self,
+                        rows: Iterable[Mapping[str, TypedValue]],
+                        base: Optional[Mapping[int, int]] = None
+                        ) -> Iterator[Dict[int, int]]:
+        """
+        Lazily pack parameter sets that are written one after another.
+
+        Each row is encoded on top of `base` (fields a row omits keep their
+        `base` bits). A spanning field's commit bit is carried from the
+        previous row (the first row follows `base`) and flipped whenever
+        the field's value differs from that row, so the shim sees a commit
+        edge for every change.
+        """
+        committed = [f for f in self.fields.values() if f.commit is not None]
+        previous = self.encode({}, base)
+        for row in rows:
+            words = self.encode(row, base)
+            for field in committed:
+                cr_number, bit = field.commit
+                changed = field.read(words) != field.read(previous)
+                words[cr_number] = (words[cr_number] & ~(1 << bit)) | (
+                    (previous[cr_number] & (1 << bit)) ^ (changed << bit))
+            yield words
+            previous = words
+
+    # ========================================================================
+    # DECODING
+    # ========================================================================
+
+    def decode(self, words: Mapping[int, int]) -> Dict[str, TypedValue]:
+        """
+        Unpack one CR snapshot into typed values.
+
+        Args:
+            words: CR number -> 32-bit word (missing CRs read as zero)
+
+        Returns:
+            Field name -> typed value (mV, time units, bool)
+        """
+        return {
+            name: field.from_raw(field.read(words))
+            for name, field in self.fields.items()
+        }
+
+    def decode_batch(self,
+                     snapshots: Union[Sequence[Mapping[int, int]], Any],
+                     columns: Optional[Sequence[int]] = None
+                     ) -> Dict[str, Sequence[TypedValue]]:
+        """
+        Unpack many CR snapshots into one typed column per field.
+
+        Args:
+            snapshots: Either a sequence of CR snapshot dictionaries, or a
+                       2-D numpy array of shape (n_snapshots, n_crs)
+            columns: CR number of each array column (arrays only;
+                     defaults to self.cr_numbers)
+
+        Returns:
+            Field name -> column of typed values. Columns are numpy arrays
+            (int64 or bool) when numpy is installed, lists otherwise.
+        """
+        _numpy()
+        if np is not None and isinstance(snapshots, np.ndarray):
+            if columns is None:
+                columns = self.cr_numbers
+            if snapshots.ndim != 2 or snapshots.shape[1] != len(columns):
+                raise ValueError(
+                    f"Expected array of shape (n, {len(columns)}), got {snapshots.shape}"
+                )
+            index = {cr: i for i, cr in enumerate(columns)}
+            words = snapshots.astype(np.int64, copy=False)
+            cr_columns = {
+                cr: words[:, index[cr]] if cr in index else np.zeros(len(words), dtype=np.int64)
+                for cr in self.cr_numbers
+            }
+        else:
+            if columns is not None:
+                raise ValueError("columns is only valid for array input")
+            cr_columns = {
+                cr: [_lookup(snapshot, cr) for snapshot in snapshots]
+                for cr in self.cr_numbers
+            }
+            if np is not None:
+                cr_columns = {cr: np.asarray(col, dtype=np.int64) for cr, col in cr_columns.items()}
+
+        if np is None:
+            return {name: _decode_list(field, cr_columns) for name, field in self.fields.items()}
+
+        return {
+            name: _decode_column(field, cr_columns)
+            for name, field in self.fields.items()
+        }
+
+
+def _lookup(words: Mapping, cr_number: int) -> int:
+    """Read a CR word from a snapshot keyed by int or decimal string."""
+    if cr_number in words:
+        return words[cr_number]
+    return words.get(str(cr_number), 0)
+
+
+def _decode_list(field: FieldCodec, cr_columns: Dict[int, List[int]]) -> List[TypedValue]:
+    """Pure-Python FieldCodec.read() + from_raw() over columns of words."""
+    if not field.segments:
+        return [field.from_raw(field.extract(word)) for word in cr_columns[field.cr_number]]
+    rows = zip(*(cr_columns[cr] for cr in field.cr_numbers))
+    return [field.from_raw(field.read(dict(zip(field.cr_numbers, row)))) for row in rows]
+
+
+def _decode_column(field: FieldCodec, cr_columns: Dict[int, 'np.ndarray']) -> 'np.ndarray':
+    """Vectorized FieldCodec.read() + from_raw() over columns of words."""
+    if field.segments:
+        raw = np.zeros(len(cr_columns[field.cr_number]), dtype=np.int64)
+        for cr_number, lsb, width, shift in field.segments:
+            raw |= ((cr_columns[cr_number] >> lsb) & ((1 << width) - 1)) << shift
+    else:
+        raw = (cr_columns[field.cr_number] >> field.lsb) & field.mask
+    if field.signed:
+        sign_bit = 1 << (field.width - 1)
+        raw = (raw ^ sign_bit) - sign_bit
+
+    if field.is_boolean:
+        return raw.astype(bool)
+    if field.is_voltage:
+        # Same expression as TypeConverter.raw_to_*: int((raw / fs) * mV)
+        return ((raw / float(field.full_scale_raw)) * field.full_scale_mv).astype(np.int64)
+    return raw
@@ -0,0 +1,152 @@
+"""
+Minimal-write delta planning for Control Register updates.
+
+Between consecutive shots usually only a few fields change. The planner
+encodes parameter sets with RegisterCodec and returns only the CR words
+that differ from the last written state, so each update costs the fewest
+possible register writes (network round-trips to the device).
+
+Architecture:
+- Zero dependencies (pure Python + stdlib only)
+- Stateless helpers (diff, plan) for one-off updates
+- Stateful update() for live loops, schedule() for precomputed sweeps
+
+Design References:
+- Codec: codec.py
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from .codec import RegisterCodec, TypedValue
+
+
+@dataclass
+class DeltaSchedule:
+    """
+    Precomputed write schedule for a sequence of parameter sets.
+
+    Attributes:
+        steps: One dict per parameter set, CR number -> word to write
+        registers_per_update: CRs a full (non-delta) push would write
+        total_writes: Total CR writes across all steps
+        full_writes: CR writes if every step rewrote every register
+        savings_percent: Percentage of writes avoided
+    """
+    steps: List[Dict[int, int]]
+    registers_per_update: int
+    total_writes: int = field(init=False)
+    full_writes: int = field(init=False)
+    savings_percent: float = field(init=False)
+
+    def __post_init__(self):
+        """Calculate derived fields."""
+        self.total_writes = sum(len(step) for step in self.steps)
+        self.full_writes = len(self.steps) * self.registers_per_update
+        if self.full_writes:
+            self.savings_percent = (1 - self.total_writes / self.full_writes) * 100
+        else:
+            self.savings_percent = 0.0
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __iter__(self):
+        return iter(self.steps)
+
+
+class DeltaPlanner:
+    """
+    Plans the minimal set of CR writes between successive parameter sets.
+
+    Parameter sets may be partial: fields that are not given keep their
+    previously written value.
+
+    Example:
+        >>> planner = DeltaPlanner(package.codec())
+        >>> planner.update({"intensity": 2400, "timeout": 100})  # first push: all CRs
+        {6: 0x3D700000, 7: 0x00640000}
+        >>> planner.update({"intensity": 2500})                  # only CR6 changed
+        {6: 0x3FFF0000}
+    """
+
+    def __init__(self, codec: RegisterCodec, initial: Optional[Mapping[int, int]] = None):
+        """
+        Args:
+            codec: RegisterCodec for the package mapping
+            initial: Known device CR words. If None, the device state is
+                     unknown and the first update writes every CR.
+        """
+        self.codec = codec
+        self.state: Optional[Dict[int, int]] = None
+        if initial is not None:
+            self.state = codec.encode({}, base=initial)
+
+    @staticmethod
+    def diff(previous: Optional[Mapping[int, int]], current: Mapping[int, int]) -> Dict[int, int]:
+        """
+        Return the CR words in `current` that differ from `previous`.
+
+        Args:
+            previous: Last written CR words (None = unknown, write everything)
+            current: Desired CR words
+
+        Returns:
+            CR number -> word, only for registers that must be written
+        """
+        if previous is None:
+            return dict(current)
+        return {cr: word for cr, word in current.items() if previous.get(cr) != word}
+
+    def plan(self,
+             previous: Mapping[str, TypedValue],
+             current: Mapping[str, TypedValue],
+             base: Optional[Mapping[int, int]] = None
+             ) -> Dict[int, int]:
+        """
+        Plan the writes needed to go from one parameter set to the next.
+
+        Args:
+            previous: Parameter set currently on the device
+            current: Parameter set to apply (fields not given keep `previous`)
+            base: CR words underneath `previous` (defaults to zeros)
+
+        Returns:
+            CR number -> word for every register that changes
+        """
+        before = self.codec.encode(previous, base=base)
+        after = self.codec.encode(current, base=before)
+        return self.diff(before, after)
+
+    def update(self, values: Mapping[str, TypedValue]) -> Dict[int, int]:
+        """
+        Apply a (partial) parameter set to the tracked device state.
+
+        The caller must write the returned words to the device; the planner
+        assumes they were written and updates its state.
+
+        Returns:
+            CR number -> word for every register that changes
+        """
+        current = self.codec.encode(values, base=self.state)
+        writes = self.diff(self.state, current)
+        self.state = current
+        return writes
+
+    def schedule(self, param_sets: Iterable[Mapping[str, TypedValue]]) -> DeltaSchedule:
+        """
+        Precompute the delta writes for a whole sequence of parameter sets.
+
+        Starts from the planner's current state and does not modify it.
+
+        Returns:
+            DeltaSchedule with one write dict per parameter set
+        """
+        state = self.state
+        steps = []
+        for values in param_sets:
+            current = self.codec.encode(values, base=state)
+            steps.append(self.diff(state, current))
+            state = current
+
+        return DeltaSchedule(steps=steps, registers_per_update=len(self.codec.cr_numbers))
@@ -0,0 +1,187 @@
+"""
+Register-file geometry and bitset free-space model.
+
+A geometry describes the block of Control Registers an application owns
+(first/last CR number and register width). Named profiles cover the
+register schemes in use; custom geometries (e.g., multi-instrument designs
+with hundreds of registers) can be built directly.
+
+FreeSpace tracks used bits as one integer bitmask per register plus the
+longest free run of each register, so finding a slot skips full registers
+without inspecting their bits.
+
+Architecture:
+- Zero dependencies (pure Python + stdlib only)
+- Used by RegisterMapper wherever placement searches all registers for room
+  (update_frequency, incremental and pinned placement; optimal around
+  pins packs its free runs)
+
+Design References:
+- Mapper: mapper.py
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RegisterGeometry:
+    """
+    Block of Control Registers available to an application (pure data).
+
+    Attributes:
+        name: Profile name (e.g., 'basic_app')
+        first_cr: First usable CR number
+        last_cr: Last usable CR number (inclusive)
+        bits_per_register: Register width in bits
+    """
+    name: str
+    first_cr: int
+    last_cr: int
+    bits_per_register: int = 32
+
+    def __post_init__(self):
+        """Validate the register range and width."""
+        if self.first_cr < 0 or self.last_cr < self.first_cr:
+            raise ValueError(
+                f"Invalid register range CR{self.first_cr}-CR{self.last_cr} for geometry '{self.name}'"
+            )
+        if self.bits_per_register < 1:
+            raise ValueError(
+                f"bits_per_register must be positive, got {self.bits_per_register} for geometry '{self.name}'"
+            )
+
+    @property
+    def register_count(self) -> int:
+        """Number of usable registers."""
+        return self.last_cr - self.first_cr + 1
+
+    @property
+    def total_bits(self) -> int:
+        """Total usable bits."""
+        return self.register_count * self.bits_per_register
+
+    def cr_numbers(self) -> range:
+        """All usable CR numbers in ascending order."""
+        return range(self.first_cr, self.last_cr + 1)
+
+    def describe(self) -> str:
+        """Human-readable summary, e.g. 'CR6-CR17 (12 x 32 bits)'."""
+        return (f"CR{self.first_cr}-CR{self.last_cr} "
+                f"({self.register_count} x {self.bits_per_register} bits)")
+
+
+GEOMETRY_PROFILES: Dict[str, RegisterGeometry] = {
+    # BasicApp shim: CR0-CR5 reserved, application fields in CR6-CR17
+    'basic_app': RegisterGeometry('basic_app', first_cr=6, last_cr=17),
+    # FORGE/BPD shim: CR0 carries the FORGE control bits, fields in CR1-CR15
+    'forge': RegisterGeometry('forge', first_cr=1, last_cr=15),
+    # Raw CloudCompile wrapper: all sixteen Control registers
+    'cloud_compile': RegisterGeometry('cloud_compile', first_cr=0, last_cr=15),
+}
+
+DEFAULT_GEOMETRY = GEOMETRY_PROFILES['basic_app']
+
+
+def get_geometry(name: str) -> RegisterGeometry:
+    """
+    Look up a geometry profile by name.
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    try:
+        return GEOMETRY_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown register geometry '{name}'. Valid profiles: {sorted(GEOMETRY_PROFILES)}"
+        ) from None
+
+
+def _longest_run(free: int) -> int:
+    """Length of the longest run of set bits."""
+    length = 0
+    while free:
+        free &= free >> 1
+        length += 1
+    return length
+
+
+def _run_starts(free: int, width: int) -> int:
+    """Bitmask of positions p where bits p..p+width-1 are all set."""
+    runs = free
+    covered = 1
+    while covered < width:
+        step = min(covered, width - covered)
+        runs &= runs >> step
+        covered += step
+    return runs
+
+
+class FreeSpace:
+    """
+    Bitset model of the free bits in a register file.
+
+    Space is only ever claimed (never released), so the first register that
+    can hold a given width only moves forward; one cursor per width keeps
+    repeated searches amortised linear in the number of registers.
+    """
+
+    def __init__(self, geometry: RegisterGeometry):
+        self.geometry = geometry
+        self._full = (1 << geometry.bits_per_register) - 1
+        self._used: List[int] = [0] * geometry.register_count
+        self._longest: List[int] = [geometry.bits_per_register] * geometry.register_count
+        self._cursor: List[int] = [0] * (geometry.bits_per_register + 1)
+
+    def used(self, cr_number: int) -> int:
+        """Bitmask of used bits in a register."""
+        return self._used[cr_number - self.geometry.first_cr]
+
+    def fits(self, cr_number: int, mask: int) -> bool:
+        """True if the register is in range and none of the mask bits are used."""
+        index = cr_number - self.geometry.first_cr
+        return (0 <= index < len(self._used) and 0 <= mask <= self._full
+                and not self._used[index] & mask)
+
+    def claim(self, cr_number: int, mask: int) -> None:
+        """Mark bits as used (caller checks fits() first)."""
+        index = cr_number - self.geometry.first_cr
+        self._used[index] |= mask
+        self._longest[index] = _longest_run(~self._used[index] & self._full)
+
+    def find_slot(self, bit_width: int) -> Optional[Tuple[int, int]]:
+        """First register (ascending) with a free run of bit_width bits, highest run first; (cr_number, msb)."""
+        if not 1 <= bit_width <= self.geometry.bits_per_register:
+            return None
+        index = self._cursor[bit_width]
+        while index < len(self._longest) and self._longest[index] < bit_width:
+            index += 1
+        self._cursor[bit_width] = index
+        if index == len(self._longest):
+            return None
+        starts = _run_starts(~self._used[index] & self._full, bit_width)
+        return self.geometry.first_cr + index, starts.bit_length() - 1 + bit_width - 1
+
+    def free_runs(self) -> List[Tuple[int, int, int]]:
+        """Maximal free bit runs of partly used registers (ascending CR, highest run first); (cr_number, msb, width)."""
+        runs = []
+        for index, used in enumerate(self._used):
+            free = ~used & self._full if used else 0
+            while free:
+                msb = free.bit_length() - 1
+                lsb = msb
+                while lsb and free >> (lsb - 1) & 1:
+                    lsb -= 1
+                runs.append((self.geometry.first_cr + index, msb, msb - lsb + 1))
+                free &= (1 << lsb) - 1
+        return runs
+
+    def find_empty_run(self, count: int) -> Optional[int]:
+        """First CR starting a run of `count` completely free registers."""
+        run = 0
+        for index, used in enumerate(self._used):
+            run = 0 if used else run + 1
+            if run == count:
+                return self.geometry.first_cr + index - count + 1
+        return None
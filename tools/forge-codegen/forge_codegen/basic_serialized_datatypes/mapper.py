@@ -2,7 +2,8 @@
 Register mapping algorithm for BasicAppDataTypes.
 
 This module provides pure Python algorithms for mapping BasicAppDataTypes to
-physical Control Registers (CR6-CR17) with efficient bit packing.
+physical Control Registers (CR6-CR17 by default, see geometry.py) with
+efficient bit packing.
 
 Architecture:
 - Zero dependencies (pure Python + stdlib only)
@@ -14,11 +15,21 @@ Design References:
 - Spec: docs/BasicAppDataTypes/BAD_Phase2_RegisterMapping.md
 """
 
+import time
+from collections import Counter
+from bisect import bisect_left
 from dataclasses import dataclass, field
-from typing import List, Tuple, Dict, Optional, Literal
+from typing import List, Tuple, Dict, Optional, Literal, Sequence, TYPE_CHECKING
 from enum import Enum
 from .types import BasicAppDataTypes
 from .metadata import TYPE_REGISTRY
+from .geometry import RegisterGeometry, DEFAULT_GEOMETRY, FreeSpace
+
+if TYPE_CHECKING:
+    from .cache import MappingCache
+
+# Bump whenever placement results change for the same inputs (invalidates MappingCache)
+MAPPER_VERSION = "3"
 
 
 @dataclass(frozen=True)
@@ -31,6 +42,12 @@ class RegisterMapping:
         datatype: The BasicAppDataTypes enum value
         cr_number: Control register number (6-17)
         bit_slice: Tuple of (msb, lsb) for VHDL extraction (e.g., (31, 16))
+        segments: Fields wider than a register only: (cr_number, msb, lsb) per
+                  register, most significant part first (cr_number/bit_slice
+                  are the first segment)
+        commit_bit: Fields wider than a register only: (cr_number, bit) of the
+                    toggle bit that commits a new value (in the last register
+                    of the span, so it is written last)
 
     Example:
         RegisterMapping(
@@ -45,25 +62,100 @@ class RegisterMapping:
     datatype: BasicAppDataTypes
     cr_number: int  # 6-17
     bit_slice: Tuple[int, int]  # (msb, lsb)
+    segments: Tuple[Tuple[int, int, int], ...] = ()  # (cr_number, msb, lsb), MS part first
+    commit_bit: Optional[Tuple[int, int]] = None  # (cr_number, bit)
+
+    @property
+    def is_spanning(self) -> bool:
+        """True if the field spans more than one register."""
+        return len(self.segments) > 1
+
+    def parts(self) -> Tuple[Tuple[int, int, int], ...]:
+        """(cr_number, msb, lsb) of every register slice, most significant first."""
+        return self.segments or ((self.cr_number,) + tuple(self.bit_slice),)
+
+    def cr_numbers(self) -> Tuple[int, ...]:
+        """Every register touched by the field (including the commit bit)."""
+        crs = [cr for cr, _, _ in self.parts()]
+        if self.commit_bit is not None and self.commit_bit[0] not in crs:
+            crs.append(self.commit_bit[0])
+        return tuple(crs)
 
     def to_vhdl_slice(self) -> str:
         """
         Generate VHDL bit extraction code.
 
         Returns:
-            VHDL slice syntax (e.g., "app_reg_6(31 downto 16)" or "app_reg_6(15)")
+            VHDL slice syntax (e.g., "app_reg_6(31 downto 16)" or "app_reg_6(15)");
+            spanning fields concatenate their slices, MS part first
+            (e.g., "app_reg_6(31 downto 0) & app_reg_7(31 downto 16)")
         """
-        msb, lsb = self.bit_slice
-        if msb == lsb:
-            # Single bit
-            return f"app_reg_{self.cr_number}({msb})"
-        else:
-            # Multi-bit slice
-            return f"app_reg_{self.cr_number}({msb} downto {lsb})"
+        slices = []
+        for cr_number, msb, lsb in self.parts():
+            if msb == lsb:
+                # Single bit
+                slices.append(f"app_reg_{cr_number}({msb})")
+            else:
+                # Multi-bit slice
+                slices.append(f"app_reg_{cr_number}({msb} downto {lsb})")
+        return " & ".join(slices)
 
     def bit_width(self) -> int:
-        """Calculate bit width from slice."""
-        return self.bit_slice[0] - self.bit_slice[1] + 1
+        """Calculate bit width from slice (summed over segments)."""
+        return sum(msb - lsb + 1 for _, msb, lsb in self.parts())
+
+
+def _cr_slices(mapping: RegisterMapping, cr_number: int) -> List[Tuple[int, int, str]]:
+    """(msb, lsb, label) of each part of a mapping that lies in one register."""
+    if not mapping.is_spanning:
+        return [(mapping.bit_slice[0], mapping.bit_slice[1], mapping.name)]
+
+    slices = []
+    offset = mapping.bit_width()
+    for cr, msb, lsb in mapping.parts():
+        width = msb - lsb + 1
+        if cr == cr_number:
+            slices.append((msb, lsb, f"{mapping.name}[{offset - 1}:{offset - width}]"))
+        offset -= width
+    if mapping.commit_bit is not None and mapping.commit_bit[0] == cr_number:
+        bit = mapping.commit_bit[1]
+        slices.append((bit, bit, f"{mapping.name}.commit"))
+    return slices
+
+
+def _write_probability(rates: List[float]) -> float:
+    """Probability that a register holding fields with these update rates is written."""
+    unchanged = 1.0
+    for rate in rates:
+        unchanged *= 1.0 - rate
+    return 1.0 - unchanged
+
+
+def _first_fit_bins(widths: Sequence[int], capacity: int,
+                    runs: Sequence[int] = ()) -> Tuple[List[int], List[int]]:
+    """
+    First-fit bin assignment; returns (bin index per width, free bits per bin).
+
+    `runs` are the free bits of bins that are already open (tried first,
+    in order); new bins have `capacity` free bits.
+
+    Free space only shrinks, so the first bin with room for a given width
+    never moves backwards: one cursor per width keeps this linear in the
+    number of bins instead of rescanning them for every item.
+    """
+    assign: List[int] = []
+    room: List[int] = list(runs)
+    cursor: Dict[int, int] = {}
+    for width in widths:
+        b = cursor.get(width, 0)
+        while b < len(room) and room[b] < width:
+            b += 1
+        cursor[width] = b
+        if b == len(room):
+            room.append(capacity)
+        room[b] -= width
+        assign.append(b)
+    return assign, room
 
 
 @dataclass
@@ -74,15 +166,30 @@ class MappingReport:
     Attributes:
         mappings: List of RegisterMapping objects
         total_bits_used: Total bits consumed across all mappings
-        total_bits_available: Total bits available (384 = 12 * 32)
+        total_bits_available: Total bits available (384 = 12 * 32 by default)
+        update_rates: Optional field name -> probability (0-1) that the field
+                      changes between consecutive updates
+        geometry: Register file the mappings live in (unused CRs, counts)
+        pipeline_stages: Register stages the generated shim inserts on the
+                         CR -> signal path (0: extraction straight from the CRs)
         efficiency_percent: Percentage of bits used
         register_map: Dictionary mapping CR number to list of RegisterMappings
+        expected_writes_per_update: Expected CR writes per update with delta
+                                    writes (None without update_rates)
+        latency_cycles: Clock cycles from a CR write to the typed signal in
+                        the shim (worst field: spanning fields add their
+                        shadow register)
     """
     mappings: List[RegisterMapping]
     total_bits_used: int
     total_bits_available: int = 384  # 12 registers * 32 bits
+    update_rates: Optional[Dict[str, float]] = None
+    geometry: RegisterGeometry = DEFAULT_GEOMETRY
+    pipeline_stages: int = 0
     efficiency_percent: float = field(init=False)
     register_map: Dict[int, List[RegisterMapping]] = field(init=False)
+    expected_writes_per_update: Optional[float] = field(init=False)
+    latency_cycles: int = field(init=False)
 
     def __post_init__(self):
         """Calculate derived fields."""
@@ -91,9 +198,31 @@ class MappingReport:
         # Build register map
         self.register_map = {}
         for mapping in self.mappings:
-            if mapping.cr_number not in self.register_map:
-                self.register_map[mapping.cr_number] = []
-            self.register_map[mapping.cr_number].append(mapping)
+            for cr_number in mapping.cr_numbers():
+                if cr_number not in self.register_map:
+                    self.register_map[cr_number] = []
+                self.register_map[cr_number].append(mapping)
+
+        # A CR is written when any of its fields changes (fields independent)
+        self.expected_writes_per_update = None
+        if self.update_rates is not None:
+            self.expected_writes_per_update = sum(
+                _write_probability([self.update_rates.get(m.name, 0.0) for m in group])
+                for group in self.register_map.values()
+            )
+
+        # Pipeline stages, the update register, and the shadow register of spanning fields
+        if self.pipeline_stages < 0:
+            raise ValueError(f"pipeline_stages must be >= 0, got {self.pipeline_stages}")
+        self.latency_cycles = self.pipeline_stages + 1 + any(m.is_spanning for m in self.mappings)
+
+    def register_slices(self, cr_number: int) -> List[Tuple[int, int, str, str]]:
+        """(msb, lsb, label, type name) of every field part in one register."""
+        return [
+            (msb, lsb, label, mapping.datatype.value)
+            for mapping in self.register_map[cr_number]
+            for msb, lsb, label in _cr_slices(mapping, cr_number)
+        ]
 
     def to_ascii_art(self) -> str:
         """
@@ -110,26 +239,30 @@ class MappingReport:
 
         for cr_num in sorted(self.register_map.keys()):
             parts = []
-            for mapping in sorted(self.register_map[cr_num],
-                                 key=lambda m: m.bit_slice[0],
-                                 reverse=True):
-                msb, lsb = mapping.bit_slice
-                width = mapping.bit_width()
-                parts.append(f"[{msb}:{lsb}] {mapping.name} ({width}-bit)")
+            for msb, lsb, label, _ in sorted(self.register_slices(cr_num), reverse=True):
+                parts.append(f"[{msb}:{lsb}] {label} ({msb - lsb + 1}-bit)")
 
             lines.append(f"CR{cr_num:2d}  " + " | ".join(parts))
 
         # Show unused registers
-        all_crs = set(range(6, 18))
+        all_crs = set(self.geometry.cr_numbers())
         used_crs = set(self.register_map.keys())
         unused_crs = all_crs - used_crs
         if unused_crs:
             for cr_num in sorted(unused_crs):
-                lines.append(f"CR{cr_num:2d}  [31:0] UNUSED")
+                lines.append(f"CR{cr_num:2d}  [{self.geometry.bits_per_register - 1}:0] UNUSED")
 
         lines.append("=" * 80)
         lines.append(f"Efficiency: {self.total_bits_used}/{self.total_bits_available} bits ({self.efficiency_percent:.2f}%)")
-        lines.append(f"Registers used: {len(self.register_map)}/12")
+        lines.append(f"Registers used: {len(self.register_map)}/{self.geometry.register_count}")
+        if self.expected_writes_per_update is not None:
+            lines.append(
+                f"Expected CR writes per update: {self.expected_writes_per_update:.2f} "
+                f"(full push: {len(self.register_map)})"
+            )
+        if self.pipeline_stages:
+            lines.append(f"Shim pipeline: {self.pipeline_stages} stage(s), "
+                         f"+{self.pipeline_stages} cycles (CR write to signal: {self.latency_cycles} cycles)")
         lines.append("=" * 80)
 
         return "\n".join(lines)
@@ -147,18 +280,24 @@ class MappingReport:
         lines.append("| CR  | Bit Slice | Name | Type | Width |")
         lines.append("|-----|-----------|------|------|-------|")
 
-        for mapping in sorted(self.mappings,
-                            key=lambda m: (m.cr_number, -m.bit_slice[0])):
-            msb, lsb = mapping.bit_slice
-            width = mapping.bit_width()
-            type_name = mapping.datatype.value
-            lines.append(f"| {mapping.cr_number:2d}  | {msb:2d}:{lsb:2d}     | {mapping.name} | {type_name} | {width} |")
+        rows = []
+        for cr_num in self.register_map:
+            for msb, lsb, label, type_name in self.register_slices(cr_num):
+                rows.append((cr_num, -msb, lsb, label, type_name))
+        for cr_num, neg_msb, lsb, label, type_name in sorted(rows):
+            msb = -neg_msb
+            lines.append(f"| {cr_num:2d}  | {msb:2d}:{lsb:2d}     | {label} | {type_name} | {msb - lsb + 1} |")
 
         lines.append("")
         lines.append("## Summary")
         lines.append(f"- **Total bits used**: {self.total_bits_used}/{self.total_bits_available}")
         lines.append(f"- **Efficiency**: {self.efficiency_percent:.2f}%")
-        lines.append(f"- **Registers used**: {len(self.register_map)}/12")
+        lines.append(f"- **Registers used**: {len(self.register_map)}/{self.geometry.register_count}")
+        if self.expected_writes_per_update is not None:
+            lines.append(f"- **Expected CR writes per update**: {self.expected_writes_per_update:.2f}")
+        if self.pipeline_stages:
+            lines.append(f"- **Shim pipeline**: {self.pipeline_stages} stage(s), +{self.pipeline_stages} cycles "
+                         f"(CR write to signal: {self.latency_cycles} cycles)")
 
         return "\n".join(lines)
 
@@ -178,15 +317,13 @@ class MappingReport:
         for cr_num in sorted(self.register_map.keys()):
             lines.append(f"--")
             lines.append(f"-- CR{cr_num}:")
-            for mapping in sorted(self.register_map[cr_num],
-                                 key=lambda m: m.bit_slice[0],
-                                 reverse=True):
-                msb, lsb = mapping.bit_slice
-                type_name = mapping.datatype.value
-                lines.append(f"--   [{msb:2d}:{lsb:2d}] {mapping.name} ({type_name}, {mapping.bit_width()}-bit)")
+            for msb, lsb, label, type_name in sorted(self.register_slices(cr_num), reverse=True):
+                lines.append(f"--   [{msb:2d}:{lsb:2d}] {label} ({type_name}, {msb - lsb + 1}-bit)")
 
         lines.append("--")
         lines.append(f"-- Total: {self.total_bits_used}/{self.total_bits_available} bits ({self.efficiency_percent:.2f}%)")
+        if self.pipeline_stages:
+            lines.append(f"-- Pipeline: {self.pipeline_stages} stage(s), CR write to signal: {self.latency_cycles} cycles")
         lines.append("--------------------------------------------------------------------------------")
 
         return "\n".join(lines)
@@ -198,16 +335,21 @@ class MappingReport:
         Returns:
             Dictionary suitable for json.dumps()
         """
-        return {
-            "mappings": [
-                {
-                    "name": m.name,
-                    "datatype": m.datatype.value,
-                    "cr_number": m.cr_number,
-                    "bit_slice": list(m.bit_slice)
-                }
-                for m in self.mappings
-            ],
+        entries = []
+        for m in self.mappings:
+            entry = {
+                "name": m.name,
+                "datatype": m.datatype.value,
+                "cr_number": m.cr_number,
+                "bit_slice": list(m.bit_slice)
+            }
+            if m.is_spanning:
+                entry["segments"] = [list(segment) for segment in m.segments]
+                entry["commit_bit"] = list(m.commit_bit)
+            entries.append(entry)
+
+        result = {
+            "mappings": entries,
             "summary": {
                 "bits_used": self.total_bits_used,
                 "bits_available": self.total_bits_available,
@@ -215,6 +357,135 @@ class MappingReport:
                 "registers_used": len(self.register_map)
             }
         }
+        if self.expected_writes_per_update is not None:
+            result["summary"]["expected_writes_per_update"] = round(self.expected_writes_per_update, 3)
+        if self.pipeline_stages:
+            result["summary"]["pipeline_stages"] = self.pipeline_stages
+            result["summary"]["latency_cycles"] = self.latency_cycles
+        if self.geometry != DEFAULT_GEOMETRY:
+            result["geometry"] = {
+                "name": self.geometry.name,
+                "first_cr": self.geometry.first_cr,
+                "last_cr": self.geometry.last_cr,
+                "bits_per_register": self.geometry.bits_per_register
+            }
+        return result
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'MappingReport':
+        """
+        Rebuild a report from to_json() output (e.g., a mapping lock file).
+
+        Args:
+            data: Dictionary from to_json() / json.load()
+
+        Returns:
+            MappingReport with the stored mappings
+
+        Raises:
+            ValueError: If an entry is malformed or has an unknown datatype
+        """
+        mappings = []
+        for entry in data.get("mappings", []):
+            try:
+                msb, lsb = entry["bit_slice"]
+                segments = tuple(
+                    (int(cr), int(seg_msb), int(seg_lsb))
+                    for cr, seg_msb, seg_lsb in entry.get("segments", ())
+                )
+                commit_bit = entry.get("commit_bit")
+                mappings.append(RegisterMapping(
+                    name=entry["name"],
+                    datatype=BasicAppDataTypes(entry["datatype"]),
+                    cr_number=int(entry["cr_number"]),
+                    bit_slice=(int(msb), int(lsb)),
+                    segments=segments,
+                    commit_bit=(int(commit_bit[0]), int(commit_bit[1])) if commit_bit else None
+                ))
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Invalid mapping entry {entry!r}: {e}") from e
+
+        geometry = DEFAULT_GEOMETRY
+        if "geometry" in data:
+            try:
+                geometry = RegisterGeometry(**data["geometry"])
+            except TypeError as e:
+                raise ValueError(f"Invalid geometry {data['geometry']!r}: {e}") from e
+
+        summary = data.get("summary", {})
+        return cls(
+            mappings=mappings,
+            total_bits_used=sum(m.bit_width() for m in mappings),
+            total_bits_available=summary.get("bits_available", geometry.total_bits),
+            geometry=geometry,
+            pipeline_stages=summary.get("pipeline_stages", 0)
+        )
+
+
+@dataclass
+class StrategyComparison:
+    """
+    Registers used by each heuristic strategy vs the optimal packing.
+
+    Attributes:
+        registers_used: Strategy name -> registers used (None if it failed to fit)
+        optimal_registers: Registers used by the 'optimal' strategy
+        proven_optimal: False if the time budget ran out before optimality was proven
+        lower_bound: Lower bound on registers needed (ceil(total_bits / 32))
+        gap: Strategy name -> extra registers vs optimal (None if it failed)
+    """
+    registers_used: Dict[str, Optional[int]]
+    optimal_registers: int
+    proven_optimal: bool
+    lower_bound: int
+    gap: Dict[str, Optional[int]] = field(init=False)
+
+    def __post_init__(self):
+        """Calculate derived fields."""
+        self.gap = {
+            name: None if used is None else used - self.optimal_registers
+            for name, used in self.registers_used.items()
+        }
+
+    def summary(self) -> str:
+        """One-line human-readable summary."""
+        parts = [
+            f"{name}=FAIL" if used is None else f"{name}={used} (+{self.gap[name]})"
+            for name, used in self.registers_used.items()
+        ]
+        status = "proven" if self.proven_optimal else "time budget hit, best found"
+        return f"optimal={self.optimal_registers} ({status}, lower bound {self.lower_bound}); " + ", ".join(parts)
+
+
+class _IntervalIndex:
+    """
+    Non-overlapping bit intervals per register, sorted by LSB.
+
+    Inserting checks only the neighbours of the insertion point (intervals
+    in the index never overlap), so validating n pins is O(n log n).
+    """
+
+    def __init__(self):
+        self._lsbs: Dict[int, List[int]] = {}
+        self._entries: Dict[int, List[Tuple[int, int, str]]] = {}  # (lsb, msb, name)
+
+    def insert(self, cr_number: int, msb: int, lsb: int, name: str) -> Optional[Tuple[int, int, str]]:
+        """Add an interval, or return the (lsb, msb, name) it overlaps without adding it."""
+        lsbs = self._lsbs.setdefault(cr_number, [])
+        entries = self._entries.setdefault(cr_number, [])
+        i = bisect_left(lsbs, lsb)
+        if i > 0 and entries[i - 1][1] >= lsb:
+            return entries[i - 1]
+        if i < len(entries) and entries[i][0] <= msb:
+            return entries[i]
+        lsbs.insert(i, lsb)
+        entries.insert(i, (lsb, msb, name))
+        return None
+
+
+def _format_slot(cr_number: int, msb: int, lsb: int) -> str:
+    """Slot in YAML pin notation (e.g., 'CR7[15:0]' or 'CR7[3]')."""
+    return f"CR{cr_number}[{msb}]" if msb == lsb else f"CR{cr_number}[{msb}:{lsb}]"
 
 
 class RegisterMapper:
@@ -225,88 +496,254 @@ class RegisterMapper:
     - first_fit: Sequential packing (simple, predictable)
     - best_fit: Size-sorted packing (optimal efficiency)
     - type_clustering: Group by type family (readable)
+    - optimal: Exact bin packing (fewest registers, time-budgeted)
+    - update_frequency: Co-locate frequently-changing fields (fewest CR writes per update)
+
+    Incremental mode: pass `previous` (e.g., MappingReport.from_json(lock).mappings)
+    to keep every unchanged field in its old slot and place only new or
+    resized fields into free space.
+
+    Pinned fields: pass `pins` (name -> (cr_number, (msb, lsb))) to fix
+    fields at explicit locations; the remaining fields are packed into the
+    free bits around them.
 
-    Constraints:
+    Fields wider than a register (e.g., 48-bit durations) are placed after
+    the packed fields in consecutive registers: full registers first, the
+    remainder MSB-aligned in the last one, followed by a commit toggle bit.
+    The host writes the span in ascending CR order, so flipping the commit
+    bit (in the last register) publishes the complete value at once.
+
+    Constraints (default 'basic_app' geometry; see geometry.py):
     - 12 registers available (CR6-CR17)
     - 32 bits per register
     - 384 total bits
     - MSB-first packing within registers
-    - No spanning across registers (Phase 2 limitation)
+    - Only fields wider than a register span registers
     """
 
-    MAX_APP_REGISTERS = 12  # CR6-CR17
-    BITS_PER_REGISTER = 32
-    TOTAL_BITS = MAX_APP_REGISTERS * BITS_PER_REGISTER  # 384 bits
-    FIRST_CR = 6
-    LAST_CR = 17
+    OPTIMAL_TIME_BUDGET = 1.0  # seconds
+    OPTIMAL_SEARCH_LIMIT = 400  # fields; larger specs keep the first-fit decreasing packing
+
+    def __init__(self,
+                 time_budget: float = OPTIMAL_TIME_BUDGET,
+                 geometry: RegisterGeometry = DEFAULT_GEOMETRY,
+                 cache: Optional['MappingCache'] = None):
+        """
+        Args:
+            time_budget: Search time limit in seconds for the 'optimal' strategy.
+                         When exceeded, the best packing found so far is used
+                         (never worse than best_fit).
+            geometry: Register file to map into (CR range and register width)
+            cache: Optional on-disk MappingCache; map() results are looked up
+                   and stored there (keyed by every input, see MappingCache.key)
+        """
+        self.time_budget = time_budget
+        self.geometry = geometry
+        self.cache = cache
 
     def map(self,
             items: List[Tuple[str, BasicAppDataTypes]],
-            strategy: Literal["first_fit", "best_fit", "type_clustering"] = "best_fit"
+            strategy: Literal["first_fit", "best_fit", "type_clustering", "optimal",
+                              "update_frequency"] = "best_fit",
+            update_rates: Optional[Dict[str, float]] = None,
+            previous: Optional[Sequence[RegisterMapping]] = None,
+            pins: Optional[Dict[str, Tuple[int, Tuple[int, int]]]] = None
             ) -> List[RegisterMapping]:
         """
         Map datatypes to control registers (pure function).
 
         Args:
             items: List of (name, BasicAppDataTypes) tuples
-            strategy: Packing strategy ('first_fit', 'best_fit', 'type_clustering')
+            strategy: Packing strategy ('first_fit', 'best_fit', 'type_clustering',
+                      'optimal', 'update_frequency')
+            update_rates: Field name -> probability (0-1) that the field changes
+                          between consecutive updates (missing = 0). Used by
+                          'update_frequency'.
+            previous: Previous mapping (lock). Fields with the same name and
+                      bit width keep their slot; only the rest are placed,
+                      in the order the strategy would pack them.
+            pins: Field name -> (cr_number, (msb, lsb)) explicit placements.
+                  Pins are honoured first (and win over `previous`); the
+                  remaining fields go into the free bits, in the order the
+                  strategy would pack them.
 
         Returns:
             List of RegisterMapping objects
 
         Raises:
-            ValueError: If types don't fit in 384 bits or invalid inputs
+            ValueError: If types don't fit in the geometry, pins are invalid or
+                        overlap, or invalid inputs
         """
+        if self.cache is None or not items:
+            return self._map(items, strategy, update_rates, previous, pins)
+
+        key = self.cache.key(items, strategy, self.geometry, update_rates, pins, previous, self.time_budget)
+        mappings = self.cache.get(key)
+        if mappings is None:
+            mappings = self._map(items, strategy, update_rates, previous, pins)
+            self.cache.put(key, mappings, self.geometry)
+        return mappings
+
+    def _map(self,
+             items: List[Tuple[str, BasicAppDataTypes]],
+             strategy: str,
+             update_rates: Optional[Dict[str, float]],
+             previous: Optional[Sequence[RegisterMapping]],
+             pins: Optional[Dict[str, Tuple[int, Tuple[int, int]]]]) -> List[RegisterMapping]:
+        """map() without the cache."""
         # Validation
         if not items:
             return []
+        self._validate(items)
+        for name, rate in (update_rates or {}).items():
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"Update rate for '{name}' must be in [0, 1], got {rate}")
+
+        if previous is not None or pins:
+            pinned = self._place_pins(items, pins or {})
+            return self._incremental(items, previous, strategy, update_rates or {}, pinned)
+
+        # Route to appropriate strategy (spanning fields are placed afterwards)
+        narrow, wide = self._split_spanning(items)
+        if strategy == "first_fit":
+            mappings = self._first_fit(narrow)
+        elif strategy == "best_fit":
+            mappings = self._best_fit(narrow)
+        elif strategy == "type_clustering":
+            mappings = self._type_clustering(narrow)
+        elif strategy == "optimal":
+            mappings = self._optimal(narrow)
+        elif strategy == "update_frequency":
+            mappings = self._update_frequency(narrow, update_rates or {})
+        else:
+            raise ValueError(f"Unknown packing strategy: {strategy}")
 
+        return mappings + self._place_spanning(wide, mappings)
+
+    def _validate(self, items: List[Tuple[str, BasicAppDataTypes]]) -> None:
+        """Reject duplicate names and overflow (counting commit bits)."""
         # Check for duplicate names
         names = [name for name, _ in items]
         if len(names) != len(set(names)):
-            duplicates = [name for name in names if names.count(name) > 1]
+            duplicates = [name for name, count in Counter(names).items() if count > 1]
             raise ValueError(f"Duplicate names found: {set(duplicates)}")
 
-        # Calculate total bits needed
-        total_bits = sum(TYPE_REGISTRY[dtype].bit_width for _, dtype in items)
-        if total_bits > self.TOTAL_BITS:
+        # Calculate total bits needed (spanning fields also need a commit bit)
+        total_bits = sum(
+            width + (1 if width > self.geometry.bits_per_register else 0)
+            for width in (TYPE_REGISTRY[dtype].bit_width for _, dtype in items)
+        )
+        if total_bits > self.geometry.total_bits:
             raise ValueError(
-                f"Cannot fit {total_bits} bits into {self.TOTAL_BITS} available bits "
-                f"({total_bits - self.TOTAL_BITS} bits overflow)"
+                f"Cannot fit {total_bits} bits into {self.geometry.total_bits} available bits "
+                f"({total_bits - self.geometry.total_bits} bits overflow)"
             )
 
-        # Check for types >32 bits (Phase 2 limitation)
-        for name, dtype in items:
-            metadata = TYPE_REGISTRY[dtype]
-            if metadata.bit_width > self.BITS_PER_REGISTER:
+    def _place_pins(self,
+                    items: List[Tuple[str, BasicAppDataTypes]],
+                    pins: Dict[str, Tuple[int, Tuple[int, int]]]) -> Dict[str, RegisterMapping]:
+        """Validate pinned slots (range, width, overlaps) and build their mappings."""
+        datatypes = dict(items)
+        index = _IntervalIndex()
+        pinned: Dict[str, RegisterMapping] = {}
+
+        for name, (cr_number, (msb, lsb)) in pins.items():
+            if name not in datatypes:
+                raise ValueError(f"Pin for unknown field '{name}'")
+            dtype = datatypes[name]
+            slot = _format_slot(cr_number, msb, lsb)
+            if not self.geometry.first_cr <= cr_number <= self.geometry.last_cr:
                 raise ValueError(
-                    f"Type '{name}' ({dtype.value}) is {metadata.bit_width} bits, "
-                    f"exceeds {self.BITS_PER_REGISTER}-bit register limit (Phase 2 limitation)"
+                    f"Pin for '{name}' ({slot}) is outside CR{self.geometry.first_cr}-CR{self.geometry.last_cr}"
+                )
+            if not 0 <= lsb <= msb < self.geometry.bits_per_register:
+                raise ValueError(f"Pin for '{name}' has an invalid bit range ({slot})")
+            bit_width = TYPE_REGISTRY[dtype].bit_width
+            if msb - lsb + 1 != bit_width:
+                raise ValueError(
+                    f"Pin for '{name}' ({slot}) is {msb - lsb + 1} bits, "
+                    f"but {dtype.value} is {bit_width} bits"
                 )
 
-        # Route to appropriate strategy
-        if strategy == "first_fit":
-            return self._first_fit(items)
-        elif strategy == "best_fit":
-            return self._best_fit(items)
-        elif strategy == "type_clustering":
-            return self._type_clustering(items)
-        else:
-            raise ValueError(f"Unknown packing strategy: {strategy}")
+            conflict = index.insert(cr_number, msb, lsb, name)
+            if conflict is not None:
+                other_lsb, other_msb, other = conflict
+                raise ValueError(
+                    f"Pinned fields '{name}' ({slot}) and '{other}' "
+                    f"({_format_slot(cr_number, other_msb, other_lsb)}) overlap"
+                )
+            pinned[name] = RegisterMapping(name, dtype, cr_number, (msb, lsb))
+
+        return pinned
+
+    def _split_spanning(self, items: List[Tuple[str, BasicAppDataTypes]]
+                        ) -> Tuple[List[Tuple[str, BasicAppDataTypes]], List[Tuple[str, BasicAppDataTypes]]]:
+        """Split items into (fields that fit one register, fields that span registers)."""
+        narrow, wide = [], []
+        for name, dtype in items:
+            if TYPE_REGISTRY[dtype].bit_width > self.geometry.bits_per_register:
+                wide.append((name, dtype))
+            else:
+                narrow.append((name, dtype))
+        return narrow, wide
+
+    def _span_registers(self, bit_width: int) -> int:
+        """Registers used by a spanning field (data plus the commit bit)."""
+        return bit_width // self.geometry.bits_per_register + 1
+
+    def _spanning_mapping(self, name: str, dtype: BasicAppDataTypes, first_cr: int) -> RegisterMapping:
+        """
+        Lay out a spanning field from first_cr on.
+
+        Full registers first, then the remainder from the MSB of the last
+        register, with the commit bit just below it (bit 31 of an extra
+        register if the width is a multiple of 32).
+        """
+        full, rest = divmod(TYPE_REGISTRY[dtype].bit_width, self.geometry.bits_per_register)
+        top = self.geometry.bits_per_register - 1
+        segments = tuple((first_cr + i, top, 0) for i in range(full))
+        last_cr = first_cr + full
+        if rest:
+            segments += ((last_cr, top, self.geometry.bits_per_register - rest),)
+        return RegisterMapping(
+            name=name,
+            datatype=dtype,
+            cr_number=first_cr,
+            bit_slice=segments[0][1:],
+            segments=segments,
+            commit_bit=(last_cr, top - rest)
+        )
+
+    def _place_spanning(self,
+                        wide: List[Tuple[str, BasicAppDataTypes]],
+                        mappings: List[RegisterMapping]) -> List[RegisterMapping]:
+        """Place spanning fields in fresh consecutive registers after the packed ones."""
+        next_cr = max((cr for m in mappings for cr in m.cr_numbers()), default=self.geometry.first_cr - 1) + 1
+        placed = []
+        for name, dtype in wide:
+            count = self._span_registers(TYPE_REGISTRY[dtype].bit_width)
+            if next_cr + count - 1 > self.geometry.last_cr:
+                raise ValueError(
+                    f"Cannot place '{name}' ({dtype.value}): needs {count} consecutive "
+                    f"registers after CR{next_cr - 1}"
+                )
+            placed.append(self._spanning_mapping(name, dtype, next_cr))
+            next_cr += count
+        return placed
 
     def _first_fit(self, items: List[Tuple[str, BasicAppDataTypes]]) -> List[RegisterMapping]:
         """
         First-fit packing: Sequential allocation from MSB.
 
         Algorithm:
-        1. Start at CR6, bit position 31 (MSB)
+        1. Start at the first CR (CR6 by default), at the MSB
         2. Pack each type sequentially
         3. Move to next register when current is full
         4. Simple and deterministic
         """
         mappings = []
-        current_cr = self.FIRST_CR
-        current_bit = self.BITS_PER_REGISTER - 1  # Start at MSB (31)
+        current_cr = self.geometry.first_cr
+        current_bit = self.geometry.bits_per_register - 1  # Start at MSB (31)
 
         for name, dtype in items:
             bit_width = TYPE_REGISTRY[dtype].bit_width
@@ -315,9 +752,9 @@ class RegisterMapper:
             if current_bit + 1 < bit_width:
                 # Not enough space in current register
                 current_cr += 1
-                current_bit = self.BITS_PER_REGISTER - 1
+                current_bit = self.geometry.bits_per_register - 1
 
-                if current_cr > self.LAST_CR:
+                if current_cr > self.geometry.last_cr:
                     raise ValueError("Ran out of registers (should not happen after validation)")
 
             # Pack this type
@@ -361,6 +798,11 @@ class RegisterMapper:
         3. Pack groups sequentially
         4. More readable but potentially less efficient
         """
+        return self._first_fit(self._cluster_order(items))
+
+    @staticmethod
+    def _cluster_order(items: List[Tuple[str, BasicAppDataTypes]]) -> List[Tuple[str, BasicAppDataTypes]]:
+        """Items in type_clustering order (voltage output, voltage input, time, boolean)."""
         # Categorize types
         voltage_output = []
         voltage_input = []
@@ -392,16 +834,380 @@ class RegisterMapper:
         booleans.sort(key=lambda x: x[0])  # Just by name
 
         # Combine in logical order
-        clustered_items = voltage_output + voltage_input + time_types + booleans
+        return voltage_output + voltage_input + time_types + booleans
+
+    def _optimal(self, items: List[Tuple[str, BasicAppDataTypes]]) -> List[RegisterMapping]:
+        """
+        Optimal packing: Exact bin packing minimizing registers used.
+
+        Algorithm:
+        1. Solve bin packing with branch-and-bound (see _solve_optimal)
+        2. Within each register, pack widest first (then by name) from MSB
+        3. Registers are numbered in order of their widest field
+        """
+        bins, _ = self._solve_optimal(items)
+        return self._registers_to_mappings(bins)
+
+    def _update_frequency(self,
+                          items: List[Tuple[str, BasicAppDataTypes]],
+                          update_rates: Dict[str, float]) -> List[RegisterMapping]:
+        """
+        Update-frequency packing: Hot fields share as few registers as possible.
+
+        Algorithm:
+        1. Sort by update rate (descending), then bit width (descending), then name
+        2. Place each field in the first register with room (any register,
+           not just the current one), below the fields already there
+           (bitset free-space model, see FreeSpace)
+        3. Hot fields fill the first registers; cold fields fill the gaps
+           left over and the remaining registers, so a typical update only
+           writes the hot registers
+        """
+        sorted_items = sorted(items, key=lambda x: (
+            -update_rates.get(x[0], 0.0), -TYPE_REGISTRY[x[1]].bit_width, x[0]
+        ))
+
+        space = FreeSpace(self.geometry)
+        mappings = []
+        for name, dtype in sorted_items:
+            bit_width = TYPE_REGISTRY[dtype].bit_width
+            slot = space.find_slot(bit_width)
+            if slot is None:
+                raise ValueError(
+                    f"Cannot pack {len(items)} types into {self.geometry.register_count} "
+                    f"registers without spanning (no free {bit_width}-bit slot for '{name}')"
+                )
+            cr_number, msb = slot
+            lsb = msb - bit_width + 1
+            space.claim(cr_number, ((1 << bit_width) - 1) << lsb)
+            mappings.append(RegisterMapping(name=name, datatype=dtype, cr_number=cr_number, bit_slice=(msb, lsb)))
+
+        return sorted(mappings, key=lambda m: (m.cr_number, -m.bit_slice[0]))
+
+    def _incremental(self,
+                     items: List[Tuple[str, BasicAppDataTypes]],
+                     previous: Optional[Sequence[RegisterMapping]],
+                     strategy: str,
+                     update_rates: Dict[str, float],
+                     pinned: Optional[Dict[str, RegisterMapping]] = None) -> List[RegisterMapping]:
+        """
+        Incremental packing: Keep pinned and locked slots, place only the rest.
+
+        Algorithm:
+        0. Place pinned fields (already validated by _place_pins)
+        1. Keep the previous slot of every field whose name and bit width are
+           unchanged and that does not collide with a pin (removed fields
+           free their slots)
+        2. Place new spanning fields in the first run of empty consecutive CRs
+        3. optimal: pack the remaining fields into the free runs of partly
+           used registers plus the empty registers with _solve_optimal
+           (fewest newly used registers)
+        4. Otherwise order them as the strategy would (rate for
+           update_frequency, clusters for type_clustering, bit width
+           descending then name for best_fit; first_fit keeps YAML order)
+           and place each in the first CR with a free run of bits, highest
+           run first (bitset free-space model, see FreeSpace)
+        """
+        if strategy not in ("first_fit", "best_fit", "type_clustering", "optimal", "update_frequency"):
+            raise ValueError(f"Unknown packing strategy: {strategy}")
+
+        if previous is None:
+            blocked = "around the pinned fields"
+        else:
+            blocked = "without moving locked fields (remap without the previous mapping)"
+        locked = {m.name: m for m in previous or ()}
+        space = FreeSpace(self.geometry)
+        placed: Dict[str, RegisterMapping] = dict(pinned or {})
+        pending = []
+
+        for mapping in placed.values():
+            for cr, mask in self._slot_masks(mapping).items():
+                space.claim(cr, mask)
+
+        for name, dtype in items:
+            if name in placed:
+                continue
+            old = locked.get(name)
+            if old is not None and old.bit_width() == TYPE_REGISTRY[dtype].bit_width:
+                masks = self._slot_masks(old)
+                if all(space.fits(cr, mask) for cr, mask in masks.items()):
+                    for cr, mask in masks.items():
+                        space.claim(cr, mask)
+                    placed[name] = RegisterMapping(name, dtype, old.cr_number, old.bit_slice,
+                                                   old.segments, old.commit_bit)
+                    continue
+            pending.append((name, dtype))
+
+        pending, wide = self._split_spanning(pending)
+        for name, dtype in wide:
+            count = self._span_registers(TYPE_REGISTRY[dtype].bit_width)
+            first_cr = space.find_empty_run(count)
+            if first_cr is None:
+                raise ValueError(f"No {count} free consecutive registers for '{name}' {blocked}")
+            placed[name] = self._spanning_mapping(name, dtype, first_cr)
+            for cr, mask in self._slot_masks(placed[name]).items():
+                space.claim(cr, mask)
+
+        if strategy == "optimal":
+            placed.update(self._place_optimal(pending, space, blocked))
+            return [placed[name] for name, _ in items]
+        if strategy == "update_frequency":
+            pending.sort(key=lambda x: (-update_rates.get(x[0], 0.0), -TYPE_REGISTRY[x[1]].bit_width, x[0]))
+        elif strategy == "type_clustering":
+            pending = self._cluster_order(pending)
+        elif strategy != "first_fit":
+            pending.sort(key=lambda x: (-TYPE_REGISTRY[x[1]].bit_width, x[0]))
+
+        for name, dtype in pending:
+            bit_width = TYPE_REGISTRY[dtype].bit_width
+            slot = space.find_slot(bit_width)
+            if slot is None:
+                raise ValueError(f"No free {bit_width}-bit slot for '{name}' {blocked}")
+            cr_number, msb = slot
+            lsb = msb - bit_width + 1
+            space.claim(cr_number, ((1 << bit_width) - 1) << lsb)
+            placed[name] = RegisterMapping(name, dtype, cr_number, (msb, lsb))
+
+        return [placed[name] for name, _ in items]
+
+    def _place_optimal(self,
+                       items: List[Tuple[str, BasicAppDataTypes]],
+                       space: FreeSpace,
+                       blocked: str) -> Dict[str, RegisterMapping]:
+        """
+        Pack fields into the free space left by pinned and locked fields.
+
+        Each free run of a partly used register is an open bin of its width;
+        empty registers are new bins. Fields packed into a run sum to at most
+        its width, so they fit it from its MSB down (widest first, as in
+        _registers_to_mappings).
+        """
+        if not items:
+            return {}
+        runs = space.free_runs()
+        empty = [cr for cr in self.geometry.cr_numbers() if not space.used(cr)]
+        bins, _ = self._solve_optimal(items, [width for _, _, width in runs])
+        if len(bins) - len(runs) > len(empty):
+            raise ValueError(
+                f"Cannot pack {', '.join(name for name, _ in items)} into the free bits {blocked} "
+                f"(needs {len(bins) - len(runs)} empty registers, {len(empty)} left)"
+            )
+
+        top = self.geometry.bits_per_register - 1
+        starts = [(cr, msb) for cr, msb, _ in runs] + [(cr, top) for cr in empty]
+        placed = {}
+        for (cr_number, msb), contents in zip(starts, bins):
+            for name, dtype in contents:
+                lsb = msb - TYPE_REGISTRY[dtype].bit_width + 1
+                space.claim(cr_number, ((1 << (msb - lsb + 1)) - 1) << lsb)
+                placed[name] = RegisterMapping(name, dtype, cr_number, (msb, lsb))
+                msb = lsb - 1
+        return placed
+
+    @staticmethod
+    def _slot_masks(mapping: RegisterMapping) -> Dict[int, int]:
+        """CR number -> bitmask of the bits a mapping occupies (including its commit bit)."""
+        masks: Dict[int, int] = {}
+        for cr_number, msb, lsb in mapping.parts():
+            masks[cr_number] = masks.get(cr_number, 0) | (((1 << (msb - lsb + 1)) - 1) << lsb)
+        if mapping.commit_bit is not None:
+            cr_number, bit = mapping.commit_bit
+            masks[cr_number] = masks.get(cr_number, 0) | (1 << bit)
+        return masks
+
+    def _registers_to_mappings(self, bins: List[List[Tuple[str, BasicAppDataTypes]]]
+                               ) -> List[RegisterMapping]:
+        """Pack each register's fields from the MSB down, numbering registers from the first CR."""
+        if len(bins) > self.geometry.register_count:
+            raise ValueError(
+                f"Cannot pack {sum(len(b) for b in bins)} types into {self.geometry.register_count} "
+                f"registers without spanning (needs {len(bins)})"
+            )
+
+        mappings = []
+        for index, contents in enumerate(bins):
+            current_bit = self.geometry.bits_per_register - 1
+            for name, dtype in contents:
+                bit_width = TYPE_REGISTRY[dtype].bit_width
+                mappings.append(RegisterMapping(
+                    name=name,
+                    datatype=dtype,
+                    cr_number=self.geometry.first_cr + index,
+                    bit_slice=(current_bit, current_bit - bit_width + 1)
+                ))
+                current_bit -= bit_width
+
+        return mappings
+
+    def _solve_optimal(self, items: List[Tuple[str, BasicAppDataTypes]],
+                       runs: Sequence[int] = ()
+                       ) -> Tuple[List[List[Tuple[str, BasicAppDataTypes]]], bool]:
+        """
+        Branch-and-bound bin packing over the geometry's registers.
 
-        return self._first_fit(clustered_items)
+        `runs` are the free bits of already open bins (free runs left by
+        pinned or locked fields). They come first and are always counted,
+        so minimizing registers minimizes the new ones opened after them.
+
+        Algorithm:
+        1. Set aside 1-bit fields: they fit in any free bit, so they only
+           matter through the total-bits bound and fill gaps at the end
+        2. Sort the rest by bit width (descending), then name
+        3. Seed the incumbent with first-fit decreasing (<= best_fit)
+        4. Depth-first: place each item into every open register with room
+           (skipping registers with identical free space) or a new one
+        5. Prune when open registers + ceil(unplaced bits beyond usable free
+           space / 32) cannot beat the incumbent; free space smaller than the
+           narrowest field is not usable. Stop at the lower bound or time budget.
+           Specs with more than OPTIMAL_SEARCH_LIMIT packed fields skip the
+           search (proven only if the incumbent meets the lower bound).
+
+        Returns:
+            (registers as lists of items: one per run, then the new ones;
+             proven_optimal)
+        """
+        capacity = self.geometry.bits_per_register
+        order = sorted(items, key=lambda x: (-TYPE_REGISTRY[x[1]].bit_width, x[0]))
+        packed = [item for item in order if TYPE_REGISTRY[item[1]].bit_width > 1]
+        fillers = order[len(packed):]
+        widths = [TYPE_REGISTRY[dtype].bit_width for _, dtype in packed]
+        n = len(packed)
+        smallest = widths[-1] if widths else capacity
+        if runs:
+            overflow = sum(TYPE_REGISTRY[dtype].bit_width for _, dtype in order) - sum(runs)
+            lower_bound = len(runs) + -(-max(0, overflow) // capacity)
+        else:
+            lower_bound = self._lower_bound([TYPE_REGISTRY[dtype].bit_width for _, dtype in order])
+
+        # Suffix sums of unplaced bits
+        remaining = [0] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + widths[i]
+
+        # Incumbent: first-fit decreasing
+        best_assign, free = _first_fit_bins(widths, capacity, runs)
+        best_count = len(free)
+
+        deadline = time.monotonic() + self.time_budget
+        assign = [0] * n
+        loads: List[int] = [capacity - run for run in runs]
+        timed_out = False
+        nodes = 0
+
+        def search(i: int, min_bin: int) -> bool:
+            """Returns True to stop the whole search."""
+            nonlocal best_count, best_assign, timed_out, nodes
+            if i == n:
+                best_count = len(loads)
+                best_assign = assign[:]
+                return best_count <= lower_bound
+
+            nodes += 1
+            if nodes % 1024 == 0 and time.monotonic() > deadline:
+                timed_out = True
+                return True
+
+            usable = sum(capacity - load for load in loads if capacity - load >= smallest)
+            overflow = remaining[i] - usable
+            needed = len(loads) + (max(0, overflow) + capacity - 1) // capacity
+            if needed >= best_count:
+                return False
+
+            width = widths[i]
+            same_as_next = i + 1 < n and widths[i + 1] == width
+            tried = set()
+            for b in range(min_bin, len(loads)):
+                room = capacity - loads[b]
+                if room < width or room in tried:
+                    continue
+                tried.add(room)
+                loads[b] += width
+                assign[i] = b
+                stop = search(i + 1, b if same_as_next else 0)
+                loads[b] -= width
+                if stop:
+                    return True
+
+            if len(loads) + 1 < best_count:
+                loads.append(width)
+                assign[i] = len(loads) - 1
+                stop = search(i + 1, len(loads) - 1 if same_as_next else 0)
+                loads.pop()
+                if stop:
+                    return True
+            return False
+
+        # The search recurses once per field; very large specs keep the incumbent
+        searched = best_count > lower_bound and n <= self.OPTIMAL_SEARCH_LIMIT
+        if searched:
+            search(0, 0)
+
+        bins: List[List[Tuple[str, BasicAppDataTypes]]] = [[] for _ in range(best_count)]
+        room = list(runs) + [capacity] * (best_count - len(runs))
+        for item, b in zip(packed, best_assign):
+            bins[b].append(item)
+            room[b] -= TYPE_REGISTRY[item[1]].bit_width
+
+        # 1-bit fields fill the gaps, opening registers only when all are full
+        b = 0
+        for item in fillers:
+            while b < len(bins) and room[b] == 0:
+                b += 1
+            if b == len(bins):
+                bins.append([])
+                room.append(capacity)
+            bins[b].append(item)
+            room[b] -= 1
+
+        return bins, (not timed_out) if searched else best_count <= lower_bound
+
+    def _lower_bound(self, widths: List[int]) -> int:
+        """Lower bound on registers: total bits, and fields wider than half a register."""
+        by_bits = -(-sum(widths) // self.geometry.bits_per_register)
+        wide = sum(1 for w in widths if 2 * w > self.geometry.bits_per_register)
+        return max(by_bits, wide)
+
+    def compare_strategies(self, items: List[Tuple[str, BasicAppDataTypes]]) -> StrategyComparison:
+        """
+        Compare registers used by each heuristic against the optimal packing.
+
+        Args:
+            items: List of (name, BasicAppDataTypes) tuples
+
+        Returns:
+            StrategyComparison with per-strategy register counts and gaps
+        """
+        registers_used: Dict[str, Optional[int]] = {}
+        for strategy in ("first_fit", "best_fit", "type_clustering"):
+            try:
+                mappings = self.map(items, strategy=strategy)
+                registers_used[strategy] = len({cr for m in mappings for cr in m.cr_numbers()})
+            except ValueError:
+                registers_used[strategy] = None
+
+        self._validate(items)
+        narrow, wide = self._split_spanning(items)
+        bins, proven = self._solve_optimal(narrow)
+        widths = [TYPE_REGISTRY[dtype].bit_width for _, dtype in narrow]
+        spanning = sum(self._span_registers(TYPE_REGISTRY[dtype].bit_width) for _, dtype in wide)
+
+        return StrategyComparison(
+            registers_used=registers_used,
+            optimal_registers=len(bins) + spanning,
+            proven_optimal=proven,
+            lower_bound=self._lower_bound(widths) + spanning,
+        )
 
-    def generate_report(self, mappings: List[RegisterMapping]) -> MappingReport:
+    def generate_report(self,
+                        mappings: List[RegisterMapping],
+                        update_rates: Optional[Dict[str, float]] = None) -> MappingReport:
         """
         Generate detailed mapping report.
 
         Args:
             mappings: List of RegisterMapping objects (from map())
+            update_rates: Optional field update rates; adds the expected CR
+                          writes per update to the report
 
         Returns:
             MappingReport with visualizations and statistics
@@ -410,5 +1216,7 @@ class RegisterMapper:
         return MappingReport(
             mappings=mappings,
             total_bits_used=total_bits,
-            total_bits_available=self.TOTAL_BITS
+            total_bits_available=self.geometry.total_bits,
+            update_rates=update_rates,
+            geometry=self.geometry
         )
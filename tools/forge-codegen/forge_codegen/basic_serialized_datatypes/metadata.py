@@ -250,6 +250,18 @@ TYPE_REGISTRY: dict[BasicAppDataTypes, TypeMetadata] = {
         signedness='unsigned',
         unit='ns'
     ),
+    BasicAppDataTypes.PULSE_DURATION_NS_U48: TypeMetadata(
+        type_name=BasicAppDataTypes.PULSE_DURATION_NS_U48,
+        bit_width=48,  # Spans two CRs (see RegisterMapping.segments)
+        vhdl_type="unsigned(47 downto 0)",
+        python_type=int,
+        min_value=0,
+        max_value=281474976710655,  # nanoseconds (~78 hours)
+        default_value=0,
+        direction=None,
+        signedness='unsigned',
+        unit='ns'
+    ),
 
     # ========================================================================
     # TIME TYPES (microseconds)
@@ -32,13 +32,13 @@ class PulseDuration_ns:
         63  # 500ns / 8ns = 62.5 -> 63 (rounded up)
     """
 
-    def __init__(self, nanoseconds: int, width: Literal[8, 16, 32] = 16):
+    def __init__(self, nanoseconds: int, width: Literal[8, 16, 32, 48] = 16):
         """
         Create a nanosecond duration.
 
         Args:
             nanoseconds: Duration in nanoseconds
-            width: Bit width for serialization (8, 16, or 32)
+            width: Bit width for serialization (8, 16, 32, or 48)
 
         Raises:
             ValueError: If nanoseconds exceeds max for chosen width
@@ -65,6 +65,8 @@ class PulseDuration_ns:
             return BasicAppDataTypes.PULSE_DURATION_NS_U16
         elif self.width == 32:
             return BasicAppDataTypes.PULSE_DURATION_NS_U32
+        elif self.width == 48:
+            return BasicAppDataTypes.PULSE_DURATION_NS_U48
         else:
             raise ValueError(f"Unsupported width: {self.width}")
 
@@ -57,6 +57,7 @@ class BasicAppDataTypes(str, Enum):
     PULSE_DURATION_NS_U8 = "pulse_duration_ns_u8"        # 8-bit, 0-255 ns
     PULSE_DURATION_NS_U16 = "pulse_duration_ns_u16"      # 16-bit, 0-65,535 ns
     PULSE_DURATION_NS_U32 = "pulse_duration_ns_u32"      # 32-bit, 0-4.29 sec
+    PULSE_DURATION_NS_U48 = "pulse_duration_ns_u48"      # 48-bit, 0-78 hours (spans two CRs)
 
     # Microsecond-based durations
     PULSE_DURATION_US_U8 = "pulse_duration_us_u8"        # 8-bit, 0-255 us
@@ -0,0 +1,48 @@
+"""
+Campaign helpers for running parameter sweeps against a register package.
+
+Built on the RegisterCodec/DeltaPlanner layer; pure Python + stdlib only.
+
+- sweep: Lazy, resumable sweep generators over DataTypeSpec ranges
+- schedule: Write-minimizing sweep ordering
+- search: Adaptive coarse-to-fine boundary search
+"""
+
+from .sweep import (
+    SweepAxis,
+    SweepPoint,
+    axes_from_package,
+    grid_size,
+    grid_sweep,
+    random_sweep,
+    latin_hypercube_sweep,
+    coarse_to_fine_sweep,
+    chunked,
+    encode_sweep,
+)
+from .schedule import SweepOrder, order_sweep, count_writes
+from .search import AdaptiveSearch, SearchResult, observer_outcome
+
+__all__ = [
+    # Sweep generators
+    'SweepAxis',
+    'SweepPoint',
+    'axes_from_package',
+    'grid_size',
+    'grid_sweep',
+    'random_sweep',
+    'latin_hypercube_sweep',
+    'coarse_to_fine_sweep',
+    'chunked',
+    'encode_sweep',
+
+    # Sweep ordering
+    'SweepOrder',
+    'order_sweep',
+    'count_writes',
+
+    # Adaptive search
+    'AdaptiveSearch',
+    'SearchResult',
+    'observer_outcome',
+]
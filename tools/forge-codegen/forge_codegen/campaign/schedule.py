@@ -0,0 +1,276 @@
+"""
+Write-minimizing ordering of parameter sweeps.
+
+When the order of a sweep only matters statistically, reordering it so that
+consecutive shots share as many Control Register words as possible reduces
+the number of CR writes (network round-trips) per shot.
+
+Cost model: the number of CRs whose word differs between consecutive shots
+(CR Hamming distance), i.e. exactly what DeltaPlanner would write. A
+spanning field's commit bit flips whenever the field changes, so its commit
+CR counts as written on every such step, even if only another segment's CR
+changed.
+
+Methods:
+- gray: Reflected mixed-radix (boustrophedon) order over per-field value
+  ranks, with fields sharing a CR kept adjacent. On a full grid every step
+  changes exactly one field. O(n log n).
+- nearest_neighbor: Greedy tour on CR Hamming distance. Neighbours at
+  distance 0 and 1 are found through hash buckets, so grid-like sweeps are
+  close to O(n * CRs); otherwise falls back to a linear scan.
+- auto: Run both and keep the cheaper order.
+
+Design References:
+- Delta planning: basic_serialized_datatypes/delta.py
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Literal, Mapping, Optional, Sequence, Tuple
+
+from forge_codegen.basic_serialized_datatypes import RegisterCodec
+from forge_codegen.basic_serialized_datatypes.codec import FieldCodec, TypedValue
+
+
+# Per-CR keys compared between shots (see _keyer)
+Words = Tuple[Hashable, ...]
+
+
+@dataclass
+class SweepOrder:
+    """
+    Result of reordering a sweep.
+
+    Attributes:
+        order: Indices into the original sweep, in execution order
+        param_sets: The reordered parameter sets
+        method: Ordering method that produced this order
+        writes_before: CR writes for the sweep in its original order
+        writes_after: CR writes for the sweep in the new order
+        reduction_percent: Percentage of writes avoided by reordering
+    """
+    order: List[int]
+    param_sets: List[Mapping[str, TypedValue]]
+    method: str
+    writes_before: int
+    writes_after: int
+    reduction_percent: float = field(init=False)
+
+    def __post_init__(self):
+        """Calculate derived fields."""
+        if self.writes_before:
+            self.reduction_percent = (1 - self.writes_after / self.writes_before) * 100
+        else:
+            self.reduction_percent = 0.0
+
+    def summary(self) -> str:
+        """One-line human-readable summary."""
+        return (
+            f"{self.method}: {self.writes_before} -> {self.writes_after} CR writes "
+            f"({self.reduction_percent:.1f}% fewer, {len(self.order)} shots)"
+        )
+
+
+def count_writes(codec: RegisterCodec,
+                 param_sets: Sequence[Mapping[str, TypedValue]],
+                 initial: Optional[Mapping[int, int]] = None) -> int:
+    """
+    Count the CR writes needed to run param_sets in the given order.
+
+    Args:
+        codec: RegisterCodec for the package mapping
+        param_sets: Full parameter sets, in execution order
+        initial: Known device CR words (None = first shot writes every CR)
+    """
+    key = _keyer(codec)
+    words = [key(codec.encode(values)) for values in param_sets]
+    return _tour_cost(words, range(len(words)), _start(codec, key, initial))
+
+
+def order_sweep(codec: RegisterCodec,
+                param_sets: Sequence[Mapping[str, TypedValue]],
+                method: Literal["gray", "nearest_neighbor", "auto"] = "auto",
+                initial: Optional[Mapping[int, int]] = None
+                ) -> SweepOrder:
+    """
+    Reorder a sweep to minimize total CR writes between consecutive shots.
+
+    Args:
+        codec: RegisterCodec for the package mapping
+        param_sets: Full parameter sets (every shot sets the same fields)
+        method: 'gray', 'nearest_neighbor' or 'auto' (best of both)
+        initial: Known device CR words (None = first shot writes every CR)
+
+    Returns:
+        SweepOrder with the new order and before/after write counts
+
+    Raises:
+        ValueError: If method is unknown
+    """
+    key = _keyer(codec)
+    words = [key(codec.encode(values)) for values in param_sets]
+    start = _start(codec, key, initial)
+    writes_before = _tour_cost(words, range(len(words)), start)
+
+    if method == "gray":
+        candidates = {"gray": _gray_order(codec, param_sets)}
+    elif method == "nearest_neighbor":
+        candidates = {"nearest_neighbor": _nearest_neighbor_order(words, start)}
+    elif method == "auto":
+        candidates = {
+            "gray": _gray_order(codec, param_sets),
+            "nearest_neighbor": _nearest_neighbor_order(words, start),
+        }
+    else:
+        raise ValueError(f"Unknown ordering method: {method}")
+
+    best_method, best_order, best_cost = None, None, None
+    for name, order in candidates.items():
+        cost = _tour_cost(words, order, start)
+        if best_cost is None or cost < best_cost:
+            best_method, best_order, best_cost = name, order, cost
+
+    # Never make things worse than the order we were given
+    if best_cost > writes_before:
+        best_method, best_order, best_cost = "original", list(range(len(words))), writes_before
+
+    return SweepOrder(
+        order=best_order,
+        param_sets=[param_sets[i] for i in best_order],
+        method=best_method,
+        writes_before=writes_before,
+        writes_after=best_cost,
+    )
+
+
+# ============================================================================
+# Internals
+# ============================================================================
+
+def _keyer(codec: RegisterCodec) -> Callable[[Mapping[int, int]], Words]:
+    """
+    Map CR words to per-CR keys that differ exactly when DeltaPlanner writes the CR.
+
+    Commit bits are masked out (their value depends on the shot history), and
+    a commit CR's key carries the raw value of every spanning field committed
+    in it: the commit bit flips, and the CR is written, whenever one changes.
+    """
+    committed: Dict[int, List[FieldCodec]] = {}
+    for spanning in codec.fields.values():
+        if spanning.commit is not None:
+            committed.setdefault(spanning.commit[0], []).append(spanning)
+    masks = {cr: ~sum(1 << f.commit[1] for f in fields) for cr, fields in committed.items()}
+
+    def key(words: Mapping[int, int]) -> Words:
+        return tuple(
+            (words[cr] & masks[cr], tuple(f.read(words) for f in committed[cr])) if cr in committed
+            else words[cr]
+            for cr in codec.cr_numbers
+        )
+
+    return key
+
+
+def _start(codec: RegisterCodec, key: Callable[[Mapping[int, int]], Words],
+           initial: Optional[Mapping[int, int]]) -> Optional[Words]:
+    if initial is None:
+        return None
+    return key(codec.encode({}, base=initial))
+
+
+def _distance(a: Optional[Words], b: Words) -> int:
+    if a is None:
+        return len(b)
+    return sum(1 for x, y in zip(a, b) if x != y)
+
+
+def _tour_cost(words: List[Words], order, start: Optional[Words]) -> int:
+    cost = 0
+    previous = start
+    for i in order:
+        cost += _distance(previous, words[i])
+        previous = words[i]
+    return cost
+
+
+def _gray_order(codec: RegisterCodec, param_sets: Sequence[Mapping[str, TypedValue]]) -> List[int]:
+    """Reflected mixed-radix order over per-field value ranks."""
+    if not param_sets:
+        return []
+
+    # Outer-to-inner digit order: keep fields of the same CR adjacent
+    names = sorted(
+        (name for name in param_sets[0] if name in codec.fields),
+        key=lambda n: (codec.fields[n].cr_number, -codec.fields[n].lsb, n),
+    )
+    ranks: Dict[str, Dict] = {}
+    for name in names:
+        distinct = sorted({values[name] for values in param_sets})
+        ranks[name] = {value: rank for rank, value in enumerate(distinct)}
+
+    def key(index: int) -> Tuple[int, ...]:
+        values = param_sets[index]
+        digits = []
+        prefix = 0
+        for name in names:
+            radix = len(ranks[name])
+            digit = ranks[name][values[name]]
+            effective = digit if prefix % 2 == 0 else radix - 1 - digit
+            digits.append(effective)
+            prefix = prefix * radix + effective
+        return tuple(digits)
+
+    return sorted(range(len(param_sets)), key=key)
+
+
+def _nearest_neighbor_order(words: List[Words], start: Optional[Words]) -> List[int]:
+    """Greedy nearest-neighbour tour on CR Hamming distance."""
+    n = len(words)
+    if n == 0:
+        return []
+    n_crs = len(words[0])
+
+    # Buckets for O(1) lookup of distance-0 and distance-1 neighbours
+    exact: Dict[Words, List[int]] = {}
+    near: Dict[Tuple[int, Words], List[int]] = {}
+    for i, w in enumerate(words):
+        exact.setdefault(w, []).append(i)
+        for k in range(n_crs):
+            near.setdefault((k, w[:k] + w[k + 1:]), []).append(i)
+
+    visited = [False] * n
+    remaining = n
+
+    def pop_unvisited(bucket: Optional[List[int]]) -> Optional[int]:
+        while bucket:
+            candidate = bucket.pop()
+            if not visited[candidate]:
+                return candidate
+        return None
+
+    order = []
+    current = start
+    while remaining:
+        nxt = None
+        if current is not None:
+            nxt = pop_unvisited(exact.get(current))
+            if nxt is None:
+                for k in range(n_crs):
+                    nxt = pop_unvisited(near.get((k, current[:k] + current[k + 1:])))
+                    if nxt is not None:
+                        break
+        if nxt is None:
+            # Linear scan for the closest unvisited shot
+            best = None
+            for i in range(n):
+                if not visited[i]:
+                    d = _distance(current, words[i])
+                    if best is None or d < best:
+                        best, nxt = d, i
+                        if d <= 1:
+                            break
+        visited[nxt] = True
+        remaining -= 1
+        order.append(nxt)
+        current = words[nxt]
+
+    return order
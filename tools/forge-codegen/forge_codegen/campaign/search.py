@@ -0,0 +1,225 @@
+"""
+Adaptive coarse-to-fine parameter search.
+
+Exhaustive grids over intensity x pulse duration x trigger delay cost too
+many shots on real hardware. The search below samples a coarse grid, then
+recursively subdivides only the boxes whose corner outcomes disagree
+(a quadtree in 2-D, an octree in 3-D, bisection in 1-D). Uniform regions
+are never refined, so boundaries between outcomes - e.g. where glitches
+start to succeed or the FSM starts reporting faults - are located with a
+small fraction of the shots of a grid at the same resolution.
+
+Outcomes are whatever the caller's evaluate() returns (any hashable value).
+For FSM observer readback, observer_outcome() classifies the dict returned
+by tools/decoder/hierarchical_decoder.decode_hierarchical_voltage().
+
+Caveat: regions smaller than one initial cell that touch no corner can be
+missed; raise initial_level if the outcome landscape has small islands.
+
+Design References:
+- Sweep axes: sweep.py
+- FSM decoder: tools/decoder/hierarchical_decoder.py
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Callable, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from forge_codegen.basic_serialized_datatypes.codec import TypedValue
+from .sweep import SweepAxis
+
+
+Coords = Tuple[int, ...]
+Box = Tuple[Tuple[int, int], ...]  # (lo, hi) per axis
+
+
+def observer_outcome(decoded: Mapping, include_state: bool = False) -> Hashable:
+    """
+    Classify one FSM observer readback.
+
+    Args:
+        decoded: Dict from decode_hierarchical_voltage() (needs 'fault',
+                 and 'state' if include_state)
+        include_state: Also distinguish final FSM state, not just fault
+
+    Returns:
+        'fault' / 'ok', or (state, fault) if include_state
+    """
+    if include_state:
+        return (decoded['state'], bool(decoded['fault']))
+    return 'fault' if decoded['fault'] else 'ok'
+
+
+@dataclass
+class SearchResult:
+    """
+    Outcome of an adaptive search.
+
+    Attributes:
+        axes: Searched axes
+        samples: Sampled coordinates -> outcome (one shot each)
+        boundary: Finest boxes whose corners still disagree
+        shots: Number of evaluate() calls
+        grid_shots: Shots a full grid at the same resolution would need
+        budget_exhausted: True if max_shots stopped refinement early
+    """
+    axes: List[SweepAxis]
+    samples: Dict[Coords, Hashable]
+    boundary: List[Box]
+    shots: int
+    grid_shots: int
+    budget_exhausted: bool = False
+    outcomes: Dict[Hashable, int] = field(init=False)
+
+    def __post_init__(self):
+        """Calculate derived fields."""
+        self.outcomes = {}
+        for outcome in self.samples.values():
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    @property
+    def reduction_factor(self) -> float:
+        """How many times fewer shots than the equivalent grid."""
+        return self.grid_shots / self.shots if self.shots else 0.0
+
+    def points(self, outcome: Optional[Hashable] = None) -> List[Dict[str, TypedValue]]:
+        """Sampled parameter sets, optionally filtered by outcome."""
+        return [
+            _values(self.axes, coords)
+            for coords, result in self.samples.items()
+            if outcome is None or result == outcome
+        ]
+
+    def boundary_regions(self) -> List[Dict[str, Tuple[TypedValue, TypedValue]]]:
+        """Boundary boxes as field name -> (low, high) value ranges."""
+        return [
+            {axis.name: (axis.typed(lo), axis.typed(hi)) for axis, (lo, hi) in zip(self.axes, box)}
+            for box in self.boundary
+        ]
+
+    def summary(self) -> str:
+        """One-line human-readable summary."""
+        counts = ", ".join(f"{k}={v}" for k, v in self.outcomes.items())
+        return (
+            f"{self.shots} shots vs {self.grid_shots} grid shots "
+            f"({self.reduction_factor:.1f}x fewer); {len(self.boundary)} boundary boxes; {counts}"
+        )
+
+
+class AdaptiveSearch:
+    """
+    Boundary-refining search over typed parameters.
+
+    Example:
+        >>> from hierarchical_decoder import decode_hierarchical_voltage
+        >>> def shot(values):
+        ...     for cr, word in planner.update(values).items():
+        ...         cc.set_control(cr, word)
+        ...     return observer_outcome(decode_hierarchical_voltage(read_output_d()))
+        >>> axes = axes_from_package(package, names=['intensity_voltage', 'trig_out_duration'])
+        >>> result = AdaptiveSearch(axes, shot, resolution={'intensity_voltage': 10}).run()
+        >>> print(result.summary())
+    """
+
+    def __init__(self,
+                 axes: Sequence[SweepAxis],
+                 evaluate: Callable[[Dict[str, TypedValue]], Hashable],
+                 resolution: Union[int, Dict[str, int]] = 1,
+                 initial_level: int = 2,
+                 max_shots: Optional[int] = None,
+                 fixed: Optional[Mapping[str, TypedValue]] = None):
+        """
+        Args:
+            axes: Swept fields (SweepAxis.steps is ignored)
+            evaluate: Runs one shot and returns its outcome (hashable)
+            resolution: Smallest box edge per axis, in field units
+                        (int for all, or name -> int; default 1)
+            initial_level: Initial grid has 2**initial_level cells per axis
+            max_shots: Stop refining once this many shots were taken
+            fixed: Values for fields that are not searched
+        """
+        if not axes:
+            raise ValueError("At least one axis is required")
+        self.axes = list(axes)
+        self.evaluate = evaluate
+        self.resolution = [
+            max(1, resolution.get(a.name, 1) if isinstance(resolution, dict) else resolution)
+            for a in self.axes
+        ]
+        self.initial_level = initial_level
+        self.max_shots = max_shots
+        self.fixed = dict(fixed or {})
+        self.samples: Dict[Coords, Hashable] = {}
+
+    def _sample(self, coords: Coords) -> Hashable:
+        if coords not in self.samples:
+            values = dict(self.fixed)
+            values.update(_values(self.axes, coords))
+            self.samples[coords] = self.evaluate(values)
+        return self.samples[coords]
+
+    def _budget_left(self, needed: int = 0) -> bool:
+        return self.max_shots is None or len(self.samples) + needed <= self.max_shots
+
+    def _split(self, box: Box) -> List[Box]:
+        halves = []
+        for (lo, hi), res in zip(box, self.resolution):
+            if hi - lo > res:
+                mid = (lo + hi) // 2
+                halves.append(((lo, mid), (mid, hi)))
+            else:
+                halves.append(((lo, hi),))
+        if all(len(h) == 1 for h in halves):
+            return []
+        return [tuple(child) for child in product(*halves)]
+
+    def run(self) -> SearchResult:
+        """Run the search (re-running reuses already sampled shots)."""
+        cells = 1 << self.initial_level
+        breakpoints = [_breakpoints(axis, cells) for axis in self.axes]
+        intervals = [list(zip(edges[:-1], edges[1:])) or [(edges[0], edges[0])] for edges in breakpoints]
+        queue = deque(product(*intervals))
+
+        boundary: List[Box] = []
+        exhausted = False
+        while queue:
+            box = queue.popleft()
+            corners = list(product(*(sorted({lo, hi}) for lo, hi in box)))
+            unsampled = sum(1 for c in corners if c not in self.samples)
+            if not self._budget_left(unsampled):
+                exhausted = True
+                continue
+
+            outcomes = {self._sample(c) for c in corners}
+            if len(outcomes) < 2:
+                continue
+
+            children = self._split(box)
+            if children:
+                queue.extend(children)
+            else:
+                boundary.append(box)
+
+        grid_shots = 1
+        for axis, res in zip(self.axes, self.resolution):
+            grid_shots *= axis.span // res + 1
+
+        return SearchResult(
+            axes=self.axes,
+            samples=dict(self.samples),
+            boundary=boundary,
+            shots=len(self.samples),
+            grid_shots=grid_shots,
+            budget_exhausted=exhausted,
+        )
+
+
+def _breakpoints(axis: SweepAxis, cells: int) -> List[int]:
+    """Sorted distinct integer cell edges along an axis."""
+    span = axis.span
+    return sorted({axis.min_value + (2 * i * span + cells) // (2 * cells) for i in range(cells + 1)})
+
+
+def _values(axes: Sequence[SweepAxis], coords: Coords) -> Dict[str, TypedValue]:
+    return {axis.name: axis.typed(c) for axis, c in zip(axes, coords)}
@@ -0,0 +1,358 @@
+"""
+Lazy parameter-space sweep generators over DataTypeSpec ranges.
+
+Every generator yields SweepPoint objects one at a time, computed directly
+from the point index - nothing proportional to the size of the parameter
+space is ever materialized, so grids with billions of combinations are fine.
+
+Determinism and resume:
+- Point i depends only on (axes, seed, i), never on earlier points
+- Every generator accepts `start`; to resume a run, pass the index of the
+  last completed point + 1
+
+Generators:
+- grid_sweep: Full Cartesian grid (mixed-radix index decode)
+- random_sweep: Uniform random points (counter-based SplitMix64 hash)
+- latin_hypercube_sweep: One point per stratum per axis (keyed Feistel
+  stratum permutations + jittered position within the stratum)
+- coarse_to_fine_sweep: Nested grids, each level halving the spacing and
+  yielding only points not visited at coarser levels
+
+Use encode_sweep() to turn points into CR words (optionally chunked), in
+write order (RegisterCodec.encode_sequence()).
+
+Design References:
+- Codec: basic_serialized_datatypes/codec.py
+"""
+
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from forge_codegen.basic_serialized_datatypes import BasicAppDataTypes, RegisterCodec, TYPE_REGISTRY
+from forge_codegen.basic_serialized_datatypes.codec import TypedValue
+
+
+_MASK64 = (1 << 64) - 1
+
+
+@dataclass(frozen=True)
+class SweepAxis:
+    """
+    One swept field and its range.
+
+    Attributes:
+        name: Field name (matches DataTypeSpec.name)
+        min_value: Lower bound (inclusive, in field units)
+        max_value: Upper bound (inclusive, in field units)
+        steps: Grid points along this axis (grid_sweep only)
+        is_boolean: Yield bool values instead of ints
+    """
+    name: str
+    min_value: int
+    max_value: int
+    steps: int = 2
+    is_boolean: bool = False
+
+    def __post_init__(self):
+        if self.min_value > self.max_value:
+            raise ValueError(
+                f"Axis '{self.name}': min_value ({self.min_value}) > max_value ({self.max_value})"
+            )
+        if self.steps < 1:
+            raise ValueError(f"Axis '{self.name}': steps must be >= 1, got {self.steps}")
+
+    @classmethod
+    def from_spec(cls, spec: Any, steps: Optional[int] = None) -> 'SweepAxis':
+        """
+        Build an axis from a DataTypeSpec.
+
+        Uses the spec's min_value/max_value UI bounds, falling back to the
+        TYPE_REGISTRY limits of its datatype.
+
+        Args:
+            spec: DataTypeSpec (anything with name/datatype/min_value/max_value)
+            steps: Grid points (defaults to 2 = the two bounds)
+        """
+        if spec.datatype == BasicAppDataTypes.BOOLEAN:
+            return cls(name=spec.name, min_value=0, max_value=1, steps=steps or 2, is_boolean=True)
+
+        metadata = TYPE_REGISTRY[spec.datatype]
+        low = spec.min_value if spec.min_value is not None else metadata.min_value
+        high = spec.max_value if spec.max_value is not None else metadata.max_value
+        # Integer bounds that stay inside float UI bounds
+        return cls(name=spec.name, min_value=-int(-low // 1), max_value=int(high // 1), steps=steps or 2)
+
+    @property
+    def span(self) -> int:
+        return self.max_value - self.min_value
+
+    def at_index(self, i: int, n: int) -> TypedValue:
+        """Value of the i-th of n evenly spaced points (rounded to the nearest integer)."""
+        if n <= 1:
+            return self.typed(self.min_value)
+        return self.typed(self.min_value + (2 * i * self.span + (n - 1)) // (2 * (n - 1)))
+
+    def at_fraction(self, u: float) -> TypedValue:
+        """Value at fraction u in [0, 1) of the range (inclusive of both bounds)."""
+        return self.typed(self.min_value + min(int(u * (self.span + 1)), self.span))
+
+    def typed(self, value: int) -> TypedValue:
+        """Convert an integer position on this axis to the field's typed value."""
+        return bool(value) if self.is_boolean else value
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    """
+    One point of a sweep.
+
+    Attributes:
+        index: Position in the sweep (pass index + 1 as `start` to resume)
+        values: Field name -> typed value
+    """
+    index: int
+    values: Dict[str, TypedValue]
+
+
+def axes_from_package(package: Any,
+                      steps: Union[int, Dict[str, int]] = 2,
+                      names: Optional[Sequence[str]] = None) -> List[SweepAxis]:
+    """
+    Build sweep axes from a BasicAppsRegPackage's DataTypeSpecs.
+
+    Args:
+        package: BasicAppsRegPackage
+        steps: Grid points per axis (int for all, or name -> steps)
+        names: Fields to sweep (default: all datatypes, in spec order)
+    """
+    specs = {dt.name: dt for dt in package.datatypes}
+    if names is None:
+        names = list(specs)
+
+    axes = []
+    for name in names:
+        if name not in specs:
+            raise KeyError(f"Unknown datatype: '{name}'")
+        n = steps.get(name, 2) if isinstance(steps, dict) else steps
+        axes.append(SweepAxis.from_spec(specs[name], steps=n))
+    return axes
+
+
+# ============================================================================
+# Generators
+# ============================================================================
+
+def grid_size(axes: Sequence[SweepAxis]) -> int:
+    """Total number of points in the full grid."""
+    total = 1
+    for axis in axes:
+        total *= axis.steps
+    return total
+
+
+def grid_sweep(axes: Sequence[SweepAxis], start: int = 0) -> Iterator[SweepPoint]:
+    """
+    Full Cartesian grid; the last axis varies fastest.
+
+    Args:
+        axes: Swept fields (SweepAxis.steps points each)
+        start: Index of the first point to yield
+    """
+    _check_start(start)
+    total = grid_size(axes)
+    for index in range(start, total):
+        values = {}
+        rest = index
+        for axis in reversed(axes):
+            rest, digit = divmod(rest, axis.steps)
+            values[axis.name] = axis.at_index(digit, axis.steps)
+        yield SweepPoint(index, {axis.name: values[axis.name] for axis in axes})
+
+
+def random_sweep(axes: Sequence[SweepAxis],
+                 count: Optional[int] = None,
+                 seed: int = 0,
+                 start: int = 0) -> Iterator[SweepPoint]:
+    """
+    Uniform random points, reproducible from (seed, index).
+
+    Args:
+        axes: Swept fields
+        count: Number of points (None = endless)
+        seed: Random seed
+        start: Index of the first point to yield
+    """
+    _check_start(start)
+    index = start
+    while count is None or index < count:
+        yield SweepPoint(index, {
+            axis.name: axis.at_fraction(_uniform(seed, index, k))
+            for k, axis in enumerate(axes)
+        })
+        index += 1
+
+
+def latin_hypercube_sweep(axes: Sequence[SweepAxis],
+                          count: int,
+                          seed: int = 0,
+                          start: int = 0) -> Iterator[SweepPoint]:
+    """
+    Latin hypercube sample: each axis is cut into `count` strata and every
+    stratum is hit exactly once per axis.
+
+    Strata are assigned through an independent keyed permutation per axis
+    (a Feistel network over range(count), see _permute()), computed per
+    index, so no permutation table is stored and resume stays O(1).
+
+    Args:
+        axes: Swept fields
+        count: Number of points (= strata per axis)
+        seed: Random seed
+        start: Index of the first point to yield
+    """
+    if count < 1:
+        raise ValueError(f"count must be >= 1, got {count}")
+    _check_start(start)
+
+    for index in range(start, count):
+        values = {}
+        for k, axis in enumerate(axes):
+            stratum = _permute(index, count, seed, k)
+            u = (stratum + _uniform(seed, index, k)) / count
+            values[axis.name] = axis.at_fraction(u)
+        yield SweepPoint(index, values)
+
+
+def coarse_to_fine_sweep(axes: Sequence[SweepAxis],
+                         levels: int,
+                         start: int = 0) -> Iterator[SweepPoint]:
+    """
+    Nested grids from coarse to fine.
+
+    Level L is a grid of 2**L + 1 points per axis; each level yields only
+    the points that were not already part of a coarser level, so stopping
+    early still gives the best coverage for the shots spent. Grid positions
+    that round to the same value (axes narrower than the grid, e.g.
+    booleans) are yielded once.
+
+    Args:
+        axes: Swept fields
+        levels: Finest level (inclusive)
+        start: Index of the first point to yield
+    """
+    _check_start(start)
+    index = 0
+    coarser: List[set] = [set() for _ in axes]  # per-axis values of the previous level
+    for level in range(levels + 1):
+        n = (1 << level) + 1
+        # Distinct values per axis; coarser levels are subsets (at_index(2i, 2n - 1) == at_index(i, n))
+        columns = [list(dict.fromkeys(axis.at_index(d, n) for d in range(n))) for axis in axes]
+        total = new_points = 1
+        for column, seen in zip(columns, coarser):
+            total *= len(column)
+            new_points *= len(seen)
+        new_points = total - new_points if level else total
+        if index + new_points <= start:
+            index += new_points
+            coarser = [set(column) for column in columns]
+            continue
+
+        for flat in range(total):
+            values = []
+            rest = flat
+            for column in reversed(columns):
+                rest, digit = divmod(rest, len(column))
+                values.append(column[digit])
+            values.reverse()
+
+            # Points whose every value was on the previous grid were visited there
+            if level and all(value in seen for value, seen in zip(values, coarser)):
+                continue
+
+            if index >= start:
+                yield SweepPoint(index, {axis.name: value for axis, value in zip(axes, values)})
+            index += 1
+        coarser = [set(column) for column in columns]
+
+
+# ============================================================================
+# Encoding
+# ============================================================================
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield lists of up to `size` consecutive items."""
+    if size < 1:
+        raise ValueError(f"Chunk size must be >= 1, got {size}")
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def encode_sweep(codec: RegisterCodec,
+                 points: Iterable[SweepPoint],
+                 chunk_size: Optional[int] = None,
+                 base: Optional[Dict[int, int]] = None
+                 ) -> Iterator[Union[Dict[int, int], List[Dict[int, int]]]]:
+    """
+    Lazily encode sweep points into CR words.
+
+    Args:
+        codec: RegisterCodec for the package mapping
+        points: Any sweep generator
+        chunk_size: If given, yield lists of this many encoded points
+                    instead of single dicts
+        base: CR words for fields that are not swept
+
+    Points are encoded in sweep order (RegisterCodec.encode_sequence), so
+    spanning fields get a commit edge whenever they change, across chunks
+    too.
+    """
+    words = codec.encode_sequence((point.values for point in points), base=base)
+    if chunk_size is None:
+        yield from words
+        return
+
+    yield from chunked(words, chunk_size)
+
+
+# ============================================================================
+# Counter-based randomness (SplitMix64)
+# ============================================================================
+
+def _hash(seed: int, index: int, axis: int) -> int:
+    x = (seed * 0x9E3779B97F4A7C15 + index * 0xBF58476D1CE4E5B9 + axis * 0x94D049BB133111EB) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _permute(index: int, count: int, seed: int, axis: int) -> int:
+    """
+    Keyed bijection of range(count) for (seed, axis): a 4-round balanced
+    Feistel network over the next even power of two, cycle-walked back
+    into range (under 4 rounds of walking on average).
+    """
+    half = max(1, ((count - 1).bit_length() + 1) // 2)
+    mask = (1 << half) - 1
+    value = index
+    while True:
+        left, right = value >> half, value & mask
+        for round_ in range(4):
+            left, right = right, left ^ (_hash(seed, right, -1 - 4 * axis - round_) & mask)
+        value = (left << half) | right
+        if value < count:
+            return value
+
+
+def _check_start(start: int) -> None:
+    if start < 0:
+        raise ValueError(f"start must be >= 0, got {start}")
+
+
+def _uniform(seed: int, index: int, axis: int) -> float:
+    """Uniform float in [0, 1) for (seed, index, axis)."""
+    return (_hash(seed, index, axis) >> 11) * (1.0 / (1 << 53))
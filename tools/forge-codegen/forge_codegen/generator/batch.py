@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Batch code generation over every app spec in a (mono)repo.
+
+Discovers app YAML specs under a root directory, builds a dependency graph
+(spec -> templates -> frozen VHDL type packages the templates `use`), and
+regenerates only the apps whose build manifest is stale, in parallel worker
+processes. A per-app timing and cache report is printed and written to
+<output-dir>/batch_summary.json.
+
+Usage:
+    python -m forge_codegen.generator.batch <root> --output-dir generated/
+
+Example:
+    python -m forge_codegen.generator.batch . --output-dir generated/ --jobs 4
+    python -m forge_codegen.generator.batch . --dry-run     # graph and staleness only
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from forge_codegen.basic_serialized_datatypes import MappingCache
+from forge_codegen.generator.codegen import (
+    create_jinja_env,
+    generate_vhdl,
+    input_hashes,
+    is_up_to_date,
+    template_cache_dir,
+    write_if_changed,
+)
+
+DEFAULT_TEMPLATE_DIR = Path(__file__).parent.parent / 'templates'
+BATCH_SUMMARY_NAME = 'batch_summary.json'
+
+# Directories never searched for specs or type packages
+SKIP_DIRS = {'node_modules', '__pycache__', 'site-packages'}
+
+_APP_NAME_RE = re.compile(r'^app_name\s*:', re.MULTILINE)
+_DATATYPES_RE = re.compile(r'^datatypes\s*:', re.MULTILINE)
+_USE_RE = re.compile(r'^\s*use\s+work\.(\w+)\.all\s*;', re.IGNORECASE | re.MULTILINE)
+_PACKAGE_RE = re.compile(r'^\s*package\s+(?!body\b)(\w+)\s+is\b', re.IGNORECASE | re.MULTILINE)
+
+
+@dataclass
+class BatchApp:
+    """One app spec and everything its generated outputs depend on."""
+    key: str                    # Output subdirectory name (unique per batch)
+    spec: Path
+    output_dir: Path
+    templates: List[Path] = field(default_factory=list)
+    type_packages: List[Path] = field(default_factory=list)
+
+    @property
+    def dependencies(self) -> List[Path]:
+        """Files beyond the spec and templates that make outputs stale (type packages)."""
+        return self.type_packages
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one app in a batch run."""
+    key: str
+    spec: str
+    status: str                 # 'generated', 'up to date' or 'failed'
+    seconds: float = 0.0
+    mapping_cache: str = '-'    # 'hit', 'miss', 'off' or '-' (not generated)
+    templates_compiled: Optional[int] = None  # Compiled rather than cached (None: cache off)
+    error: Optional[str] = None
+    log: str = ''
+
+
+def _walk(root: Path, suffixes: Sequence[str], exclude: Iterable[Path] = ()) -> Iterator[Path]:
+    """Files under root with one of suffixes, skipping hidden/vendored dirs and exclude."""
+    excluded = {Path(p).resolve() for p in exclude}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            d for d in dirnames
+            if not d.startswith('.') and d not in SKIP_DIRS
+            and (Path(dirpath) / d).resolve() not in excluded
+        )
+        for name in sorted(filenames):
+            if name.endswith(tuple(suffixes)):
+                yield Path(dirpath) / name
+
+
+def discover_specs(root: Path, exclude: Iterable[Path] = ()) -> List[Path]:
+    """
+    App spec YAML files under root: those with top-level app_name and
+    datatypes keys (deployment configs and other YAML are ignored).
+
+    Specs are recognised textually, so a spec with a YAML error is still
+    picked up and reported as failed rather than silently skipped.
+    """
+    specs = []
+    for path in _walk(root, ('.yaml', '.yml'), exclude):
+        try:
+            text = path.read_text()
+        except (OSError, UnicodeDecodeError):
+            continue
+        if _APP_NAME_RE.search(text) and _DATATYPES_RE.search(text):
+            specs.append(path)
+    return specs
+
+
+def find_type_packages(dirs: Iterable[Path], exclude: Iterable[Path] = ()) -> Dict[str, List[Path]]:
+    """VHDL package name (lower case) -> files declaring it, under dirs."""
+    packages: Dict[str, List[Path]] = {}
+    for directory in dirs:
+        for path in _walk(directory, ('.vhd', '.vhdl'), exclude):
+            try:
+                text = path.read_text(errors='replace')
+            except OSError:
+                continue
+            for name in _PACKAGE_RE.findall(text):
+                packages.setdefault(name.lower(), []).append(path)
+    return packages
+
+
+def used_packages(path: Path) -> List[str]:
+    """Names (lower case) of the `use work.<pkg>.all` packages in a template/VHDL file."""
+    return sorted({name.lower() for name in _USE_RE.findall(path.read_text(errors='replace'))})
+
+
+def resolve_type_packages(
+    templates: Iterable[Path],
+    packages: Dict[str, List[Path]]
+) -> Tuple[List[Path], List[str]]:
+    """
+    Type package files the templates depend on, following `use work.*`
+    clauses inside the packages transitively.
+
+    Returns:
+        (sorted package files, sorted names of packages not found)
+    """
+    pending = [name for template in templates for name in used_packages(template)]
+    seen, files, missing = set(), set(), set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        if name not in packages:
+            missing.add(name)
+            continue
+        for path in packages[name]:
+            files.add(path)
+            pending.extend(used_packages(path))
+    return sorted(files), sorted(missing)
+
+
+def _app_name(spec: Path) -> str:
+    import yaml
+
+    try:
+        data = yaml.safe_load(spec.read_text())
+    except (OSError, yaml.YAMLError):
+        data = None
+    if isinstance(data, dict) and data.get('app_name'):
+        return str(data['app_name'])
+    return spec.stem
+
+
+def build_dependency_graph(
+    specs: Sequence[Path],
+    output_dir: Path,
+    template_dir: Path,
+    type_package_dirs: Sequence[Path] = (),
+) -> Dict[str, BatchApp]:
+    """
+    Dependency graph for a batch: app key -> BatchApp (spec, templates,
+    type packages).
+
+    Every app renders every template, so all apps share the template and
+    type package nodes; only the spec differs. Apps are keyed by app_name;
+    specs sharing an app_name are keyed <app_name>-<spec stem> instead.
+    """
+    templates = sorted(template_dir.glob('*.j2'))
+    packages = find_type_packages(type_package_dirs, exclude=[output_dir])
+    type_packages, missing = resolve_type_packages(templates, packages)
+    for name in missing:
+        print(f"Warning: type package {name} not found under {', '.join(map(str, type_package_dirs)) or '-'}",
+              file=sys.stderr)
+
+    names = {spec: _app_name(spec) for spec in specs}
+    graph: Dict[str, BatchApp] = {}
+    for spec in specs:
+        name = names[spec]
+        key = name if list(names.values()).count(name) == 1 else f"{name}-{spec.stem}"
+        if key in graph:
+            raise ValueError(f"Specs {graph[key].spec} and {spec} both map to output {key}/")
+        graph[key] = BatchApp(key=key, spec=spec, output_dir=output_dir / key,
+                              templates=templates, type_packages=type_packages)
+    return graph
+
+
+def is_stale(app: BatchApp, template_dir: Path) -> bool:
+    """True if the app's build manifest does not match its current inputs."""
+    inputs = input_hashes(app.spec, template_dir, dependencies=app.dependencies)
+    return not is_up_to_date(app.output_dir, inputs)
+
+
+def generate_app(app: BatchApp, template_dir: Path, cache_dir: Optional[Path]) -> BatchResult:
+    """Generate one app (worker entry point); output is captured, never raised."""
+    cache = MappingCache(cache_dir) if cache_dir is not None else None
+    bytecode_cache = create_jinja_env(template_dir, template_cache_dir(cache)).bytecode_cache
+    misses = bytecode_cache.misses if bytecode_cache is not None else 0
+    log = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log):
+            generate_vhdl(app.spec, app.output_dir, template_dir, cache=cache, force=True,
+                          dependencies=app.dependencies)
+    except Exception as e:
+        traceback.print_exc(file=log)
+        return BatchResult(app.key, str(app.spec), 'failed', time.perf_counter() - start,
+                           error=f"{type(e).__name__}: {e}", log=log.getvalue())
+    seconds = time.perf_counter() - start
+
+    if cache is None:
+        mapping = 'off'
+    else:
+        mapping = 'hit' if cache.hits and not cache.misses else 'miss'
+    compiled = bytecode_cache.misses - misses if bytecode_cache is not None else None
+    return BatchResult(app.key, str(app.spec), 'generated', seconds, mapping, compiled, log=log.getvalue())
+
+
+def generate_batch(
+    graph: Dict[str, BatchApp],
+    output_dir: Path,
+    template_dir: Path = DEFAULT_TEMPLATE_DIR,
+    cache: Optional[MappingCache] = None,
+    force: bool = False,
+    jobs: Optional[int] = None,
+) -> Dict[str, BatchResult]:
+    """
+    Regenerate the stale apps of a dependency graph (see
+    build_dependency_graph()) in up to `jobs` worker processes.
+
+    A failing app does not stop the others; its error is in its result.
+    The per-app report is printed and written to output_dir/batch_summary.json.
+
+    Returns:
+        App key -> BatchResult
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    start = time.perf_counter()
+    results: Dict[str, BatchResult] = {}
+    stale = []
+    for key, app in graph.items():
+        check = time.perf_counter()
+        if force or is_stale(app, template_dir):
+            stale.append(app)
+        else:
+            results[key] = BatchResult(key, str(app.spec), 'up to date', time.perf_counter() - check)
+
+    cache_dir = cache.directory if cache is not None else None
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(stale) or 1))
+    if jobs == 1:
+        for app in stale:
+            results[app.key] = generate_app(app, template_dir, cache_dir)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {app.key: pool.submit(generate_app, app, template_dir, cache_dir) for app in stale}
+            for key, future in futures.items():
+                results[key] = future.result()
+    results = {key: results[key] for key in graph}
+    wall = time.perf_counter() - start
+
+    print(f"{'App':<32} {'Status':<11} {'Time':>9}  {'Mapping':<8} {'Compiled':>8}")
+    for result in results.values():
+        compiled = '-' if result.templates_compiled is None else str(result.templates_compiled)
+        print(f"{result.key:<32} {result.status:<11} {result.seconds * 1000:>7.1f}ms  "
+              f"{result.mapping_cache:<8} {compiled:>8}")
+    counts = {status: sum(r.status == status for r in results.values())
+              for status in ('generated', 'up to date', 'failed')}
+    print(f"\n{len(results)} apps: {counts['generated']} generated, {counts['up to date']} up to date, "
+          f"{counts['failed']} failed in {wall:.2f}s ({jobs} job{'s' if jobs > 1 else ''})")
+    for result in results.values():
+        if result.error:
+            print(f"\n❌ {result.key} ({result.spec}): {result.error}", file=sys.stderr)
+
+    summary = {
+        'wall_seconds': round(wall, 4),
+        'jobs': jobs,
+        'apps': {key: {**{k: v for k, v in asdict(r).items() if k != 'log'}, 'seconds': round(r.seconds, 4)}
+                 for key, r in results.items()},
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    write_if_changed(output_dir / BATCH_SUMMARY_NAME, json.dumps(summary, indent=2, sort_keys=True) + "\n")
+    return results
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Regenerate every stale app spec under a directory'
+    )
+    parser.add_argument(
+        'root',
+        type=Path,
+        help='Directory searched for app YAML specs (recursively)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        type=Path,
+        default=Path('generated'),
+        help='Output root; each app goes in <output-dir>/<app_name>/ (default: generated/)'
+    )
+    parser.add_argument(
+        '--template-dir',
+        type=Path,
+        default=DEFAULT_TEMPLATE_DIR,
+        help='Template directory (default: the forge_codegen templates)'
+    )
+    parser.add_argument(
+        '--type-package-dir',
+        type=Path,
+        action='append',
+        default=None,
+        help='Directory searched for the frozen VHDL type packages (repeatable; default: <root>)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=None,
+        help='Mapping cache directory (default: $FORGE_CODEGEN_CACHE_DIR or ~/.cache/forge-codegen/mappings)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the mapping and compiled-template caches'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Regenerate every app, stale or not'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        help='Worker processes (default: one per CPU)'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Print the dependency graph and which apps are stale, without generating'
+    )
+
+    args = parser.parse_args()
+
+    if not args.root.is_dir():
+        print(f"Error: not a directory: {args.root}", file=sys.stderr)
+        sys.exit(1)
+
+    specs = discover_specs(args.root, exclude=[args.output_dir])
+    graph = build_dependency_graph(specs, args.output_dir, args.template_dir,
+                                   args.type_package_dir or [args.root])
+    if args.dry_run:
+        for key, app in graph.items():
+            state = 'stale' if args.force or is_stale(app, args.template_dir) else 'up to date'
+            print(f"{key} ({state})\n  spec: {app.spec}")
+            print("  templates: " + ", ".join(p.name for p in app.templates))
+            print("  type packages: " + (", ".join(map(str, app.type_packages)) or '-'))
+        return
+
+    cache = None if args.no_cache else MappingCache(args.cache_dir)
+    results = generate_batch(graph, args.output_dir, args.template_dir, cache=cache,
+                             force=args.force, jobs=args.jobs)
+    if any(result.status == 'failed' for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,13 +20,18 @@ Example:
 Version: 2.0 (BasicAppDataTypes only, no legacy v1.0 support)
 """
 
+from __future__ import annotations
+
 import sys
+import os
+import json
+import hashlib
+import keyword
 import argparse
+import dataclasses
+import re
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Any
-import yaml
-from jinja2 import Template, Environment, FileSystemLoader
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple, Union
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -36,8 +41,20 @@ from forge_codegen.basic_serialized_datatypes import (
     BasicAppDataTypes,
     TYPE_REGISTRY,
     RegisterMapper,
+    RegisterMapping,
+    MappingReport,
+    MappingCache,
+    RegisterCodec,
+    GEOMETRY_PROFILES,
+    MAPPER_VERSION,
+    get_geometry,
 )
-from forge_codegen.models.package import BasicAppsRegPackage, DataTypeSpec
+
+# yaml, jinja2 and the pydantic models are imported where they are first
+# needed, so --help and up-to-date runs (see is_up_to_date()) skip them
+if TYPE_CHECKING:
+    from jinja2 import Environment
+    from forge_codegen.models.package import BasicAppsRegPackage
 
 # Platform specifications
 PLATFORM_MAP = {
@@ -45,27 +62,33 @@ PLATFORM_MAP = {
         'name': 'Moku:Go',
         'clock_mhz': 125,
         'slots': 2,
+        'register_geometry': 'basic_app',
     },
     'moku_lab': {
         'name': 'Moku:Lab',
         'clock_mhz': 500,
         'slots': 2,
+        'register_geometry': 'basic_app',
     },
     'moku_pro': {
         'name': 'Moku:Pro',
         'clock_mhz': 1250,
         'slots': 4,
+        'register_geometry': 'basic_app',
     },
     'moku_delta': {
         'name': 'Moku:Delta',
         'clock_mhz': 5000,
         'slots': 3,
+        'register_geometry': 'basic_app',
     },
 }
 
 
 def load_yaml_spec(yaml_path: Path) -> Dict[str, Any]:
     """Load and parse YAML specification file."""
+    import yaml
+
     with open(yaml_path, 'r') as f:
         spec = yaml.safe_load(f)
 
@@ -89,6 +112,7 @@ def load_yaml_spec(yaml_path: Path) -> Dict[str, Any]:
 
 def create_register_package(spec: Dict[str, Any]) -> BasicAppsRegPackage:
     """Create BasicAppsRegPackage from YAML specification."""
+    from forge_codegen.models.package import BasicAppsRegPackage, DataTypeSpec
 
     # Convert datatypes to DataTypeSpec objects
     datatype_specs = []
@@ -112,6 +136,9 @@ def create_register_package(spec: Dict[str, Any]) -> BasicAppsRegPackage:
             max_value=dt_dict.get('max_value', metadata.max_value),
             display_name=dt_dict.get('display_name', dt_dict['name']),
             units=dt_dict.get('units', metadata.unit),
+            update_rate=dt_dict.get('update_rate'),
+            control_register=dt_dict.get('control_register'),
+            bit_range=dt_dict.get('bit_range'),
         )
         datatype_specs.append(datatype_spec)
 
@@ -121,23 +148,58 @@ def create_register_package(spec: Dict[str, Any]) -> BasicAppsRegPackage:
         description=spec.get('description', ''),
         datatypes=datatype_specs,
         mapping_strategy=spec['mapping_strategy'],
+        register_geometry=spec.get(
+            'register_geometry',
+            PLATFORM_MAP.get(spec['platform'], {}).get('register_geometry', 'basic_app')
+        ),
         platform=spec['platform'],
     )
 
     return package
 
 
+def _bit_string(value: int, bit_width: int) -> str:
+    """VHDL bit-string literal for value (hex when the width allows it)."""
+    value &= (1 << bit_width) - 1
+    if bit_width % 4 == 0:
+        return f'x"{value:0{bit_width // 4}X}"'
+    return f'"{value:0{bit_width}b}"'
+
+
+def load_lock_file(lock_path: Path) -> Optional[List[RegisterMapping]]:
+    """Load a previous mapping (MappingReport.to_json format), or None if absent."""
+    if not lock_path.exists():
+        return None
+    with open(lock_path, 'r') as f:
+        return MappingReport.from_json(json.load(f)).mappings
+
+
 def prepare_template_context(
     package: BasicAppsRegPackage,
     yaml_path: Path,
-    platform_info: Dict[str, Any]
+    platform_info: Dict[str, Any],
+    previous: Optional[List[RegisterMapping]] = None,
+    cache: Optional[MappingCache] = None
 ) -> Dict[str, Any]:
-    """Prepare context dictionary for Jinja2 template rendering."""
+    """
+    Prepare context dictionary for Jinja2 template rendering.
+
+    If previous (a locked mapping) is given, unchanged fields keep their slots.
+    If cache is given, the mapping is reused from (or stored in) it.
+    """
 
     # Perform register mapping
-    mapper = RegisterMapper()
+    geometry = get_geometry(package.register_geometry)
+    mapper = RegisterMapper(geometry=geometry, cache=cache)
     items = [(dt.name, dt.datatype) for dt in package.datatypes]
-    mappings_list = mapper.map(items, strategy=package.mapping_strategy)
+    update_rates = {dt.name: dt.update_rate for dt in package.datatypes if dt.update_rate is not None} or None
+    pins = {
+        dt.name: (dt.control_register, dt.bit_range)
+        for dt in package.datatypes if dt.control_register is not None
+    } or None
+    mappings_list = mapper.map(items, strategy=package.mapping_strategy, update_rates=update_rates,
+                               previous=previous, pins=pins)
+    report = mapper.generate_report(mappings_list, update_rates=update_rates)
 
     # Determine which type packages are needed
     has_voltage = any(TYPE_REGISTRY[dt.datatype].unit == 'mV' for dt in package.datatypes)
@@ -161,9 +223,13 @@ def prepare_template_context(
 
         # Extract bit range from VHDL slice (respects RegisterMapping abstraction)
         vhdl_slice = signal_mapping.to_vhdl_slice()
-        # Extract just the bit range part: "app_reg_6(31 downto 16)" -> "(31 downto 16)"
-        bit_range = vhdl_slice.split('(', 1)[1].rstrip(')')
-        bit_range = f"({bit_range})"
+        if signal_mapping.is_spanning:
+            # Concatenated slices are used whole by the shadow/commit logic
+            bit_range = None
+        else:
+            # Extract just the bit range part: "app_reg_6(31 downto 16)" -> "(31 downto 16)"
+            bit_range = vhdl_slice.split('(', 1)[1].rstrip(')')
+            bit_range = f"({bit_range})"
 
         # For single-bit signals, extract the bit position for boolean handling
         if metadata.bit_width == 1:
@@ -180,8 +246,16 @@ def prepare_template_context(
             'default_value': dt_spec.default_value,
             'bit_width': metadata.bit_width,
             'cr_number': signal_mapping.cr_number,
+            'cr_signal': f"app_reg_{signal_mapping.cr_number}",  # CR the shim extracts from
             'bit_range': bit_range,
             'bit_position': bit_position,
+            'is_spanning': signal_mapping.is_spanning,
+            'register_expr': vhdl_slice,
+            'commit_ref': (f"app_reg_{signal_mapping.commit_bit[0]}({signal_mapping.commit_bit[1]})"
+                           if signal_mapping.commit_bit else None),
+            # VHDL integers are 32-bit: spanning defaults need a bit-string literal
+            'default_literal': (_bit_string(dt_spec.default_value or 0, metadata.bit_width)
+                                if signal_mapping.is_spanning else None),
             'is_boolean': metadata.python_type == bool,
             'is_voltage': metadata.unit == 'mV',
             'is_time': metadata.unit in ('ns', 'us', 'ms', 's'),
@@ -191,27 +265,16 @@ def prepare_template_context(
         }
         signals.append(signal_info)
 
-    # Build register mapping summaries for comments (grouped by CR number)
-    register_map_dict = {}
-    for mapping in mappings_list:
-        if mapping.cr_number not in register_map_dict:
-            register_map_dict[mapping.cr_number] = []
-        register_map_dict[mapping.cr_number].append(mapping)
-
+    # Build register mapping summaries for comments (grouped by CR number;
+    # spanning fields appear once per CR they touch, plus their commit bit)
     register_mappings = []
-    for cr_num in sorted(register_map_dict.keys()):
+    for cr_num in sorted(report.register_map.keys()):
         fields_list = []
-        for mapping in register_map_dict[cr_num]:
-            # Use RegisterMapping abstraction - extract bit range from VHDL slice
-            vhdl_slice = mapping.to_vhdl_slice()
-            bits_str = vhdl_slice.split('(', 1)[1].rstrip(')')
-            # Convert VHDL "downto" to colon format for comments
-            bits_str = bits_str.replace(' downto ', ':')
-
+        for msb, lsb, label, _ in sorted(report.register_slices(cr_num), reverse=True):
             fields_list.append({
-                'name': mapping.name,
-                'bits': bits_str,
-                'width': mapping.bit_width(),
+                'name': label,
+                'bits': f"{msb}" if msb == lsb else f"{msb}:{lsb}",
+                'width': msb - lsb + 1,
             })
 
         register_mappings.append({
@@ -225,43 +288,503 @@ def prepare_template_context(
     # Calculate efficiency
     total_registers = len(register_mappings)
     total_bits_used = sum(sum(f['width'] for f in rm['fields']) for rm in register_mappings)
-    total_bits_available = total_registers * 32
+    total_bits_available = total_registers * geometry.bits_per_register
     efficiency_percent = round((total_bits_used / total_bits_available) * 100, 1) if total_bits_available > 0 else 0
 
     # Build complete context
     context = {
         'app_name': package.app_name,
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'yaml_file': yaml_path.name,
         'platform_name': platform_info['name'],
         'platform_clock_mhz': platform_info['clock_mhz'],
         'platform_clock_hz': platform_info['clock_mhz'] * 1_000_000,
         'mapping_strategy': package.mapping_strategy,
+        'register_range': f"CR{geometry.first_cr}-CR{geometry.last_cr}",
+        'pipeline_stages': 0,
+        'update_enable': 'ready_for_updates',
         'has_voltage_types': has_voltage,
         'has_time_types': has_time,
         'signals': signals,
+        'spanning_signals': [s for s in signals if s['is_spanning']],
         'register_mappings': register_mappings,
         'cr_numbers_used': cr_numbers_used,
         'total_registers': total_registers,
         'total_bits_used': total_bits_used,
         'total_bits_available': total_bits_available,
         'efficiency_percent': efficiency_percent,
+        'expected_writes_per_update': report.expected_writes_per_update,
+        'mapping_report': report,
     }
 
     return context
 
 
+# Driver (and cocotb helper) methods that field properties must not shadow
+DRIVER_RESERVED_NAMES = {'flush', 'invalidate', 'pending', 'words', 'apply', 'reset'}
+
+# Control<N> inputs of the MCC/FORGE wrappers (Control0-Control15)
+MCC_CONTROL_COUNT = 16
+
+
+def driver_class_name(app_name: str) -> str:
+    """Python class name for an app's register driver (e.g. DS1140_PD -> DS1140PDDriver)."""
+    name = ''.join(part[:1].upper() + part[1:] for part in re.split(r'[^0-9A-Za-z]+', app_name))
+    if not name or name[0].isdigit():
+        name = 'App' + name
+    return f"{name}Driver"
+
+
+def prepare_driver_context(package: BasicAppsRegPackage, context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Context for driver.py.j2 and cocotb.py.j2, built from the compiled
+    FieldCodecs of the mapping in `context` (so the drivers and the shim
+    always agree).
+
+    Raises:
+        ValueError: If a field name clashes with a driver method
+    """
+    report = context['mapping_report']
+    bits = report.geometry.bits_per_register
+    word_mask = (1 << bits) - 1
+    codec = RegisterCodec(report.mappings)
+    index = {cr: i for i, cr in enumerate(codec.cr_numbers)}
+    specs = {dt.name: dt for dt in package.datatypes}
+    mappings = {m.name: m for m in report.mappings}
+
+    fields = []
+    for name, field in codec.fields.items():
+        if name in DRIVER_RESERVED_NAMES:
+            raise ValueError(f"Field name '{name}' clashes with a driver method")
+        spec = specs[name]
+        metadata = TYPE_REGISTRY[field.datatype]
+        parts = field.segments or ((field.cr_number, field.lsb, field.width, 0),)
+        reads, writes = [], []
+        for cr, lsb, width, shift in parts:
+            i, mask = index[cr], (1 << width) - 1
+            keep = word_mask & ~(mask << lsb)
+            read = f"(words[{i}] >> {lsb}) & {mask:#x}" if lsb else f"words[{i}] & {mask:#x}"
+            reads.append(f"({read}) << {shift}" if shift else read)
+            value = f"(raw >> {shift})" if shift else "raw"
+            value = f"({value} & {mask:#x}) << {lsb}" if lsb else f"{value} & {mask:#x}"
+            writes.append((i, f"(words[{i}] & {keep:#x}) | ({value})" if keep else value))
+        location = ' & '.join(f"CR{cr}[{msb}:{lsb}]" if msb != lsb else f"CR{cr}[{msb}]"
+                              for cr, msb, lsb in mappings[name].parts())
+        kind = 'boolean' if field.is_boolean else 'voltage' if field.is_voltage else 'time'
+        unit = f" ({metadata.unit})" if metadata.unit else ""
+
+        fields.append({
+            'name': name,
+            'attr': name + '_' if keyword.iskeyword(name) else name,
+            'datatype': field.datatype.value,
+            'location': location,
+            'doc': (spec.description or name) + unit,
+            'kind': kind,
+            'python_type': 'bool' if kind == 'boolean' else 'int',
+            'is_spanning': bool(field.segments),
+            'signed': field.signed,
+            'sign_bit': hex(1 << (field.width - 1)),
+            'mask': hex(field.mask),
+            'min_value': metadata.min_value,
+            'max_value': metadata.max_value,
+            'full_scale_raw': field.full_scale_raw,
+            'full_scale_mv': field.full_scale_mv,
+            'index': index[field.cr_number],
+            'bit': hex(1 << field.lsb),
+            'keep': hex(word_mask & ~(field.mask << field.lsb)),
+            'lsb': field.lsb,
+            'read': ' | '.join(f"({r})" for r in reads) if len(reads) > 1 else reads[0],
+            'writes': writes,
+            'commit': field.commit and {'index': index[field.commit[0]], 'bit': hex(1 << field.commit[1])},
+            'dirty': hex(sum(1 << index[cr] for cr in field.cr_numbers)),
+            'default_value': spec.default_value,
+            'example': spec.default_value if spec.default_value is not None else
+                       (True if kind == 'boolean' else metadata.max_value),
+        })
+
+    commits = [f"({f['commit']['index']}, {f['commit']['bit']})" for f in fields if f['commit']]
+    class_name = driver_class_name(package.app_name)
+    return {
+        'app_name': package.app_name,
+        'class_name': class_name,
+        'cocotb_class': class_name.removesuffix('Driver') + 'CocotbDriver',
+        'driver_module': f"{package.app_name}_driver",
+        'control_count': max(MCC_CONTROL_COUNT, report.geometry.last_cr + 1),
+        'yaml_file': context['yaml_file'],
+        'register_range': context['register_range'],
+        'mapping_strategy': package.mapping_strategy,
+        'cr_numbers': codec.cr_numbers,
+        'all_dirty': hex((1 << len(codec.cr_numbers)) - 1),
+        'commit_bits': f"({', '.join(commits)}{',' if len(commits) == 1 else ''})",
+        'fields': fields,
+    }
+
+
+# Build manifest (input/output hashes) for incremental generation
+MANIFEST_NAME = '.codegen_manifest.json'
+MANIFEST_VERSION = 1
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def input_hashes(
+    yaml_path: Path,
+    template_dir: Path,
+    lock_file: Optional[Path] = None,
+    snapshot: Optional[Path] = None,
+    platform: Optional[str] = None,
+    dependencies: Optional[List[Path]] = None,
+    app_type_packages: bool = False,
+    pipeline_stages: Union[int, str] = 0
+) -> Dict[str, Any]:
+    """
+    Content hashes of everything generate_vhdl() output depends on.
+
+    Covers the YAML spec, every template, this generator, the mapper
+    version, TYPE_REGISTRY and geometry profiles, the lock file (if any),
+    the requested extra outputs, the target platform when it overrides
+    the YAML one (generate_platforms()), any extra dependency files
+    (e.g. the VHDL type packages the templates use, see batch.py) and the
+    type package generator when app-specific type packages are written,
+    and the shim pipeline stages.
+    """
+    return {
+        'manifest_version': MANIFEST_VERSION,
+        'yaml': _sha256(yaml_path.read_bytes()),
+        'templates': {p.name: _sha256(p.read_bytes()) for p in sorted(template_dir.glob('*.j2'))},
+        'generator': _sha256(Path(__file__).read_bytes()),
+        'mapper_version': MAPPER_VERSION,
+        'type_registry': _sha256(repr(sorted(
+            (dtype.value, repr(metadata)) for dtype, metadata in TYPE_REGISTRY.items()
+        )).encode()),
+        'geometry_profiles': _sha256(repr(sorted(GEOMETRY_PROFILES.items())).encode()),
+        'lock_file': (_sha256(lock_file.read_bytes())
+                      if lock_file is not None and lock_file.exists() else None),
+        'snapshot': str(snapshot) if snapshot is not None else None,
+        'platform': platform,
+        'dependencies': ({str(p): _sha256(p.read_bytes()) for p in sorted(dependencies)}
+                         if dependencies else None),
+        'app_type_packages': (_sha256((Path(__file__).parent / 'type_utilities.py').read_bytes())
+                              if app_type_packages else None),
+        'pipeline_stages': pipeline_stages,
+    }
+
+
+def load_manifest(output_dir: Path) -> Optional[Dict[str, Any]]:
+    """Build manifest from a previous run, or None if absent/unreadable."""
+    try:
+        with open(output_dir / MANIFEST_NAME) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_up_to_date(output_dir: Path, inputs: Dict[str, Any]) -> bool:
+    """
+    True if the manifest in output_dir was written for the same inputs and
+    every output it lists is still present and unmodified.
+    """
+    manifest = load_manifest(output_dir)
+    if manifest is None or manifest.get('inputs') != inputs:
+        return False
+    for name, digest in manifest.get('outputs', {}).items():
+        path = output_dir / name
+        try:
+            if digest is not None and _sha256(path.read_bytes()) != digest:
+                return False
+        except OSError:
+            return False
+        if digest is None and not path.exists():
+            return False
+    return True
+
+
+def _report_write(path: Path, written: bool) -> None:
+    print(f"       {'Written' if written else 'Unchanged'}: {path}")
+
+
+def write_if_changed(path: Path, data: Union[str, bytes]) -> bool:
+    """Write data unless the file already holds it (keeps mtimes stable); returns True if written."""
+    content = data.encode() if isinstance(data, str) else data
+    try:
+        if path.read_bytes() == content:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return True
+
+
+def write_manifest(output_dir: Path, inputs: Dict[str, Any], outputs: Dict[str, Optional[str]]) -> None:
+    """Record the build manifest (deterministic JSON) in output_dir."""
+    manifest = {'inputs': inputs, 'outputs': outputs}
+    write_if_changed(output_dir / MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+
+
+# Environments are reused within a process (batch/watch runs): compiled
+# templates stay in memory and are reloaded only when their file changes
+_JINJA_ENVS: Dict[Tuple[Path, Optional[Path]], Environment] = {}
+
+
+def create_jinja_env(template_dir: Path, cache_dir: Optional[Path] = None) -> Environment:
+    """
+    Jinja2 environment for template_dir (safe to render from several threads).
+
+    Reused across calls in one process. If cache_dir is given, compiled
+    templates are also persisted there across processes (TemplateBytecodeCache).
+    """
+    from jinja2 import Environment, FileSystemLoader
+    from forge_codegen.generator.template_cache import TemplateBytecodeCache
+
+    key = (Path(template_dir).resolve(), Path(cache_dir).resolve() if cache_dir is not None else None)
+    env = _JINJA_ENVS.get(key)
+    if env is None:
+        env = _JINJA_ENVS[key] = Environment(
+            loader=FileSystemLoader(template_dir),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            bytecode_cache=TemplateBytecodeCache(cache_dir) if cache_dir is not None else None,
+        )
+    return env
+
+
+def template_cache_dir(cache: Optional[MappingCache]) -> Optional[Path]:
+    """Compiled-template cache directory that goes with a mapping cache (None if uncached)."""
+    return cache.directory / 'templates' if cache is not None else None
+
+
+def type_package_cache_dir(cache: Optional[MappingCache]) -> Optional[Path]:
+    """App-specific type package cache directory that goes with a mapping cache (None if uncached)."""
+    return cache.directory / 'type_packages' if cache is not None else None
+
+
+def write_app_type_packages(
+    package: BasicAppsRegPackage,
+    output_dir: Path,
+    cache: Optional[MappingCache] = None,
+    verbose: bool = True
+) -> Dict[str, Optional[str]]:
+    """
+    Write VHDL type packages holding only the conversions package's datatypes
+    use (see type_utilities.generate_app_type_packages), in place of the
+    frozen shared ones. Type packages the app no longer needs are removed.
+
+    Returns:
+        Manifest outputs: file name -> SHA-256
+    """
+    from forge_codegen.generator.type_utilities import load_app_type_packages
+
+    packages, cached = load_app_type_packages((dt.datatype for dt in package.datatypes),
+                                              type_package_cache_dir(cache))
+    if verbose:
+        print(f"       Type packages: {', '.join(packages)} ({'cached' if cached else 'generated'})")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for name in ('basic_app_voltage_pkg.vhd', 'basic_app_time_pkg.vhd'):
+        if name not in packages:
+            (output_dir / name).unlink(missing_ok=True)
+    outputs = {}
+    for name, source in packages.items():
+        written = write_if_changed(output_dir / name, source)
+        if verbose:
+            _report_write(output_dir / name, written)
+        outputs[name] = _sha256(source.encode())
+    return outputs
+
+
+def platform_context(context: Dict[str, Any], platform_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a template context retargeted to another platform (the mapping is shared)."""
+    return dict(
+        context,
+        platform_name=platform_info['name'],
+        platform_clock_mhz=platform_info['clock_mhz'],
+        platform_clock_hz=platform_info['clock_mhz'] * 1_000_000,
+    )
+
+
+# --pipeline-stages auto: (highest clock in MHz, stages); faster clocks get AUTO_PIPELINE_MAX.
+# auto stops at the slice stage; the conversion stage (2) is opt-in, for when
+# the *_from_raw conversions themselves miss timing.
+AUTO_PIPELINE_STAGES = [(250, 0)]
+AUTO_PIPELINE_MAX = 1
+
+
+def resolve_pipeline_stages(value: Union[int, str], platform_info: Dict[str, Any]) -> int:
+    """Shim pipeline stages for a platform: an int >= 0, or 'auto' (by clock, AUTO_PIPELINE_STAGES)."""
+    if value == 'auto':
+        for max_mhz, stages in AUTO_PIPELINE_STAGES:
+            if platform_info['clock_mhz'] <= max_mhz:
+                return stages
+        return AUTO_PIPELINE_MAX
+    try:
+        stages = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"pipeline stages must be an integer >= 0 or 'auto', got {value!r}") from None
+    if stages < 0:
+        raise ValueError(f"pipeline stages must be an integer >= 0 or 'auto', got {value!r}")
+    return stages
+
+
+def pipeline_context(context: Dict[str, Any], stages: int) -> Dict[str, Any]:
+    """
+    Copy of a template context whose shim splits the CR -> signal path
+    across `stages` register stages.
+
+    Stage 1 registers each field's slice (and each spanning field's commit
+    bit), stage 2 the converted typed value, and further stages only delay.
+    ready_for_updates and the commit bits go through the same number of
+    stages, so all fields (and spanning fields' segments and commit bits)
+    are taken from one coherent CR snapshot. The mapping report records the
+    stages and the resulting latency.
+    """
+    if stages == context['pipeline_stages']:
+        return context
+    if context['pipeline_stages']:
+        raise ValueError("context is already pipelined")
+    return dict(
+        context,
+        pipeline_stages=stages,
+        update_enable=f"ready_for_updates_p{stages}" if stages else 'ready_for_updates',
+        mapping_report=dataclasses.replace(context['mapping_report'], pipeline_stages=stages),
+    )
+
+
+def render_outputs(
+    jinja_env: Environment,
+    package: BasicAppsRegPackage,
+    context: Dict[str, Any],
+    output_dir: Path,
+    driver_context: Optional[Dict[str, Any]] = None,
+    verbose: bool = True
+) -> Dict[str, Optional[str]]:
+    """
+    Render and write the shim, drivers and (if absent) main file for one context.
+
+    Returns:
+        Manifest outputs: file name -> SHA-256 (None for the hand-edited main file)
+    """
+    log = print if verbose else (lambda *args: None)
+    if driver_context is None:
+        driver_context = prepare_driver_context(package, context)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Generate shim
+    log(f"\n[4/5] Generating shim and driver files...")
+    shim_output = jinja_env.get_template('shim.vhd.j2').render(context)
+    shim_path = output_dir / f"{package.app_name}_custom_inst_shim.vhd"
+    written = write_if_changed(shim_path, shim_output)
+    if verbose:
+        _report_write(shim_path, written)
+    log(f"       Size: {len(shim_output)} bytes")
+
+    driver_output = jinja_env.get_template('driver.py.j2').render(driver_context)
+    driver_path = output_dir / f"{package.app_name}_driver.py"
+    written = write_if_changed(driver_path, driver_output)
+    if verbose:
+        _report_write(driver_path, written)
+
+    cocotb_output = jinja_env.get_template('cocotb.py.j2').render(driver_context)
+    cocotb_path = output_dir / f"{package.app_name}_cocotb.py"
+    written = write_if_changed(cocotb_path, cocotb_output)
+    if verbose:
+        _report_write(cocotb_path, written)
+
+    # Generate main
+    log(f"\n[5/5] Generating main template file...")
+    main_path = output_dir / f"{package.app_name}_custom_inst_main.vhd"
+
+    # Only write main if it doesn't exist (don't overwrite hand-written logic)
+    if main_path.exists():
+        log(f"       Skipped: {main_path} (already exists)")
+    else:
+        main_output = jinja_env.get_template('main.vhd.j2').render(context)
+        main_path.write_text(main_output)
+        log(f"       Written: {main_path}")
+        log(f"       Size: {len(main_output)} bytes")
+
+    return {
+        shim_path.name: _sha256(shim_output.encode()),
+        driver_path.name: _sha256(driver_output.encode()),
+        cocotb_path.name: _sha256(cocotb_output.encode()),
+        main_path.name: None,  # hand-edited: only its presence is tracked
+    }
+
+
+def write_lock_and_snapshot(
+    package: BasicAppsRegPackage,
+    context: Dict[str, Any],
+    lock_file: Optional[Path],
+    snapshot: Optional[Path],
+    previous: Optional[List[RegisterMapping]] = None,
+    cache: Optional[MappingCache] = None
+) -> Optional[str]:
+    """Update the lock file and binary snapshot (if requested); returns the snapshot SHA-256."""
+    if lock_file is not None:
+        # The lock file records placement only, not the shim pipeline
+        report = dataclasses.replace(context['mapping_report'], pipeline_stages=0)
+        lock_json = json.dumps(report.to_json(), indent=2) + "\n"
+        if write_if_changed(lock_file, lock_json):
+            print(f"       Lock file updated: {lock_file}")
+
+    if snapshot is None:
+        return None
+    package.generate_mapping(previous=previous, cache=cache)  # same (locked) mapping as the shim
+    snapshot_data = package.to_binary()
+    if write_if_changed(snapshot, snapshot_data):
+        print(f"       Snapshot written: {snapshot}")
+    return _sha256(snapshot_data)
+
+
 def generate_vhdl(
     yaml_path: Path,
     output_dir: Path,
-    template_dir: Path
-) -> None:
-    """Generate VHDL shim and main files from YAML specification."""
+    template_dir: Path,
+    lock_file: Optional[Path] = None,
+    cache: Optional[MappingCache] = None,
+    snapshot: Optional[Path] = None,
+    force: bool = False,
+    dependencies: Optional[List[Path]] = None,
+    app_type_packages: bool = False,
+    pipeline_stages: Union[int, str] = 0
+) -> bool:
+    """
+    Generate VHDL shim and main files (plus a Python register driver) from
+    YAML specification.
+
+    Generation is incremental: input hashes (see input_hashes()) and output
+    hashes are recorded in output_dir/.codegen_manifest.json, and nothing is
+    rendered or written when they still match (unless force). Output is
+    deterministic, and files whose content is unchanged are not rewritten,
+    so downstream builds only see real changes.
+
+    If lock_file is given, the mapping stored there (if any) is kept stable:
+    only new or resized fields are placed, and the lock file is updated with
+    the resulting mapping. If cache is given, mapping results and compiled
+    templates (under cache.directory/templates) are reused across runs. If
+    snapshot is given, a binary snapshot of the package, mapping and codec
+    (BasicAppsRegPackage.to_binary) is written there. Changes to any of the
+    dependencies files also make outputs stale.
+    If app_type_packages, output_dir also gets VHDL type packages with only
+    the conversions this app uses (write_app_type_packages()).
+    pipeline_stages register stages ('auto': by platform clock, see
+    resolve_pipeline_stages()) are inserted on the shim's CR -> signal path
+    (pipeline_context()).
+
+    Returns:
+        True if outputs were generated, False if they were already up to date
+    """
 
     print("=" * 80)
     print("BasicAppDataTypes VHDL Generator v2.0")
     print("=" * 80)
 
+    inputs = input_hashes(yaml_path, template_dir, lock_file, snapshot, dependencies=dependencies,
+                          app_type_packages=app_type_packages, pipeline_stages=pipeline_stages)
+    if not force and is_up_to_date(output_dir, inputs):
+        print(f"\nUp to date: {output_dir}/ (inputs unchanged, use --force to regenerate)")
+        return False
+
     # Load YAML spec
     print(f"\n[1/5] Loading YAML specification: {yaml_path}")
     spec = load_yaml_spec(yaml_path)
@@ -273,6 +796,7 @@ def generate_vhdl(
     if spec['platform'] not in PLATFORM_MAP:
         raise ValueError(f"Unknown platform: {spec['platform']}")
     platform_info = PLATFORM_MAP[spec['platform']]
+    stages = resolve_pipeline_stages(pipeline_stages, platform_info)
 
     # Create register package
     print(f"\n[2/5] Creating register package...")
@@ -282,49 +806,47 @@ def generate_vhdl(
 
     # Prepare template context
     print(f"\n[3/5] Preparing template context...")
-    context = prepare_template_context(package, yaml_path, platform_info)
+    previous = load_lock_file(lock_file) if lock_file is not None else None
+    if previous is not None:
+        print(f"       Lock file: {lock_file} ({len(previous)} locked fields)")
+    context = pipeline_context(
+        prepare_template_context(package, yaml_path, platform_info, previous=previous, cache=cache), stages)
+    if cache is not None:
+        print(f"       Mapping cache: {'hit' if cache.hits else 'miss'} ({cache.directory})")
     print(f"       Signals: {len(context['signals'])}")
     print(f"       Registers used: {context['total_registers']} (CR{min(context['cr_numbers_used'])}-CR{max(context['cr_numbers_used'])})")
     print(f"       Efficiency: {context['efficiency_percent']}% ({context['total_bits_used']}/{context['total_bits_available']} bits)")
+    if context['expected_writes_per_update'] is not None:
+        print(f"       Expected CR writes per update: {context['expected_writes_per_update']:.2f}")
+    if stages:
+        print(f"       Shim pipeline: {stages} stage(s), CR write to signal: "
+              f"{context['mapping_report'].latency_cycles} cycles")
 
-    # Setup Jinja2 environment
-    jinja_env = Environment(
-        loader=FileSystemLoader(template_dir),
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
-
-    # Generate shim
-    print(f"\n[4/5] Generating shim file...")
-    shim_template = jinja_env.get_template('shim.vhd.j2')
-    shim_output = shim_template.render(context)
-    shim_path = output_dir / f"{package.app_name}_custom_inst_shim.vhd"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    shim_path.write_text(shim_output)
-    print(f"       Written: {shim_path}")
-    print(f"       Size: {len(shim_output)} bytes")
-
-    # Generate main
-    print(f"\n[5/5] Generating main template file...")
-    main_template = jinja_env.get_template('main.vhd.j2')
-    main_output = main_template.render(context)
+    outputs = render_outputs(create_jinja_env(template_dir, template_cache_dir(cache)), package, context, output_dir)
     main_path = output_dir / f"{package.app_name}_custom_inst_main.vhd"
+    if app_type_packages:
+        outputs.update(write_app_type_packages(package, output_dir, cache))
 
-    # Only write main if it doesn't exist (don't overwrite hand-written logic)
-    if main_path.exists():
-        print(f"       Skipped: {main_path} (already exists)")
-    else:
-        main_path.write_text(main_output)
-        print(f"       Written: {main_path}")
-        print(f"       Size: {len(main_output)} bytes")
+    snapshot_hash = write_lock_and_snapshot(package, context, lock_file, snapshot, previous, cache)
+    if snapshot is not None:
+        outputs[os.path.relpath(snapshot, output_dir)] = snapshot_hash
+
+    # Record inputs as of now (the lock file may just have been updated)
+    write_manifest(output_dir, input_hashes(yaml_path, template_dir, lock_file, snapshot, dependencies=dependencies,
+                                            app_type_packages=app_type_packages,
+                                            pipeline_stages=pipeline_stages), outputs)
 
     print("\n" + "=" * 80)
     print("✅ Generation Complete")
     print("=" * 80)
     print(f"\nGenerated files in: {output_dir}/")
     print(f"  - {package.app_name}_custom_inst_shim.vhd (auto-generated, always overwritten)")
+    print(f"  - {package.app_name}_driver.py (Python register driver, always overwritten)")
+    print(f"  - {package.app_name}_cocotb.py (cocotb register helper, always overwritten)")
     if not main_path.exists():
         print(f"  - {package.app_name}_custom_inst_main.vhd (template, customize for your app)")
+    if app_type_packages:
+        print("  - basic_app_*_pkg.vhd (type packages for this app's datatypes only, always overwritten)")
 
     print(f"\nRegister Mapping Summary ({context['mapping_strategy']} strategy):")
     for mapping in context['register_mappings']:
@@ -332,11 +854,171 @@ def generate_vhdl(
             f"{f['name']}[{f['bits']}]" for f in mapping['fields']
         )
         print(f"  CR{mapping['register_index']}: {fields_str}")
+    if stages:
+        print(f"  Shim pipeline: {stages} stage(s), +{stages} cycles "
+              f"(CR write to signal: {context['mapping_report'].latency_cycles} cycles)")
 
     print(f"\nNext steps:")
     print(f"1. Implement application logic in {package.app_name}_custom_inst_main.vhd")
     print(f"2. Add any custom signals/state machines needed")
     print(f"3. Test with CocotB or hardware deployment")
+    return True
+
+
+PLATFORM_SUMMARY_NAME = 'platforms_summary.json'
+
+
+def resolve_platforms(value: str) -> List[str]:
+    """Parse a --platforms value ('all' or comma-separated PLATFORM_MAP keys)."""
+    if value == 'all':
+        return list(PLATFORM_MAP)
+    platforms = [p.strip() for p in value.split(',') if p.strip()]
+    unknown = [p for p in platforms if p not in PLATFORM_MAP]
+    if unknown or not platforms:
+        raise ValueError(f"Unknown platform(s): {unknown or value!r} (choose from: all, {', '.join(PLATFORM_MAP)})")
+    return list(dict.fromkeys(platforms))
+
+
+def render_platform(
+    template_dir: Path,
+    bytecode_dir: Optional[Path],
+    package: BasicAppsRegPackage,
+    context: Dict[str, Any],
+    output_dir: Path,
+    driver_context: Dict[str, Any]
+) -> Dict[str, Optional[str]]:
+    """
+    Render one platform's outputs quietly (worker entry point: plain,
+    picklable arguments; bytecode_dir is template_cache_dir(cache)).
+    """
+    jinja_env = create_jinja_env(template_dir, bytecode_dir)
+    return render_outputs(jinja_env, package, context, output_dir, driver_context, verbose=False)
+
+
+def generate_platforms(
+    yaml_path: Path,
+    output_dir: Path,
+    template_dir: Path,
+    platforms: Optional[List[str]] = None,
+    lock_file: Optional[Path] = None,
+    cache: Optional[MappingCache] = None,
+    snapshot: Optional[Path] = None,
+    force: bool = False,
+    jobs: Optional[int] = None,
+    app_type_packages: bool = False,
+    pipeline_stages: Union[int, str] = 0
+) -> Dict[str, bool]:
+    """
+    Generate one output directory per platform (output_dir/<platform>/) in one run.
+
+    The YAML is parsed and validated once and the mapping computed once per
+    register geometry (all PLATFORM_MAP entries share one today); only the
+    platform constants differ between the rendered variants. Stale platforms
+    (per their build manifest) are rendered in up to `jobs` worker processes
+    (rendering is CPU-bound Python, so threads would serialise on the GIL),
+    and output_dir/platforms_summary.json summarises the run.
+    The lock file and snapshot are platform independent and written once.
+    If app_type_packages, each platform directory also gets the app's type
+    packages (see generate_vhdl()). With pipeline_stages='auto', each platform
+    gets the shim pipeline depth for its clock.
+
+    Returns:
+        Platform key -> True if generated, False if already up to date
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    platforms = list(PLATFORM_MAP) if platforms is None else platforms
+    print("=" * 80)
+    print(f"BasicAppDataTypes VHDL Generator v2.0 ({len(platforms)} platforms)")
+    print("=" * 80)
+
+    def platform_inputs(key: str) -> Dict[str, Any]:
+        return input_hashes(yaml_path, template_dir, lock_file, snapshot, platform=key,
+                            app_type_packages=app_type_packages, pipeline_stages=pipeline_stages)
+
+    stale = [key for key in platforms if force or not is_up_to_date(output_dir / key, platform_inputs(key))]
+    if not stale:
+        print(f"\nUp to date: {output_dir}/ (inputs unchanged, use --force to regenerate)")
+        return {key: False for key in platforms}
+
+    # Parse, validate and map once per register geometry
+    spec = load_yaml_spec(yaml_path)
+    previous = load_lock_file(lock_file) if lock_file is not None else None
+    groups: Dict[str, List[str]] = {}
+    for key in platforms:
+        geometry = spec.get('register_geometry', PLATFORM_MAP[key]['register_geometry'])
+        groups.setdefault(geometry, []).append(key)
+    if len(groups) > 1 and (lock_file is not None or snapshot is not None):
+        raise ValueError("--lock-file/--snapshot need all platforms to share one register geometry")
+
+    contexts: Dict[str, Dict[str, Any]] = {}
+    jobs_args = []
+    for geometry, keys in groups.items():
+        package = create_register_package(dict(spec, platform=keys[0]))
+        base = prepare_template_context(package, yaml_path, PLATFORM_MAP[keys[0]], previous=previous, cache=cache)
+        driver_context = prepare_driver_context(package, base)
+        for key in keys:
+            contexts[key] = pipeline_context(platform_context(base, PLATFORM_MAP[key]),
+                                             resolve_pipeline_stages(pipeline_stages, PLATFORM_MAP[key]))
+            if key in stale:
+                jobs_args.append((key, package, driver_context))
+    print(f"\nParsed {yaml_path.name} once; mapped {len(groups)} register geometr{'y' if len(groups) == 1 else 'ies'}")
+
+    bytecode_dir = template_cache_dir(cache)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(jobs_args)))
+    if jobs == 1:
+        outputs = {
+            key: render_platform(template_dir, bytecode_dir, package, contexts[key], output_dir / key, driver_context)
+            for key, package, driver_context in jobs_args
+        }
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                key: pool.submit(render_platform, template_dir, bytecode_dir, package, contexts[key],
+                                 output_dir / key, driver_context)
+                for key, package, driver_context in jobs_args
+            }
+            outputs = {key: future.result() for key, future in futures.items()}
+
+    snapshot_hash = write_lock_and_snapshot(package, base, lock_file, snapshot, previous, cache)
+    for key, platform_outputs in outputs.items():
+        if app_type_packages:
+            platform_outputs.update(write_app_type_packages(package, output_dir / key, cache, verbose=False))
+        if snapshot is not None:
+            platform_outputs[os.path.relpath(snapshot, output_dir / key)] = snapshot_hash
+        write_manifest(output_dir / key, platform_inputs(key), platform_outputs)
+
+    # Combined summary
+    summary = {
+        'app_name': spec['app_name'],
+        'yaml_file': yaml_path.name,
+        'mapping_strategy': spec['mapping_strategy'],
+        'platforms': {},
+    }
+    print(f"\n{'Platform':<12} {'Clock':>9} {'Geometry':<14} {'Registers':>9} {'Efficiency':>10} {'Latency':>8}  Status")
+    print("-" * 81)
+    for key in platforms:
+        context = contexts[key]
+        status = 'generated' if key in outputs else 'up to date'
+        summary['platforms'][key] = {
+            'name': context['platform_name'],
+            'clock_mhz': context['platform_clock_mhz'],
+            'register_geometry': context['mapping_report'].geometry.name,
+            'output_dir': key,
+            'registers_used': context['total_registers'],
+            'bits_used': context['total_bits_used'],
+            'efficiency_percent': context['efficiency_percent'],
+            'pipeline_stages': context['pipeline_stages'],
+            'latency_cycles': context['mapping_report'].latency_cycles,
+            'status': status,
+        }
+        print(f"{context['platform_name']:<12} {context['platform_clock_mhz']:>5} MHz "
+              f"{context['mapping_report'].geometry.name:<14} {context['total_registers']:>9} "
+              f"{context['efficiency_percent']:>9}% {context['mapping_report'].latency_cycles:>4} clk  {status}")
+    write_if_changed(output_dir / PLATFORM_SUMMARY_NAME, json.dumps(summary, indent=2, sort_keys=True) + "\n")
+    print(f"\nOutputs: {output_dir}/<platform>/ (summary: {output_dir / PLATFORM_SUMMARY_NAME})")
+
+    return {key: key in outputs for key in platforms}
 
 
 def main():
@@ -361,8 +1043,84 @@ def main():
         default=project_root / 'shared' / 'custom_inst' / 'templates',
         help='Template directory (default: shared/custom_inst/templates/)'
     )
+    parser.add_argument(
+        '--lock-file',
+        type=Path,
+        default=None,
+        help='Mapping lock file (mapping.json); keeps existing field placement stable'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=None,
+        help='Mapping cache directory, compiled templates go in its templates/ (default: $FORGE_CODEGEN_CACHE_DIR or ~/.cache/forge-codegen/mappings)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the mapping and compiled-template caches'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Regenerate even if the build manifest says outputs are up to date'
+    )
+    parser.add_argument(
+        '--platforms',
+        default=None,
+        help="Generate for several platforms into <output-dir>/<platform>/: 'all' or e.g. moku_go,moku_pro"
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        help='Worker processes for --platforms (default: one per CPU)'
+    )
+    parser.add_argument(
+        '--pipeline-stages',
+        default='0',
+        help="Register stages on the shim's CR -> signal path (1: field slices, 2: converted values, "
+             "more: delay): N >= 0 or 'auto' (by platform clock, at most 1) (default: 0)"
+    )
+    parser.add_argument(
+        '--app-type-packages',
+        action='store_true',
+        help='Also write VHDL type packages with only the conversions this app uses (instead of the frozen shared ones)'
+    )
+    parser.add_argument(
+        '--snapshot',
+        type=Path,
+        default=None,
+        help='Also write a binary register interface snapshot (e.g. regs.fgrb) for deploy/campaign tools'
+    )
+
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and regenerate whenever the spec or a template changes'
+    )
+    parser.add_argument(
+        '--poll',
+        action='store_true',
+        help='With --watch: poll file mtimes instead of using inotify'
+    )
+    parser.add_argument(
+        '--debounce-ms',
+        type=float,
+        default=30,
+        help='With --watch: quiet period that ends a burst of saves (default: 30)'
+    )
 
     args = parser.parse_args()
+    if args.watch and args.platforms is not None:
+        parser.error('--watch does not support --platforms')
+    if args.watch and args.app_type_packages:
+        parser.error('--watch does not support --app-type-packages')
+    if args.pipeline_stages != 'auto':
+        try:
+            args.pipeline_stages = resolve_pipeline_stages(args.pipeline_stages, {})
+        except ValueError as e:
+            parser.error(str(e))
 
     # Validate input
     if not args.yaml_file.exists():
@@ -372,6 +1130,8 @@ def main():
     # Determine output directory
     if args.output_dir is None:
         # Extract app name from YAML to use in default output path
+        import yaml
+
         with open(args.yaml_file, 'r') as f:
             spec = yaml.safe_load(f)
         app_name = spec.get('app_name', 'unknown_app')
@@ -379,7 +1139,21 @@ def main():
 
     # Generate VHDL
     try:
-        generate_vhdl(args.yaml_file, args.output_dir, args.template_dir)
+        cache = None if args.no_cache else MappingCache(args.cache_dir)
+        if args.watch:
+            from forge_codegen.generator.watch import watch
+            watch(args.yaml_file, args.output_dir, args.template_dir, lock_file=args.lock_file,
+                  cache=cache, snapshot=args.snapshot, debounce=args.debounce_ms / 1000, poll=args.poll,
+                  pipeline_stages=args.pipeline_stages)
+        elif args.platforms is not None:
+            generate_platforms(args.yaml_file, args.output_dir, args.template_dir,
+                               platforms=resolve_platforms(args.platforms), lock_file=args.lock_file,
+                               cache=cache, snapshot=args.snapshot, force=args.force, jobs=args.jobs,
+                               app_type_packages=args.app_type_packages, pipeline_stages=args.pipeline_stages)
+        else:
+            generate_vhdl(args.yaml_file, args.output_dir, args.template_dir, lock_file=args.lock_file,
+                          cache=cache, snapshot=args.snapshot, force=args.force,
+                          app_type_packages=args.app_type_packages, pipeline_stages=args.pipeline_stages)
     except Exception as e:
         print(f"\n❌ Error: {e}", file=sys.stderr)
         import traceback
@@ -0,0 +1,51 @@
+"""
+Persistent compiled-template cache for the code generator.
+
+Kept apart from codegen.py so jinja2 is only imported when templates are
+actually rendered (see create_jinja_env()).
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from jinja2 import FileSystemBytecodeCache
+from jinja2.bccache import Bucket
+
+from forge_codegen.basic_serialized_datatypes import default_cache_dir
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """
+    Persistent compiled-template cache (Jinja2 bytecode), best effort.
+
+    Entries are keyed by template name and invalidated by the template
+    source checksum, so an edited template is compiled once and re-cached.
+    Corrupt entries and unwritable directories fall back to compiling.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        """
+        Args:
+            directory: Cache directory (default: default_cache_dir()/templates)
+        """
+        self.cache_dir = Path(directory) if directory is not None else default_cache_dir() / 'templates'
+        super().__init__(str(self.cache_dir))
+        self.hits = 0
+        self.misses = 0
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        try:
+            super().load_bytecode(bucket)
+        except (OSError, EOFError, ValueError, TypeError):
+            bucket.reset()
+        if bucket.code is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
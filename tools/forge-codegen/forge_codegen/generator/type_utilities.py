@@ -17,10 +17,23 @@ Usage:
     python tools/generate_type_utilities.py
 
 Note: Run this script ONCE, commit the generated files, and freeze them.
+
+App-specific mode: generate_app_type_packages() emits the same packages
+restricted to the conversions an app's datatypes use (codegen.py
+--app-type-packages), cached by app_type_packages_key().
+
+Offset ROM mode: --offset-rom writes the forge_hierarchical_encoder status
+offset ROM (libs/platform/common/forge_hierarchical_offset_pkg.vhd) and the
+matching decoder table (tools/decoder/hierarchical_offset_table.py):
+    python -m forge_codegen.generator.type_utilities --offset-rom
 """
 
+import hashlib
+import json
+import os
 import sys
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -101,14 +114,25 @@ end package body basic_app_types_pkg;
     return header
 
 
-def generate_voltage_package() -> str:
-    """Generate voltage conversion package with all voltage type utilities."""
+def generate_voltage_package(types: Optional[Iterable[BasicAppDataTypes]] = None) -> str:
+    """
+    Generate voltage conversion package with all voltage type utilities.
+
+    Args:
+        types: Only emit the conversions for these voltage types
+               (default: every voltage type in TYPE_REGISTRY, the frozen package)
+    """
 
     # Get all voltage types from registry (types with unit='mV')
-    voltage_types = [
+    all_voltage_types = [
         (name, info) for name, info in TYPE_REGISTRY.items()
         if info.unit == 'mV'
     ]
+    if types is None:
+        voltage_types = all_voltage_types
+    else:
+        wanted = set(types)
+        voltage_types = [(name, info) for name, info in all_voltage_types if name in wanted]
 
     header = """------------------------------------------------------------------------------
 -- basic_app_voltage_pkg.vhd
@@ -223,17 +247,102 @@ package body basic_app_voltage_pkg is
 end package body basic_app_voltage_pkg;
 """
 
-    return header + ''.join(functions) + body_header + ''.join(body_functions) + footer
+    package = header + ''.join(functions) + body_header + ''.join(body_functions) + footer
+    if types is not None:
+        package = _subset_banner(package, len(voltage_types), len(all_voltage_types), 'voltage types')
+    return package
 
 
-def generate_time_package() -> str:
-    """Generate time conversion package with clock-aware utilities."""
+# Time units with conversion functions: unit -> (name in comments, unit value in Hz)
+TIME_UNITS = {
+    'ns': ('nanoseconds', '1.0e9'),
+    'us': ('microseconds', '1.0e6'),
+    'ms': ('milliseconds', '1.0e3'),
+    's': ('seconds', None),  # integer arithmetic, no real scaling
+}
 
-    # Get all time types from registry (types with unit in ns/us/ms/s)
-    time_types = [
-        (name, info) for name, info in TYPE_REGISTRY.items()
-        if info.unit in ('ns', 'us', 'ms', 's')
-    ]
+
+def _time_declarations(unit: str) -> str:
+    name = TIME_UNITS[unit][0]
+    return f"""
+    -- Convert {name} to clock cycles
+    function {unit}_to_cycles(
+        {unit}_value : unsigned;
+        CLK_FREQ_HZ : integer
+    ) return unsigned;
+
+    -- Convert clock cycles to {name}
+    function cycles_to_{unit}(
+        cycles : unsigned;
+        CLK_FREQ_HZ : integer
+    ) return unsigned;
+"""
+
+
+def _time_bodies(unit: str) -> str:
+    scale = TIME_UNITS[unit][1]
+    if scale is None:
+        return f"""
+    function {unit}_to_cycles(
+        {unit}_value : unsigned;
+        CLK_FREQ_HZ : integer
+    ) return unsigned is
+        variable result : unsigned({unit}_value'length-1 downto 0);
+    begin
+        result := to_unsigned(to_integer({unit}_value) * CLK_FREQ_HZ, {unit}_value'length);
+        return result;
+    end function;
+
+    function cycles_to_{unit}(
+        cycles : unsigned;
+        CLK_FREQ_HZ : integer
+    ) return unsigned is
+        variable result : unsigned(cycles'length-1 downto 0);
+    begin
+        result := to_unsigned(to_integer(cycles) / CLK_FREQ_HZ, cycles'length);
+        return result;
+    end function;
+"""
+    return f"""
+    function {unit}_to_cycles(
+        {unit}_value : unsigned;
+        CLK_FREQ_HZ : integer
+    ) return unsigned is
+        variable cycles_per_{unit} : real;
+        variable result : unsigned({unit}_value'length-1 downto 0);
+    begin
+        cycles_per_{unit} := real(CLK_FREQ_HZ) / {scale};
+        result := to_unsigned(integer(real(to_integer({unit}_value)) * cycles_per_{unit}), {unit}_value'length);
+        return result;
+    end function;
+
+    function cycles_to_{unit}(
+        cycles : unsigned;
+        CLK_FREQ_HZ : integer
+    ) return unsigned is
+        variable {unit}_per_cycle : real;
+        variable result : unsigned(cycles'length-1 downto 0);
+    begin
+        {unit}_per_cycle := {scale} / real(CLK_FREQ_HZ);
+        result := to_unsigned(integer(real(to_integer(cycles)) * {unit}_per_cycle), cycles'length);
+        return result;
+    end function;
+"""
+
+
+def generate_time_package(units: Optional[Iterable[str]] = None) -> str:
+    """
+    Generate time conversion package with clock-aware utilities.
+
+    Args:
+        units: Only emit the conversions for these TIME_UNITS keys
+               (default: all of them, the frozen package)
+    """
+    if units is None:
+        selected = list(TIME_UNITS)
+    else:
+        wanted = set(units)
+        selected = [unit for unit in TIME_UNITS if unit in wanted]
 
     header = """------------------------------------------------------------------------------
 -- basic_app_time_pkg.vhd
@@ -262,159 +371,269 @@ package basic_app_time_pkg is
     ------------------------------------------------------------------------------
     -- Time Unit Conversions
     ------------------------------------------------------------------------------
+"""
 
-    -- Convert nanoseconds to clock cycles
-    function ns_to_cycles(
-        ns_value : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned;
+    body_header = """
+end package basic_app_time_pkg;
 
-    -- Convert clock cycles to nanoseconds
-    function cycles_to_ns(
-        cycles : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned;
+package body basic_app_time_pkg is
+"""
 
-    -- Convert microseconds to clock cycles
-    function us_to_cycles(
-        us_value : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned;
+    footer = """
+end package body basic_app_time_pkg;
+"""
 
-    -- Convert clock cycles to microseconds
-    function cycles_to_us(
-        cycles : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned;
+    package = (header + ''.join(map(_time_declarations, selected))
+               + body_header + ''.join(map(_time_bodies, selected)) + footer)
+    if units is not None:
+        package = _subset_banner(package, len(selected), len(TIME_UNITS), 'time units')
+    return package
+
+
+# App-specific ("tree-shaken") packages: same package names as the frozen
+# ones, so the shim/main templates compile against either
+APP_TYPE_PACKAGES_VERSION = "1"
+_FROZEN_LINE = "-- Version: 1.0.0 (FROZEN - DO NOT REGENERATE)"
+
+
+def _subset_banner(package: str, kept: int, total: int, what: str) -> str:
+    """Replace the FROZEN banner of an app-specific subset package."""
+    return package.replace(
+        _FROZEN_LINE,
+        f"-- Version: 1.0.0 (app-specific subset: {kept} of {total} {what};\n"
+        f"--          regenerated with the app, do not edit)",
+        1,
+    )
+
+
+def used_types(datatypes: Iterable[BasicAppDataTypes]) -> Tuple[List[BasicAppDataTypes], List[str]]:
+    """Voltage types and time units (TIME_UNITS keys) referenced by datatypes, sorted."""
+    voltage, units = set(), set()
+    for datatype in datatypes:
+        unit = TYPE_REGISTRY[datatype].unit
+        if unit == 'mV':
+            voltage.add(datatype)
+        elif unit in TIME_UNITS:
+            units.add(unit)
+    return sorted(voltage), [u for u in TIME_UNITS if u in units]
+
+
+def generate_app_type_packages(datatypes: Iterable[BasicAppDataTypes]) -> Dict[str, str]:
+    """
+    Type packages holding only what an app's datatypes need.
+
+    basic_app_types_pkg is always emitted; the voltage and time packages
+    only if the app uses such types, and then only with those conversions.
+
+    Returns:
+        File name -> VHDL source
+    """
+    voltage, units = used_types(datatypes)
+    packages = {'basic_app_types_pkg.vhd': generate_types_package()}
+    if voltage:
+        packages['basic_app_voltage_pkg.vhd'] = generate_voltage_package(voltage)
+    if units:
+        packages['basic_app_time_pkg.vhd'] = generate_time_package(units)
+    return packages
+
+
+def app_type_packages_key(datatypes: Iterable[BasicAppDataTypes]) -> str:
+    """SHA-256 of the used types and this generator's source (apps with the same types share it)."""
+    voltage, units = used_types(datatypes)
+    canonical = json.dumps({
+        'version': APP_TYPE_PACKAGES_VERSION,
+        'generator': hashlib.sha256(Path(__file__).read_bytes()).hexdigest(),
+        'voltage': [datatype.value for datatype in voltage],
+        'time_units': units,
+    }, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def load_app_type_packages(datatypes: Iterable[BasicAppDataTypes],
+                           cache_dir: Optional[Path] = None) -> Tuple[Dict[str, str], bool]:
+    """
+    generate_app_type_packages(), through a hash-keyed cache in cache_dir
+    (one JSON file per app_type_packages_key(); best effort, like MappingCache).
+
+    Returns:
+        (file name -> VHDL source, True if it came from the cache)
+    """
+    datatypes = list(datatypes)
+    if cache_dir is None:
+        return generate_app_type_packages(datatypes), False
+
+    path = Path(cache_dir) / f"{app_type_packages_key(datatypes)}.json"
+    try:
+        with open(path) as f:
+            packages = json.load(f)
+        if isinstance(packages, dict) and all(isinstance(v, str) for v in packages.values()):
+            return packages, True
+    except (OSError, ValueError):
+        pass
+
+    packages = generate_app_type_packages(datatypes)
+    import tempfile
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=path.parent, suffix=".tmp", delete=False) as f:
+            json.dump(packages, f)
+        os.replace(f.name, path)
+    except OSError:
+        if 'f' in locals():
+            Path(f.name).unlink(missing_ok=True)
+    return packages, False
+
+
+# Hierarchical encoder (forge_hierarchical_encoder) status offset:
+# offset = (status[6:0] * 100) / 128, in 0..99 of the 200 units per state.
+# The encoder reads it from a generated ROM instead of multiplying, and the
+# Python decoder inverts the same table, so both stay bit-exact.
+HIERARCHICAL_STATUS_STEPS = 128   # status[6:0]
+HIERARCHICAL_OFFSET_SPAN = 100    # offsets 0..99
+HIERARCHICAL_OFFSET_BITS = 7      # width of one ROM entry
+HIERARCHICAL_OFFSET_VHDL = "forge_hierarchical_offset_pkg.vhd"
+HIERARCHICAL_OFFSET_PYTHON = "hierarchical_offset_table.py"
+repo_root = project_root.parents[2]
+
+
+def hierarchical_offset_rom() -> List[int]:
+    """Encoder offset for each status[6:0] value."""
+    return [(status * HIERARCHICAL_OFFSET_SPAN) // HIERARCHICAL_STATUS_STEPS
+            for status in range(HIERARCHICAL_STATUS_STEPS)]
+
+
+def hierarchical_offset_inverse(rom: List[int]) -> List[int]:
+    """
+    Decoder status[6:0] for each offset: the smallest status the encoder
+    maps to it (the ROM is monotonic and covers every offset, so
+    rom[inverse[offset]] == offset).
+    """
+    inverse: Dict[int, int] = {}
+    for status, offset in enumerate(rom):
+        inverse.setdefault(offset, status)
+    return [inverse[offset] for offset in range(max(rom) + 1)]
+
+
+def generate_hierarchical_offset_package() -> str:
+    """VHDL package with the status -> offset ROM for forge_hierarchical_encoder."""
+    rom = hierarchical_offset_rom()
+    rows = []
+    for start in range(0, len(rom), 8):
+        entries = ', '.join(f"to_unsigned({offset:2d}, {HIERARCHICAL_OFFSET_BITS})"
+                            for offset in rom[start:start + 8])
+        comma = ',' if start + 8 < len(rom) else ''
+        rows.append(f"        {entries}{comma}  -- {start:3d}..{start + 7:3d}")
+    table = '\n'.join(rows)
+
+    return f"""------------------------------------------------------------------------------
+-- {HIERARCHICAL_OFFSET_VHDL}
+--
+-- Status offset ROM for forge_hierarchical_encoder
+--
+-- Generated by: python -m forge_codegen.generator.type_utilities --offset-rom
+-- DO NOT EDIT: regenerate instead. tools/decoder/{HIERARCHICAL_OFFSET_PYTHON}
+-- holds the same table for the Python decoder.
+--
+-- HIER_STATUS_OFFSET_ROM(s) = (s * {HIERARCHICAL_OFFSET_SPAN}) / {HIERARCHICAL_STATUS_STEPS} for status[6:0] = s, precomputed
+-- so the encoder needs no multiplier (a {HIERARCHICAL_STATUS_STEPS} x {HIERARCHICAL_OFFSET_BITS}-bit ROM maps to LUTs).
+--
+-- Usage in the encoder:
+--     offset := hier_status_offset(status_vector(6 downto 0));
+------------------------------------------------------------------------------
 
-    -- Convert milliseconds to clock cycles
-    function ms_to_cycles(
-        ms_value : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned;
+library IEEE;
+use IEEE.STD_LOGIC_1164.ALL;
+use IEEE.NUMERIC_STD.ALL;
 
-    -- Convert clock cycles to milliseconds
-    function cycles_to_ms(
-        cycles : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned;
+package forge_hierarchical_offset_pkg is
 
-    -- Convert seconds to clock cycles
-    function s_to_cycles(
-        s_value : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned;
+    constant HIER_OFFSET_BITS : natural := {HIERARCHICAL_OFFSET_BITS};
 
-    -- Convert clock cycles to seconds
-    function cycles_to_s(
-        cycles : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned;
+    type hier_offset_rom_t is array (0 to {HIERARCHICAL_STATUS_STEPS - 1}) of unsigned(HIER_OFFSET_BITS-1 downto 0);
 
-end package basic_app_time_pkg;
+    constant HIER_STATUS_OFFSET_ROM : hier_offset_rom_t := (
+{table}
+    );
 
-package body basic_app_time_pkg is
+    -- Offset (0..{HIERARCHICAL_OFFSET_SPAN - 1}) added to state * 200 for status[6:0]
+    function hier_status_offset(
+        status_lower : std_logic_vector(6 downto 0)
+    ) return unsigned;
 
-    function ns_to_cycles(
-        ns_value : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned is
-        variable cycles_per_ns : real;
-        variable result : unsigned(ns_value'length-1 downto 0);
-    begin
-        cycles_per_ns := real(CLK_FREQ_HZ) / 1.0e9;
-        result := to_unsigned(integer(real(to_integer(ns_value)) * cycles_per_ns), ns_value'length);
-        return result;
-    end function;
+end package forge_hierarchical_offset_pkg;
 
-    function cycles_to_ns(
-        cycles : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned is
-        variable ns_per_cycle : real;
-        variable result : unsigned(cycles'length-1 downto 0);
-    begin
-        ns_per_cycle := 1.0e9 / real(CLK_FREQ_HZ);
-        result := to_unsigned(integer(real(to_integer(cycles)) * ns_per_cycle), cycles'length);
-        return result;
-    end function;
+package body forge_hierarchical_offset_pkg is
 
-    function us_to_cycles(
-        us_value : unsigned;
-        CLK_FREQ_HZ : integer
+    function hier_status_offset(
+        status_lower : std_logic_vector(6 downto 0)
     ) return unsigned is
-        variable cycles_per_us : real;
-        variable result : unsigned(us_value'length-1 downto 0);
     begin
-        cycles_per_us := real(CLK_FREQ_HZ) / 1.0e6;
-        result := to_unsigned(integer(real(to_integer(us_value)) * cycles_per_us), us_value'length);
-        return result;
+        return HIER_STATUS_OFFSET_ROM(to_integer(unsigned(status_lower)));
     end function;
 
-    function cycles_to_us(
-        cycles : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned is
-        variable us_per_cycle : real;
-        variable result : unsigned(cycles'length-1 downto 0);
-    begin
-        us_per_cycle := 1.0e6 / real(CLK_FREQ_HZ);
-        result := to_unsigned(integer(real(to_integer(cycles)) * us_per_cycle), cycles'length);
-        return result;
-    end function;
+end package body forge_hierarchical_offset_pkg;
+"""
 
-    function ms_to_cycles(
-        ms_value : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned is
-        variable cycles_per_ms : real;
-        variable result : unsigned(ms_value'length-1 downto 0);
-    begin
-        cycles_per_ms := real(CLK_FREQ_HZ) / 1.0e3;
-        result := to_unsigned(integer(real(to_integer(ms_value)) * cycles_per_ms), ms_value'length);
-        return result;
-    end function;
 
-    function cycles_to_ms(
-        cycles : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned is
-        variable ms_per_cycle : real;
-        variable result : unsigned(cycles'length-1 downto 0);
-    begin
-        ms_per_cycle := 1.0e3 / real(CLK_FREQ_HZ);
-        result := to_unsigned(integer(real(to_integer(cycles)) * ms_per_cycle), cycles'length);
-        return result;
-    end function;
+def generate_hierarchical_offset_table() -> str:
+    """Python module with the same ROM and its inverse, for the hierarchical decoder."""
+    rom = hierarchical_offset_rom()
+    inverse = hierarchical_offset_inverse(rom)
 
-    function s_to_cycles(
-        s_value : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned is
-        variable result : unsigned(s_value'length-1 downto 0);
-    begin
-        result := to_unsigned(to_integer(s_value) * CLK_FREQ_HZ, s_value'length);
-        return result;
-    end function;
+    def rows(values: List[int]) -> str:
+        return '\n'.join('    ' + ', '.join(f"{v:3d}" for v in values[start:start + 16]) + ','
+                         for start in range(0, len(values), 16))
 
-    function cycles_to_s(
-        cycles : unsigned;
-        CLK_FREQ_HZ : integer
-    ) return unsigned is
-        variable result : unsigned(cycles'length-1 downto 0);
-    begin
-        result := to_unsigned(to_integer(cycles) / CLK_FREQ_HZ, cycles'length);
-        return result;
-    end function;
+    return f'''"""
+Status offset table for forge_hierarchical_encoder (generated, DO NOT EDIT).
 
-end package body basic_app_time_pkg;
+Generated by `python -m forge_codegen.generator.type_utilities --offset-rom`
+from the same table as libs/platform/common/{HIERARCHICAL_OFFSET_VHDL}.
+
+STATUS_OFFSET_ROM[s] is the encoder offset for status[6:0] = s
+((s * {HIERARCHICAL_OFFSET_SPAN}) // {HIERARCHICAL_STATUS_STEPS}). OFFSET_TO_STATUS[offset] is the smallest status
+with that offset, so STATUS_OFFSET_ROM[OFFSET_TO_STATUS[o]] == o.
 """
 
-    return header
+STATUS_OFFSET_ROM = (
+{rows(rom)}
+)
+
+OFFSET_TO_STATUS = (
+{rows(inverse)}
+)
+'''
+
+
+def write_hierarchical_offset_files(vhdl_path: Path, python_path: Path) -> None:
+    """Write the encoder ROM package and the decoder table (from one generated table)."""
+    for path, source in ((vhdl_path, generate_hierarchical_offset_package()),
+                         (python_path, generate_hierarchical_offset_table())):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+        print(f"Written: {path} ({len(source)} bytes)")
 
 
 def main():
-    """Generate all VHDL type utility packages."""
+    """Generate all VHDL type utility packages (or, with --offset-rom, the hierarchical offset ROM)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate VHDL type utility packages")
+    parser.add_argument('--offset-rom', action='store_true',
+                        help="Generate the forge_hierarchical_encoder status offset ROM "
+                             "(VHDL package + Python decoder table) instead")
+    parser.add_argument('--vhdl-output', type=Path,
+                        default=repo_root / "libs" / "platform" / "common" / HIERARCHICAL_OFFSET_VHDL,
+                        help="Offset ROM VHDL package path (with --offset-rom)")
+    parser.add_argument('--python-output', type=Path,
+                        default=repo_root / "tools" / "decoder" / HIERARCHICAL_OFFSET_PYTHON,
+                        help="Offset ROM decoder table path (with --offset-rom)")
+    args = parser.parse_args()
+
+    if args.offset_rom:
+        write_hierarchical_offset_files(args.vhdl_output, args.python_output)
+        return
 
     # Define output directory
     output_dir = project_root / "shared" / "custom_inst" / "vhdl"
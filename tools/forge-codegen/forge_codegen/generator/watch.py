@@ -0,0 +1,305 @@
+"""
+Watch mode for codegen.py (--watch).
+
+Monitors the spec YAML and the templates and regenerates on change:
+- Change detection uses inotify on Linux (via ctypes, no extra dependency)
+  and falls back to polling file mtimes elsewhere (or with --poll).
+- Bursts of saves (editor swap files, save-all) are debounced into one run.
+- WatchSession keeps each stage's result in memory and re-runs only the
+  affected stages: a template edit re-renders only; a spec edit reloads, and
+  remaps only if the parsed spec actually changed (not for comment edits).
+
+Example:
+    python -m forge_codegen.generator.codegen specs/bpd.yaml --watch
+"""
+
+import ctypes
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
+
+from forge_codegen.basic_serialized_datatypes import MappingCache
+from forge_codegen.generator.codegen import (
+    PLATFORM_MAP,
+    create_jinja_env,
+    create_register_package,
+    input_hashes,
+    load_lock_file,
+    load_yaml_spec,
+    prepare_driver_context,
+    pipeline_context,
+    prepare_template_context,
+    render_outputs,
+    resolve_pipeline_stages,
+    template_cache_dir,
+    write_lock_and_snapshot,
+    write_manifest,
+)
+
+DEFAULT_DEBOUNCE = 0.03     # Seconds of quiet that end a burst of saves
+DEFAULT_POLL_INTERVAL = 0.1
+
+# inotify(7) constants
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct('iIII')   # wd, mask, cookie, len (then len bytes of name)
+
+
+class PollingWatcher:
+    """Detects changed files by comparing mtimes/sizes every interval seconds."""
+
+    def __init__(self, directories: Iterable[Path], match: Callable[[Path], bool],
+                 interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            directories: Directories to watch (not recursive)
+            match: Which files in them are relevant
+            interval: Seconds between scans
+        """
+        self.directories = [Path(d).resolve() for d in directories]
+        self.match = match
+        self.interval = interval
+        self._state = self._scan()
+
+    def _scan(self) -> Dict[Path, tuple]:
+        state = {}
+        for directory in self.directories:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                path = Path(entry.path)
+                if self.match(path):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    state[path] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Changed paths, or an empty set if nothing changed within timeout (None: wait forever)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            state = self._scan()
+            if state != self._state:
+                changed = {p for p in state.keys() | self._state.keys() if state.get(p) != self._state.get(p)}
+                self._state = state
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval if deadline is None else
+                       max(0.0, min(self.interval, deadline - time.monotonic())))
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """
+    Linux inotify watcher (ctypes, no dependency). Watches directories, not
+    files, so atomic saves (write temp file + rename) are seen.
+    """
+
+    def __init__(self, directories: Iterable[Path], match: Callable[[Path], bool]):
+        """
+        Raises:
+            OSError: inotify is unavailable (non-Linux, watch limit reached, ...)
+        """
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        self.match = match
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, Path] = {}
+        mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+        for directory in directories:
+            directory = Path(directory).resolve()
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), mask)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                self.close()
+                raise OSError(errno, f"inotify_add_watch failed for {directory}")
+            self._dirs[wd] = directory
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Changed paths, or an empty set if nothing changed within timeout (None: wait forever)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not select.select([self._fd], [], [], remaining)[0]:
+                return set()
+            changed = set()
+            data = os.read(self._fd, 64 * 1024)
+            offset = 0
+            while offset < len(data):
+                wd, _mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+                offset += _EVENT.size + length
+                if wd in self._dirs and name:
+                    path = self._dirs[wd] / os.fsdecode(name)
+                    if self.match(path):
+                        changed.add(path)
+            if changed:
+                return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(directories: Iterable[Path], match: Callable[[Path], bool], poll: bool = False):
+    """InotifyWatcher where available (unless poll), else PollingWatcher."""
+    directories = list(directories)
+    if not poll:
+        try:
+            return InotifyWatcher(directories, match)
+        except (OSError, AttributeError):  # AttributeError: libc without inotify_* symbols
+            pass
+    return PollingWatcher(directories, match)
+
+
+def wait_for_changes(watcher, debounce: float = DEFAULT_DEBOUNCE,
+                     timeout: Optional[float] = None) -> Set[Path]:
+    """
+    Wait for a change, then keep collecting until debounce seconds pass
+    without another one; returns every path changed in the burst.
+    """
+    changed = watcher.wait(timeout)
+    while changed:
+        more = watcher.wait(debounce)
+        if not more:
+            break
+        changed |= more
+    return changed
+
+
+class WatchSession:
+    """
+    Regenerates one spec, keeping stage results (parsed spec, package and
+    mapping, template contexts, compiled templates) warm between runs.
+
+    Example:
+        >>> session = WatchSession(yaml_path, output_dir, template_dir)
+        >>> session.regenerate()                       # first run: all stages
+        ['load', 'map', 'render']
+        >>> session.regenerate({template_dir / 'shim.vhd.j2'})
+        ['render']
+    """
+
+    def __init__(self, yaml_path: Path, output_dir: Path, template_dir: Path,
+                 lock_file: Optional[Path] = None, cache: Optional[MappingCache] = None,
+                 snapshot: Optional[Path] = None, pipeline_stages: Union[int, str] = 0):
+        self.yaml_path = Path(yaml_path).resolve()
+        self.output_dir = output_dir
+        self.template_dir = Path(template_dir).resolve()
+        self.lock_file = lock_file
+        self.cache = cache
+        self.snapshot = snapshot
+        self.pipeline_stages = pipeline_stages
+        self.jinja_env = create_jinja_env(self.template_dir, template_cache_dir(cache))
+        self._yaml_data: Optional[bytes] = None
+        self._spec: Optional[Dict[str, Any]] = None
+        self._package = None
+        self._context: Optional[Dict[str, Any]] = None
+        self._driver_context: Optional[Dict[str, Any]] = None
+        self._extra_outputs: Dict[str, Optional[str]] = {}
+
+    def is_relevant(self, path: Path) -> bool:
+        """True for the spec file and the templates."""
+        path = Path(path)
+        return path == self.yaml_path or (path.parent == self.template_dir and path.suffix == '.j2')
+
+    @property
+    def directories(self) -> List[Path]:
+        """Directories holding the watched files."""
+        return sorted({self.yaml_path.parent, self.template_dir})
+
+    def regenerate(self, changed: Optional[Set[Path]] = None) -> List[str]:
+        """
+        Re-run the stages affected by the changed paths (all stages if None
+        or on the first call). On error the previous state is kept.
+
+        Returns:
+            Stages run, a subset of ['load', 'map', 'render']
+        """
+        stages = []
+        yaml_data, spec = self._yaml_data, self._spec
+        package, context, driver_context = self._package, self._context, self._driver_context
+        extra_outputs = self._extra_outputs
+
+        if package is None or changed is None or self.yaml_path in changed:
+            data = self.yaml_path.read_bytes()
+            if data != yaml_data:
+                yaml_data = data
+                stages.append('load')
+                new_spec = load_yaml_spec(self.yaml_path)
+                if new_spec != spec:
+                    spec = new_spec
+                    stages.append('map')
+                    if spec['platform'] not in PLATFORM_MAP:
+                        raise ValueError(f"Unknown platform: {spec['platform']}")
+                    package = create_register_package(spec)
+                    previous = load_lock_file(self.lock_file) if self.lock_file is not None else None
+                    platform_info = PLATFORM_MAP[spec['platform']]
+                    context = pipeline_context(
+                        prepare_template_context(package, self.yaml_path, platform_info,
+                                                 previous=previous, cache=self.cache),
+                        resolve_pipeline_stages(self.pipeline_stages, platform_info))
+                    driver_context = prepare_driver_context(package, context)
+                    snapshot_hash = write_lock_and_snapshot(package, context, self.lock_file, self.snapshot,
+                                                            previous, self.cache)
+                    extra_outputs = ({os.path.relpath(self.snapshot, self.output_dir): snapshot_hash}
+                                     if self.snapshot is not None else {})
+
+        outputs = render_outputs(self.jinja_env, package, context, self.output_dir, driver_context, verbose=False)
+        stages.append('render')
+        outputs.update(extra_outputs)
+        write_manifest(self.output_dir, input_hashes(self.yaml_path, self.template_dir, self.lock_file,
+                                                     self.snapshot, pipeline_stages=self.pipeline_stages), outputs)
+
+        self._yaml_data, self._spec = yaml_data, spec
+        self._package, self._context, self._driver_context = package, context, driver_context
+        self._extra_outputs = extra_outputs
+        return stages
+
+
+def watch(yaml_path: Path, output_dir: Path, template_dir: Path,
+          lock_file: Optional[Path] = None, cache: Optional[MappingCache] = None,
+          snapshot: Optional[Path] = None, debounce: float = DEFAULT_DEBOUNCE,
+          poll: bool = False, pipeline_stages: Union[int, str] = 0) -> None:
+    """Regenerate on every (debounced) change of the spec or templates until interrupted."""
+    session = WatchSession(yaml_path, output_dir, template_dir, lock_file, cache, snapshot, pipeline_stages)
+    watcher = create_watcher(session.directories, session.is_relevant, poll=poll)
+    kind = 'polling' if isinstance(watcher, PollingWatcher) else 'inotify'
+    print(f"Watching {session.yaml_path} and {session.template_dir}/*.j2 ({kind}); Ctrl-C to stop")
+
+    changed: Optional[Set[Path]] = None
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                stages = session.regenerate(changed)
+            except Exception as e:
+                print(f"[{time.strftime('%H:%M:%S')}] ❌ {type(e).__name__}: {e} (keeping last good output)")
+            else:
+                names = 'initial' if changed is None else ', '.join(sorted(p.name for p in changed))
+                print(f"[{time.strftime('%H:%M:%S')}] {names}: {' → '.join(stages)} "
+                      f"({(time.perf_counter() - start) * 1000:.1f} ms) -> {output_dir}/")
+            changed = wait_for_changes(watcher, debounce)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        watcher.close()
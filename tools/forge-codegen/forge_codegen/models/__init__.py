@@ -1,9 +1,19 @@
 """Data models for custom instrument specifications."""
 
-from forge.models.app_spec import CustomInstrumentApp
-from forge.models.register import AppRegister, RegisterType
-from forge.models.package import BasicAppsRegPackage, DataTypeSpec
-from forge.models.mapper import RegisterMapper, RegisterMapping
+import importlib
+
+# Name -> defining submodule. Models are imported on first access (PEP 562),
+# so importing one submodule does not pull in every model (and pydantic
+# schema building for all of them).
+_EXPORTS = {
+    "CustomInstrumentApp": "app_spec",
+    "AppRegister": "register",
+    "RegisterType": "register",
+    "BasicAppsRegPackage": "package",
+    "DataTypeSpec": "package",
+    "RegisterMapper": "mapper",
+    "RegisterMapping": "mapper",
+}
 
 __all__ = [
     "CustomInstrumentApp",
@@ -14,3 +24,15 @@ __all__ = [
     "RegisterMapper",
     "RegisterMapping",
 ]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -21,6 +21,7 @@ Usage:
 """
 
 import re
+from collections import Counter
 import yaml
 from datetime import datetime
 from pathlib import Path
@@ -96,7 +97,7 @@ class CustomInstrumentApp(BaseModel):
         """Validate no duplicate CR numbers."""
         cr_numbers = [reg.cr_number for reg in self.registers]
         if len(cr_numbers) != len(set(cr_numbers)):
-            duplicates = [cr for cr in cr_numbers if cr_numbers.count(cr) > 1]
+            duplicates = [cr for cr, count in Counter(cr_numbers).items() if count > 1]
             raise ValueError(f"Duplicate CR numbers found: {set(duplicates)}")
         return self
 
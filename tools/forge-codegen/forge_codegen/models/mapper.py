@@ -15,7 +15,8 @@ Design References:
 - Spec: docs/BasicAppDataTypes/BAD_Phase2_RegisterMapping.md
 """
 
-from typing import List, Optional, Literal
+from collections import Counter
+from typing import Any, Dict, List, Optional, Literal, Tuple
 from pydantic import BaseModel, Field, field_validator, model_validator
 from pathlib import Path
 import json
@@ -25,7 +26,11 @@ from forge_codegen.basic_serialized_datatypes import (
     BasicAppDataTypes,
     RegisterMapper,
     RegisterMapping,
+    MappingCache,
+    GEOMETRY_PROFILES,
+    get_geometry,
     MappingReport,
+    StrategyComparison,
     TYPE_REGISTRY,
 )
 
@@ -33,6 +38,46 @@ from forge_codegen.basic_serialized_datatypes import (
 from .register import AppRegister
 
 
+def parse_control_register(value: Any) -> Optional[int]:
+    """Parse a pinned control register ('CR7', 'cr7' or 7) to its number."""
+    if value is None or isinstance(value, int):
+        return value
+    text = str(value).strip()
+    if text[:2].upper() == "CR":
+        text = text[2:]
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"Invalid control_register: {value!r} (expected e.g. 'CR7' or 7)") from None
+
+
+def parse_bit_range(value: Any) -> Optional[Tuple[int, int]]:
+    """Parse a pinned bit range ('[15:0]', '[3]', '15:0', [15, 0] or 3) to (msb, lsb)."""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return (value, value)
+    if isinstance(value, (list, tuple)):
+        parts = list(value)
+    else:
+        parts = str(value).strip().strip("[]").split(":")
+    try:
+        bits = [int(part) for part in parts]
+    except ValueError:
+        raise ValueError(f"Invalid bit_range: {value!r} (expected e.g. '[15:0]' or '[3]')") from None
+    if len(bits) == 1:
+        return (bits[0], bits[0])
+    if len(bits) == 2:
+        return (bits[0], bits[1])
+    raise ValueError(f"Invalid bit_range: {value!r} (expected e.g. '[15:0]' or '[3]')")
+
+
+def format_bit_range(bit_range: Tuple[int, int]) -> str:
+    """Format (msb, lsb) in YAML notation ('[15:0]' or '[3]')."""
+    msb, lsb = bit_range
+    return f"[{msb}]" if msb == lsb else f"[{msb}:{lsb}]"
+
+
 class BADRegisterConfig(BaseModel):
     """
     Pydantic model for BAD register configuration in YAML.
@@ -45,6 +90,11 @@ class BADRegisterConfig(BaseModel):
         datatype: BasicAppDataTypes enum value
         description: Human-readable description
         default_value: Optional default value (must match type constraints)
+        update_rate: Optional probability (0-1) that the value changes between
+                     consecutive updates (hint for 'update_frequency' packing)
+        control_register: Optional pinned CR number ('CR7' or 7 in YAML)
+        bit_range: Optional pinned (msb, lsb) ('[15:0]' or '[3]' in YAML);
+                   required together with control_register
 
     Example YAML:
         registers:
@@ -77,6 +127,39 @@ class BADRegisterConfig(BaseModel):
         default=None,
         description="Default value (must match type constraints)"
     )
+    update_rate: Optional[float] = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="Probability the value changes between updates"
+    )
+    control_register: Optional[int] = Field(
+        default=None,
+        description="Pinned control register number (auto-packed if omitted)"
+    )
+    bit_range: Optional[Tuple[int, int]] = Field(
+        default=None,
+        description="Pinned (msb, lsb) within control_register"
+    )
+
+    @field_validator('control_register', mode='before')
+    @classmethod
+    def parse_control_register(cls, v: Any) -> Optional[int]:
+        """Accept 'CR7' style register names."""
+        return parse_control_register(v)
+
+    @field_validator('bit_range', mode='before')
+    @classmethod
+    def parse_bit_range(cls, v: Any) -> Optional[Tuple[int, int]]:
+        """Accept '[15:0]' / '[3]' style bit ranges."""
+        return parse_bit_range(v)
+
+    @model_validator(mode='after')
+    def validate_pin(self) -> 'BADRegisterConfig':
+        """Validate control_register and bit_range are given together."""
+        if (self.control_register is None) != (self.bit_range is None):
+            raise ValueError(f"'{self.name}': control_register and bit_range must be given together")
+        return self
 
     @field_validator('name')
     @classmethod
@@ -139,7 +222,9 @@ class BADRegisterMapper(BaseModel):
 
     Attributes:
         registers: List of BADRegisterConfig objects
-        strategy: Packing strategy ('first_fit', 'best_fit', 'type_clustering')
+        strategy: Packing strategy ('first_fit', 'best_fit', 'type_clustering', 'optimal',
+                  'update_frequency')
+        geometry: Register geometry profile ('basic_app', 'forge', 'cloud_compile')
 
     Example Usage:
         >>> from pathlib import Path
@@ -159,10 +244,21 @@ class BADRegisterMapper(BaseModel):
         min_length=1,
         description="List of register configurations"
     )
-    strategy: Literal["first_fit", "best_fit", "type_clustering"] = Field(
+    strategy: Literal["first_fit", "best_fit", "type_clustering", "optimal", "update_frequency"] = Field(
         default="best_fit",
         description="Packing strategy for register allocation"
     )
+    geometry: str = Field(
+        default="basic_app",
+        description=f"Register geometry profile ({', '.join(GEOMETRY_PROFILES)})"
+    )
+
+    @field_validator('geometry')
+    @classmethod
+    def validate_geometry(cls, v: str) -> str:
+        """Validate the geometry profile exists."""
+        get_geometry(v)
+        return v
 
     @field_validator('registers')
     @classmethod
@@ -170,14 +266,24 @@ class BADRegisterMapper(BaseModel):
         """Validate all register names are unique."""
         names = [r.name for r in v]
         if len(names) != len(set(names)):
-            duplicates = [name for name in names if names.count(name) > 1]
+            duplicates = [name for name, count in Counter(names).items() if count > 1]
             raise ValueError(f"Duplicate register names found: {set(duplicates)}")
         return v
 
-    def to_register_mappings(self) -> List[RegisterMapping]:
+    def core_mapper(self, cache: Optional[MappingCache] = None) -> RegisterMapper:
+        """Core RegisterMapper for this mapper's geometry profile."""
+        return RegisterMapper(geometry=get_geometry(self.geometry), cache=cache)
+
+    def to_register_mappings(self,
+                             previous: Optional[List[RegisterMapping]] = None,
+                             cache: Optional[MappingCache] = None) -> List[RegisterMapping]:
         """
         Apply core mapping algorithm.
 
+        Args:
+            previous: Previous mapping (lock); unchanged fields keep their slots
+            cache: Optional on-disk MappingCache to reuse earlier results
+
         Returns:
             List of RegisterMapping objects with CR assignments
 
@@ -185,22 +291,62 @@ class BADRegisterMapper(BaseModel):
             ValueError: If mapping fails (overflow, invalid types, etc.)
         """
         # Convert to core mapper format
-        mapper = RegisterMapper()
+        mapper = self.core_mapper(cache)
         items = [(r.name, r.datatype) for r in self.registers]
 
         # Apply mapping algorithm
-        return mapper.map(items, strategy=self.strategy)
+        return mapper.map(items, strategy=self.strategy, update_rates=self.update_rates(),
+                          previous=previous, pins=self.pins())
+
+    def update_rates(self) -> Optional[Dict[str, float]]:
+        """
+        Collect update-rate hints.
+
+        Returns:
+            Dictionary mapping register name → update rate, or None if no
+            register has a hint
+        """
+        rates = {r.name: r.update_rate for r in self.registers if r.update_rate is not None}
+        return rates or None
+
+    def pins(self) -> Optional[Dict[str, Tuple[int, Tuple[int, int]]]]:
+        """
+        Collect pinned placements.
+
+        Returns:
+            Dictionary mapping register name → (cr_number, (msb, lsb)), or
+            None if no register is pinned
+        """
+        pins = {
+            r.name: (r.control_register, r.bit_range)
+            for r in self.registers if r.control_register is not None
+        }
+        return pins or None
 
-    def generate_report(self) -> MappingReport:
+    def generate_report(self, previous: Optional[List[RegisterMapping]] = None) -> MappingReport:
         """
         Generate detailed mapping report.
 
+        Args:
+            previous: Previous mapping (lock); unchanged fields keep their slots
+
         Returns:
             MappingReport with visualizations and statistics
         """
-        mappings = self.to_register_mappings()
-        mapper = RegisterMapper()
-        return mapper.generate_report(mappings)
+        mappings = self.to_register_mappings(previous)
+        mapper = self.core_mapper()
+        return mapper.generate_report(mappings, update_rates=self.update_rates())
+
+    def compare_strategies(self) -> StrategyComparison:
+        """
+        Compare registers used by each heuristic strategy against optimal packing.
+
+        Returns:
+            StrategyComparison (use .summary() or .gap)
+        """
+        mapper = self.core_mapper()
+        items = [(r.name, r.datatype) for r in self.registers]
+        return mapper.compare_strategies(items)
 
     def save_report(self, output_dir: Path, formats: Optional[List[str]] = None) -> None:
         """
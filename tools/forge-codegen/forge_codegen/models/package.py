@@ -13,7 +13,15 @@ Design:
 - Integrates with moku-models via to_control_registers()
 """
 
-from typing import List, Optional, Literal, Union
+import hashlib
+import marshal
+import os
+import struct
+import sys
+import tempfile
+from collections import Counter
+from functools import lru_cache
+from typing import List, Optional, Literal, Union, Dict, Sequence, Mapping, Any, Tuple
 from pathlib import Path
 from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict, PrivateAttr
 import yaml
@@ -23,9 +31,32 @@ from forge_codegen.basic_serialized_datatypes import (
     TYPE_REGISTRY,
     RegisterMapper,
     RegisterMapping,
+    RegisterCodec,
+    DeltaPlanner,
     TypeConverter,
+    MappingCache,
+    GEOMETRY_PROFILES,
+    default_cache_dir,
+    get_geometry,
+)
+from forge_codegen.basic_serialized_datatypes.binary import (
+    SECTION_CODEC,
+    SECTION_MAPPING,
+    SECTION_PACKAGE,
+    BinaryReader,
+    BinaryWriter,
+    decode_codec,
+    decode_report,
+    dump_snapshot,
+    unpack_sections,
+)
+from .mapper import (
+    BADRegisterMapper,
+    BADRegisterConfig,
+    format_bit_range,
+    parse_bit_range,
+    parse_control_register,
 )
-from .mapper import BADRegisterMapper, BADRegisterConfig
 
 
 class DataTypeSpec(BaseModel):
@@ -46,6 +77,14 @@ class DataTypeSpec(BaseModel):
         display_name: Human-friendly name for UI (e.g., "Intensity (mV)")
         units: Physical units (e.g., "mV", "ms", "ns")
 
+        # Packing hint
+        update_rate: Probability (0-1) that the value changes between
+                     consecutive updates (e.g., 1.0 = every shot)
+
+        # Pinned placement (optional; other fields are auto-packed around it)
+        control_register: CR number ('CR7' or 7 in YAML)
+        bit_range: (msb, lsb) within the CR ('[15:0]' or '[3]' in YAML)
+
     Example:
         >>> dt = DataTypeSpec(
         ...     name="intensity",
@@ -98,6 +137,36 @@ class DataTypeSpec(BaseModel):
         description="Physical units (e.g., 'mV', 'ms', 'ns')"
     )
 
+    # Packing hint (optional)
+    update_rate: Optional[float] = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="Probability the value changes between updates (for 'update_frequency' packing)"
+    )
+
+    # Pinned placement (optional)
+    control_register: Optional[int] = Field(
+        default=None,
+        description="Pinned control register number (auto-packed if omitted)"
+    )
+    bit_range: Optional[Tuple[int, int]] = Field(
+        default=None,
+        description="Pinned (msb, lsb) within control_register"
+    )
+
+    @field_validator('control_register', mode='before')
+    @classmethod
+    def parse_control_register(cls, v: Any) -> Optional[int]:
+        """Accept 'CR7' style register names."""
+        return parse_control_register(v)
+
+    @field_validator('bit_range', mode='before')
+    @classmethod
+    def parse_bit_range(cls, v: Any) -> Optional[Tuple[int, int]]:
+        """Accept '[15:0]' / '[3]' style bit ranges."""
+        return parse_bit_range(v)
+
     @field_validator('name')
     @classmethod
     def validate_name(cls, v: str) -> str:
@@ -157,6 +226,13 @@ class DataTypeSpec(BaseModel):
 
         return self
 
+    @model_validator(mode='after')
+    def validate_pin(self) -> 'DataTypeSpec':
+        """Validate control_register and bit_range are given together."""
+        if (self.control_register is None) != (self.bit_range is None):
+            raise ValueError(f"'{self.name}': control_register and bit_range must be given together")
+        return self
+
     @model_validator(mode='after')
     def validate_min_max_range(self) -> 'DataTypeSpec':
         """Validate min_value <= max_value and within type limits."""
@@ -191,14 +267,25 @@ class DataTypeSpec(BaseModel):
         """Get bit width from type registry."""
         return TYPE_REGISTRY[self.datatype].bit_width
 
-    def to_bad_register_config(self) -> BADRegisterConfig:
-        """Convert to Phase 2 BADRegisterConfig (for mapper integration)."""
-        return BADRegisterConfig(
+    def to_bad_register_config(self, trusted: bool = False) -> BADRegisterConfig:
+        """
+        Convert to Phase 2 BADRegisterConfig (for mapper integration).
+
+        Args:
+            trusted: Skip revalidation (this spec was already validated)
+        """
+        fields = dict(
             name=self.name,
             datatype=self.datatype,
             description=self.description,
-            default_value=self.default_value
+            default_value=self.default_value,
+            update_rate=self.update_rate,
+            control_register=self.control_register,
+            bit_range=self.bit_range
         )
+        if trusted:
+            return BADRegisterConfig.model_construct(**fields)
+        return BADRegisterConfig(**fields)
 
 
 class BasicAppsRegPackage(BaseModel):
@@ -214,6 +301,7 @@ class BasicAppsRegPackage(BaseModel):
         description: Human-readable description
         datatypes: List of DataTypeSpec objects
         mapping_strategy: Packing strategy for register allocation
+        register_geometry: Register geometry profile (CR range and width)
 
     Integration:
         - Uses BADRegisterMapper (Phase 2) for actual mapping
@@ -258,13 +346,19 @@ class BasicAppsRegPackage(BaseModel):
         min_length=1,
         description="List of register data type specifications"
     )
-    mapping_strategy: Literal["first_fit", "best_fit", "type_clustering"] = Field(
+    mapping_strategy: Literal["first_fit", "best_fit", "type_clustering", "optimal", "update_frequency"] = Field(
         default="best_fit",
         description="Register packing strategy"
     )
+    register_geometry: str = Field(
+        default="basic_app",
+        description=f"Register geometry profile ({', '.join(GEOMETRY_PROFILES)})"
+    )
 
     # Internal cache (not serialized) - use PrivateAttr for Pydantic v2
     _mapping_cache: Optional[List[RegisterMapping]] = PrivateAttr(default=None)
+    _codec_cache: Optional[RegisterCodec] = PrivateAttr(default=None)
+    _trusted: bool = PrivateAttr(default=False)  # loaded from a trusted snapshot
 
     @field_validator('datatypes')
     @classmethod
@@ -272,40 +366,120 @@ class BasicAppsRegPackage(BaseModel):
         """Validate all datatype names are unique."""
         names = [dt.name for dt in v]
         if len(names) != len(set(names)):
-            duplicates = [name for name in names if names.count(name) > 1]
+            duplicates = [name for name, count in Counter(names).items() if count > 1]
             raise ValueError(f"Duplicate datatype names found: {set(duplicates)}")
         return v
 
+    @field_validator('register_geometry')
+    @classmethod
+    def validate_register_geometry(cls, v: str) -> str:
+        """Validate the geometry profile exists."""
+        get_geometry(v)
+        return v
+
     @model_validator(mode='after')
     def validate_total_bits(self) -> 'BasicAppsRegPackage':
-        """Validate total bits fit in 384-bit limit (12 registers × 32 bits)."""
+        """Validate total bits fit in the geometry (384 bits = 12 registers × 32 bits by default)."""
+        geometry = get_geometry(self.register_geometry)
         total_bits = sum(dt.get_bit_width() for dt in self.datatypes)
-        if total_bits > 384:
+        if total_bits > geometry.total_bits:
             raise ValueError(
-                f"Total bits ({total_bits}) exceeds 384-bit limit "
-                f"(12 registers × 32 bits)"
+                f"Total bits ({total_bits}) exceeds {geometry.total_bits}-bit limit "
+                f"({geometry.register_count} registers × {geometry.bits_per_register} bits)"
             )
         return self
 
-    def generate_mapping(self) -> List[RegisterMapping]:
+    def generate_mapping(self,
+                         previous: Optional[List[RegisterMapping]] = None,
+                         cache: Optional[MappingCache] = None) -> List[RegisterMapping]:
         """
         Generate register mapping using Phase 2 mapper.
 
+        Args:
+            previous: Previous mapping (lock, e.g. MappingReport.from_json(...).mappings).
+                      Unchanged fields keep their slots; replaces the cached mapping.
+            cache: Optional on-disk MappingCache shared across processes
+                   (e.g. MappingCache() for the default directory)
+
         Returns:
             List of RegisterMapping objects with CR assignments
 
         Caches result to avoid recomputation.
         """
-        if self._mapping_cache is None:
-            # Convert to BADRegisterMapper format
-            mapper = BADRegisterMapper(
-                registers=[dt.to_bad_register_config() for dt in self.datatypes],
-                strategy=self.mapping_strategy
+        if self._mapping_cache is None or previous is not None:
+            # Convert to BADRegisterMapper format (snapshots were validated when written)
+            fields = dict(
+                registers=[dt.to_bad_register_config(trusted=self._trusted) for dt in self.datatypes],
+                strategy=self.mapping_strategy,
+                geometry=self.register_geometry
             )
-            self._mapping_cache = mapper.to_register_mappings()
+            if self._trusted:
+                mapper = BADRegisterMapper.model_construct(**fields)
+            else:
+                mapper = BADRegisterMapper(**fields)
+            self._mapping_cache = mapper.to_register_mappings(previous, cache=cache)
+            self._codec_cache = None
 
         return self._mapping_cache
 
+    def codec(self) -> RegisterCodec:
+        """
+        Get register codec for this package's mapping.
+
+        Returns:
+            RegisterCodec that packs typed values into CR words and back
+
+        Caches result to avoid recomputation.
+        """
+        if self._codec_cache is None:
+            self._codec_cache = RegisterCodec(self.generate_mapping())
+
+        return self._codec_cache
+
+    def decode_control_registers(
+        self,
+        snapshots: Union[Sequence[Mapping[int, int]], Any]
+    ) -> Dict[str, Sequence]:
+        """
+        Decode logged CR snapshots into typed columns (inverse of to_control_registers).
+
+        Args:
+            snapshots: Sequence of CR number -> word dictionaries (e.g., the
+                       control_registers section of moku_read.py output), or a
+                       2-D numpy array with one column per codec CR
+
+        Returns:
+            Dictionary mapping datatype name → column of typed values
+            (mV for voltages, declared unit for times, bool for booleans)
+
+        Example:
+            >>> columns = package.decode_control_registers(snapshots)
+            >>> columns['intensity'].mean()
+        """
+        return self.codec().decode_batch(snapshots)
+
+    def plan_delta(
+        self,
+        previous: Mapping[str, Union[int, bool]],
+        current: Mapping[str, Union[int, bool]]
+    ) -> Dict[int, int]:
+        """
+        Plan the minimal CR writes between two parameter sets.
+
+        Args:
+            previous: Parameter set currently on the device
+            current: Parameter set to apply (fields not given keep `previous`)
+
+        Returns:
+            Dictionary mapping CR number → 32-bit word, only for registers
+            whose value changes
+
+        Example:
+            >>> package.plan_delta({'intensity': 2400}, {'intensity': 2500})
+            {6: 0x3FFF0000}
+        """
+        return DeltaPlanner(self.codec()).plan(previous, current)
+
     def _convert_to_raw(self, dt_spec: DataTypeSpec) -> int:
         """
         Convert typed value to raw bits based on datatype category.
@@ -363,20 +537,22 @@ class BasicAppsRegPackage(BaseModel):
                 # Convert typed value to raw bits
                 raw_value = self._convert_to_raw(dt_spec)
 
-                # Initialize CR if not present
-                if mapping.cr_number not in result:
-                    result[mapping.cr_number] = 0
+                # Spanning fields: one slice per CR, most significant first
+                offset = mapping.bit_width()
+                for cr_number, msb, lsb in mapping.parts():
+                    # Initialize CR if not present
+                    if cr_number not in result:
+                        result[cr_number] = 0
 
-                # Shift raw value to correct bit position and OR into register
-                msb, lsb = mapping.bit_slice
-                bit_width = msb - lsb + 1
+                    bit_width = msb - lsb + 1
+                    offset -= bit_width
 
-                # Mask raw value to bit width
-                mask = (1 << bit_width) - 1
-                raw_value &= mask
+                    # Mask this slice of the raw value to its bit width
+                    mask = (1 << bit_width) - 1
+                    part = (raw_value >> offset) & mask
 
-                # Shift and pack
-                result[mapping.cr_number] |= (raw_value << lsb)
+                    # Shift and pack
+                    result[cr_number] |= (part << lsb)
 
         return result
 
@@ -405,8 +581,10 @@ class BasicAppsRegPackage(BaseModel):
             'app_name': self.app_name,
             'description': self.description,
             'mapping_strategy': self.mapping_strategy,
-            'datatypes': []
         }
+        if self.register_geometry != 'basic_app':
+            data['register_geometry'] = self.register_geometry
+        data['datatypes'] = []
 
         for dt in self.datatypes:
             dt_dict = {
@@ -425,6 +603,11 @@ class BasicAppsRegPackage(BaseModel):
                 dt_dict['display_name'] = dt.display_name
             if dt.units is not None:
                 dt_dict['units'] = dt.units
+            if dt.update_rate is not None:
+                dt_dict['update_rate'] = dt.update_rate
+            if dt.control_register is not None:
+                dt_dict['control_register'] = f"CR{dt.control_register}"
+                dt_dict['bit_range'] = format_bit_range(dt.bit_range)
 
             data['datatypes'].append(dt_dict)
 
@@ -444,7 +627,11 @@ class BasicAppsRegPackage(BaseModel):
         """
         with open(path) as f:
             data = yaml.safe_load(f)
+        return cls._from_yaml_data(data)
 
+    @classmethod
+    def _from_yaml_data(cls, data: Dict[str, Any]) -> 'BasicAppsRegPackage':
+        """Build (and fully validate) a package from parsed YAML."""
         # Parse datatypes
         datatypes = []
         for dt_dict in data.get('datatypes', []):
@@ -457,11 +644,210 @@ class BasicAppsRegPackage(BaseModel):
                 max_value=dt_dict.get('max_value'),
                 display_name=dt_dict.get('display_name'),
                 units=dt_dict.get('units'),
+                update_rate=dt_dict.get('update_rate'),
+                control_register=dt_dict.get('control_register'),
+                bit_range=dt_dict.get('bit_range'),
             ))
 
         return cls(
             app_name=data['app_name'],
             description=data.get('description', ''),
             datatypes=datatypes,
-            mapping_strategy=data.get('mapping_strategy', 'best_fit')
+            mapping_strategy=data.get('mapping_strategy', 'best_fit'),
+            register_geometry=data.get('register_geometry', 'basic_app')
+        )
+
+    @classmethod
+    def from_yaml_trusted(cls, path: Path, snapshot_dir: Optional[Path] = None) -> 'BasicAppsRegPackage':
+        """
+        Load a YAML spec, validating it only the first time.
+
+        The validated package is saved as a binary snapshot keyed by the YAML
+        content hash; later loads of the same content read the snapshot with
+        model_construct (no validators). Snapshots written by a different
+        schema (see schema_hash()) are ignored and rewritten.
+
+        Args:
+            path: Input YAML file path
+            snapshot_dir: Snapshot directory (default: <mapping cache dir>/packages)
+
+        Returns:
+            BasicAppsRegPackage instance
+        """
+        content = Path(path).read_bytes()
+        directory = Path(snapshot_dir) if snapshot_dir is not None else default_cache_dir() / "packages"
+        snapshot = directory / f"{hashlib.sha256(content).hexdigest()}.pkg"
+
+        package = cls.load_snapshot(snapshot)
+        if package is None:
+            package = cls._from_yaml_data(yaml.safe_load(content))
+            try:
+                package.save_snapshot(snapshot)
+            except OSError:
+                pass  # Read-only cache: still correct, just not faster next time
+        return package
+
+    def save_snapshot(self, path: Path) -> None:
+        """
+        Write a trusted binary snapshot of this (validated) package.
+
+        Format: SNAPSHOT_MAGIC, schema_hash() digest, then a marshal payload
+        of plain field values in model field order. Written atomically.
+        """
+        spec_fields = list(DataTypeSpec.model_fields)
+        values = [getattr(self, name) for name in type(self).model_fields if name != 'datatypes']
+        rows = [
+            tuple(dt.datatype.value if name == 'datatype' else getattr(dt, name) for name in spec_fields)
+            for dt in self.datatypes
+        ]
+        data = SNAPSHOT_MAGIC + schema_hash() + marshal.dumps((values, rows))
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("wb", dir=path.parent, suffix=".tmp", delete=False) as f:
+            f.write(data)
+        os.replace(f.name, path)
+
+    @classmethod
+    def load_snapshot(cls, path: Path) -> Optional['BasicAppsRegPackage']:
+        """
+        Load a snapshot written by save_snapshot() without running validators.
+
+        Returns:
+            The package, or None if the file is missing, corrupt or was
+            written under a different schema
+        """
+        try:
+            data = Path(path).read_bytes()
+        except OSError:
+            return None
+        header = SNAPSHOT_MAGIC + schema_hash()
+        if not data.startswith(header):
+            return None
+
+        try:
+            values, rows = marshal.loads(data[len(header):])
+            spec_fields = list(DataTypeSpec.model_fields)
+            datatypes = []
+            for row in rows:
+                fields = dict(zip(spec_fields, row))
+                fields['datatype'] = BasicAppDataTypes(fields['datatype'])
+                datatypes.append(DataTypeSpec.model_construct(**fields))
+            package_fields = [name for name in cls.model_fields if name != 'datatypes']
+            package = cls.model_construct(datatypes=datatypes, **dict(zip(package_fields, values)))
+        except (EOFError, KeyError, TypeError, ValueError):
+            return None
+
+        package._trusted = True
+        return package
+
+    def to_binary(self) -> bytes:
+        """
+        Portable binary snapshot: package fields, mapping and compiled codec.
+
+        See basic_serialized_datatypes.binary for the format. Unlike
+        save_snapshot() it does not depend on the schema version, so it can
+        be shipped with generated code and read by deploy/campaign tools.
+        """
+        writer = BinaryWriter()
+        writer.string(self.app_name)
+        writer.string(self.description)
+        writer.string(self.mapping_strategy)
+        writer.string(self.register_geometry)
+        writer.u16(len(self.datatypes))
+        for dt in self.datatypes:
+            writer.string(dt.name)
+            writer.string(dt.datatype.value)
+            writer.string(dt.description)
+            writer.scalar(dt.default_value)
+            writer.scalar(dt.min_value)
+            writer.scalar(dt.max_value)
+            writer.optional_string(dt.display_name)
+            writer.optional_string(dt.units)
+            writer.scalar(dt.update_rate)
+            writer.scalar(dt.control_register)
+            writer.scalar(dt.bit_range and dt.bit_range[0])
+            writer.scalar(dt.bit_range and dt.bit_range[1])
+
+        rates = {dt.name: dt.update_rate for dt in self.datatypes if dt.update_rate is not None}
+        report = RegisterMapper(geometry=get_geometry(self.register_geometry)).generate_report(
+            self.generate_mapping(), update_rates=rates or None
+        )
+        return dump_snapshot(report, self.codec(), extra={SECTION_PACKAGE: bytes(writer.buffer)})
+
+    @classmethod
+    def from_binary(cls, data: bytes) -> 'BasicAppsRegPackage':
+        """
+        Load a to_binary() snapshot without validation, mapping or codec compilation.
+
+        Raises:
+            ValueError: If the data is not a (supported) snapshot
+        """
+        sections = unpack_sections(data)
+        missing = {SECTION_PACKAGE, SECTION_MAPPING, SECTION_CODEC} - sections.keys()
+        if missing:
+            raise ValueError(f"Snapshot is missing sections: {sorted(tag.decode() for tag in missing)}")
+
+        reader = BinaryReader(sections[SECTION_PACKAGE])
+        try:
+            app_name = reader.string()
+            description = reader.string()
+            mapping_strategy = reader.string()
+            register_geometry = reader.string()
+            datatypes = []
+            for _ in range(reader.u16()):
+                fields = dict(
+                    name=reader.string(),
+                    datatype=BasicAppDataTypes(reader.string()),
+                    description=reader.string(),
+                    default_value=reader.scalar(),
+                    min_value=reader.scalar(),
+                    max_value=reader.scalar(),
+                    display_name=reader.optional_string(),
+                    units=reader.optional_string(),
+                    update_rate=reader.scalar(),
+                    control_register=reader.scalar(),
+                )
+                msb, lsb = reader.scalar(), reader.scalar()
+                fields['bit_range'] = None if msb is None else (msb, lsb)
+                datatypes.append(DataTypeSpec.model_construct(**fields))
+            mappings = decode_report(sections[SECTION_MAPPING]).mappings
+            codec = decode_codec(sections[SECTION_CODEC])
+        except struct.error as e:
+            raise ValueError(f"Corrupt snapshot: {e}") from e
+
+        package = cls.model_construct(
+            app_name=app_name,
+            description=description,
+            datatypes=datatypes,
+            mapping_strategy=mapping_strategy,
+            register_geometry=register_geometry
         )
+        package._trusted = True
+        package._mapping_cache = mappings
+        package._codec_cache = codec
+        return package
+
+
+SNAPSHOT_MAGIC = b"FGPKG\x01"
+
+
+@lru_cache(maxsize=None)
+def schema_hash() -> bytes:
+    """
+    Digest of everything package validation depends on.
+
+    Covers the model sources (fields and validators), field annotations,
+    TYPE_REGISTRY limits and geometry capacities. Trusted snapshots are
+    only loaded when their stored digest matches.
+    """
+    digest = hashlib.sha256()
+    for module_name in (__name__, BADRegisterConfig.__module__):
+        digest.update(Path(sys.modules[module_name].__file__).read_bytes())
+    for model in (BasicAppsRegPackage, DataTypeSpec):
+        digest.update(repr([(name, repr(f.annotation)) for name, f in model.model_fields.items()]).encode())
+    for dtype, metadata in TYPE_REGISTRY.items():
+        digest.update(repr((dtype.value, metadata.bit_width, metadata.min_value, metadata.max_value)).encode())
+    for name, geometry in sorted(GEOMETRY_PROFILES.items()):
+        digest.update(repr((name, geometry.first_cr, geometry.last_cr, geometry.bits_per_register)).encode())
+    return digest.digest()
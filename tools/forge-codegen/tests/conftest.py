@@ -0,0 +1,33 @@
+"""
+Shared pytest fixtures.
+
+The whole session shares one throwaway mapping cache directory (via
+FORGE_CODEGEN_CACHE_DIR), so tests never touch the user's cache but still
+exercise the same cache code paths as codegen and the deploy scripts.
+"""
+
+import os
+
+import pytest
+
+from forge_codegen.basic_serialized_datatypes import MappingCache
+from forge_codegen.basic_serialized_datatypes.cache import CACHE_DIR_ENV
+
+
+@pytest.fixture(scope="session", autouse=True)
+def session_cache_dir(tmp_path_factory):
+    """Point the default mapping cache at a per-session directory."""
+    directory = tmp_path_factory.mktemp("mapping-cache")
+    saved = os.environ.get(CACHE_DIR_ENV)
+    os.environ[CACHE_DIR_ENV] = str(directory)
+    yield directory
+    if saved is None:
+        os.environ.pop(CACHE_DIR_ENV, None)
+    else:
+        os.environ[CACHE_DIR_ENV] = saved
+
+
+@pytest.fixture
+def mapping_cache(tmp_path):
+    """Empty MappingCache private to one test."""
+    return MappingCache(tmp_path / "cache")
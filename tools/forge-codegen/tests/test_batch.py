@@ -0,0 +1,102 @@
+"""
+Tests for batch code generation over many app specs.
+"""
+
+import json
+from pathlib import Path
+
+from forge_codegen.generator.batch import (
+    BATCH_SUMMARY_NAME,
+    build_dependency_graph,
+    discover_specs,
+    generate_batch,
+)
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "forge_codegen" / "templates"
+
+SPEC = """
+app_name: "{name}"
+platform: "moku_go"
+datatypes:
+  - name: "intensity"
+    datatype: "voltage_output_05v_s16"
+  - name: "arm"
+    datatype: "boolean"
+"""
+
+TYPES_PKG = """
+library IEEE;
+use IEEE.std_logic_1164.all;
+use work.basic_app_voltage_pkg.all;
+
+package basic_app_types_pkg is
+end package basic_app_types_pkg;
+
+package body basic_app_types_pkg is
+end package body basic_app_types_pkg;
+"""
+
+VOLTAGE_PKG = """
+package basic_app_voltage_pkg is
+end package;
+"""
+
+
+def make_repo(root: Path) -> None:
+    """Two apps, a spec sharing an app_name, a deployment config and type packages."""
+    (root / "apps" / "alpha").mkdir(parents=True)
+    (root / "apps" / "beta").mkdir(parents=True)
+    (root / "apps" / "alpha" / "alpha.yaml").write_text(SPEC.format(name="Alpha"))
+    (root / "apps" / "beta" / "beta.yaml").write_text(SPEC.format(name="Beta"))
+    (root / "apps" / "beta" / "beta_v2.yaml").write_text(SPEC.format(name="Beta"))
+    (root / "deploy.yaml").write_text("platform: moku_go\nslots: {}\n")
+    (root / "vhdl").mkdir()
+    (root / "vhdl" / "basic_app_types_pkg.vhd").write_text(TYPES_PKG)
+    (root / "vhdl" / "basic_app_voltage_pkg.vhd").write_text(VOLTAGE_PKG)
+
+
+class TestBatchGeneration:
+    """Test spec discovery, the dependency graph and stale-only regeneration."""
+
+    def test_dependency_graph(self, tmp_path):
+        """Test specs are discovered and depend on the type packages the templates use, transitively."""
+        make_repo(tmp_path)
+        specs = discover_specs(tmp_path)
+        assert [p.name for p in specs] == ["alpha.yaml", "beta.yaml", "beta_v2.yaml"]
+
+        graph = build_dependency_graph(specs, tmp_path / "generated", TEMPLATE_DIR, [tmp_path])
+        assert list(graph) == ["Alpha", "Beta-beta", "Beta-beta_v2"]
+        alpha = graph["Alpha"]
+        assert alpha.output_dir == tmp_path / "generated" / "Alpha"
+        assert {p.name for p in alpha.templates} == {"shim.vhd.j2", "main.vhd.j2", "driver.py.j2", "cocotb.py.j2"}
+        assert [p.name for p in alpha.type_packages] == ["basic_app_types_pkg.vhd", "basic_app_voltage_pkg.vhd"]
+
+    def test_regenerates_only_stale_apps(self, tmp_path, mapping_cache):
+        """Test reruns skip up-to-date apps, and spec/type package edits invalidate the right apps."""
+        make_repo(tmp_path)
+        out = tmp_path / "generated"
+        (tmp_path / "apps" / "beta" / "beta_v2.yaml").write_text("app_name: Beta\ndatatypes: [")
+
+        def run(jobs=1):
+            graph = build_dependency_graph(discover_specs(tmp_path, exclude=[out]), out, TEMPLATE_DIR, [tmp_path])
+            results = generate_batch(graph, out, TEMPLATE_DIR, cache=mapping_cache, jobs=jobs)
+            return {key: result.status for key, result in results.items()}
+
+        # A broken spec (keyed by its file name) fails without stopping the others
+        assert run(jobs=2) == {"Alpha": "generated", "Beta": "generated", "beta_v2": "failed"}
+        assert (out / "Alpha" / "Alpha_custom_inst_shim.vhd").exists()
+        summary = json.loads((out / BATCH_SUMMARY_NAME).read_text())
+        # Alpha and Beta map identically: whichever worker finishes second may hit the cache
+        assert "miss" in {summary["apps"][key]["mapping_cache"] for key in ("Alpha", "Beta")}
+        assert summary["apps"]["beta_v2"]["error"].startswith("ParserError")
+
+        (tmp_path / "apps" / "beta" / "beta_v2.yaml").unlink()
+        assert run() == {"Alpha": "up to date", "Beta": "up to date"}
+
+        alpha = tmp_path / "apps" / "alpha" / "alpha.yaml"
+        alpha.write_text(alpha.read_text().replace("moku_go", "moku_pro"))
+        assert run() == {"Alpha": "generated", "Beta": "up to date"}
+
+        (tmp_path / "vhdl" / "basic_app_voltage_pkg.vhd").write_text(VOLTAGE_PKG + "-- edited\n")
+        assert run() == {"Alpha": "generated", "Beta": "generated"}
+        assert run() == {"Alpha": "up to date", "Beta": "up to date"}
@@ -0,0 +1,103 @@
+"""
+Tests for the binary register interface snapshot format.
+"""
+
+import struct
+
+import pytest
+
+from forge_codegen.basic_serialized_datatypes import (
+    BasicAppDataTypes,
+    RegisterCodec,
+    RegisterMapper,
+    dump_snapshot,
+    get_geometry,
+    load_codec,
+    load_report,
+)
+from forge_codegen.basic_serialized_datatypes.binary import (
+    FORMAT_VERSION,
+    MAGIC,
+    pack_sections,
+    unpack_sections,
+)
+from forge_codegen.models.package import BasicAppsRegPackage, DataTypeSpec
+
+
+ITEMS = [
+    ("intensity", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16),
+    ("timeout", BasicAppDataTypes.PULSE_DURATION_NS_U48),
+    ("arm", BasicAppDataTypes.BOOLEAN),
+]
+
+
+def make_package() -> BasicAppsRegPackage:
+    return BasicAppsRegPackage(
+        app_name="SnapshotTest",
+        description="Binary snapshot fixture",
+        datatypes=[
+            DataTypeSpec(name="intensity", datatype=BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16,
+                         default_value=2400, min_value=0, max_value=4999.5, units="mV",
+                         display_name="Intensity", update_rate=0.9),
+            DataTypeSpec(name="timeout", datatype=BasicAppDataTypes.PULSE_DURATION_NS_U48),
+            DataTypeSpec(name="arm", datatype=BasicAppDataTypes.BOOLEAN, default_value=False,
+                         control_register="CR9", bit_range="[0]"),
+        ],
+        mapping_strategy="update_frequency",
+        register_geometry="forge"
+    )
+
+
+class TestBinarySnapshot:
+    """Test package/report/codec round trips and header handling."""
+
+    def test_report_round_trip(self):
+        """Test spanning mappings, rates and geometry survive the MAP section."""
+        mapper = RegisterMapper(geometry=get_geometry("forge"))
+        report = mapper.generate_report(mapper.map(ITEMS), update_rates={"arm": 0.5})
+        assert any(m.is_spanning for m in report.mappings)
+
+        loaded = load_report(dump_snapshot(report))
+        assert loaded.mappings == report.mappings
+        assert loaded.update_rates == report.update_rates
+        assert loaded.geometry == report.geometry
+        assert loaded.total_bits_available == report.total_bits_available
+
+    def test_codec_round_trip(self):
+        """Test the loaded codec has identical field layouts and encodes identically."""
+        mappings = RegisterMapper().map(ITEMS)
+        codec = RegisterCodec(mappings)
+        loaded = load_codec(dump_snapshot(RegisterMapper().generate_report(mappings)))
+
+        assert loaded.fields == codec.fields
+        assert loaded.cr_numbers == codec.cr_numbers
+        values = {"intensity": 1200, "timeout": 2 ** 40 + 7, "arm": True}
+        assert loaded.encode(values) == codec.encode(values)
+        assert loaded.decode(codec.encode(values)) == codec.decode(codec.encode(values))
+
+    def test_package_round_trip(self):
+        """Test from_binary restores fields and caches without recomputing the mapping."""
+        package = make_package()
+        loaded = BasicAppsRegPackage.from_binary(package.to_binary())
+
+        assert loaded.model_dump() == package.model_dump()
+        assert loaded._mapping_cache == package.generate_mapping()
+        assert loaded.codec().fields == package.codec().fields
+        assert loaded.to_control_registers() == package.to_control_registers()
+
+    def test_rejects_bad_magic_and_newer_version(self):
+        """Test foreign data and future format versions raise ValueError."""
+        data = make_package().to_binary()
+        with pytest.raises(ValueError, match="Not a register interface snapshot"):
+            load_codec(b"XXXX" + data[4:])
+        with pytest.raises(ValueError, match="newer than supported"):
+            load_codec(struct.pack("<4sHH", MAGIC, FORMAT_VERSION + 1, 0))
+        with pytest.raises(ValueError):
+            BasicAppsRegPackage.from_binary(data[:40])
+
+    def test_unknown_sections_are_ignored(self):
+        """Test readers skip sections they do not know."""
+        sections = {tag: bytes(payload) for tag, payload in unpack_sections(make_package().to_binary()).items()}
+        sections[b"XTRA"] = b"\x00" * 5
+        loaded = BasicAppsRegPackage.from_binary(pack_sections(sections))
+        assert loaded.app_name == "SnapshotTest"
@@ -0,0 +1,102 @@
+"""
+Tests for the persistent mapping cache (MappingCache).
+"""
+
+import os
+
+import pytest
+
+from forge_codegen.basic_serialized_datatypes import (
+    BasicAppDataTypes,
+    MappingCache,
+    RegisterMapper,
+    default_cache_dir,
+    get_geometry,
+)
+from forge_codegen.models.package import BasicAppsRegPackage, DataTypeSpec
+
+
+ITEMS = [
+    ("intensity", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16),
+    ("timeout", BasicAppDataTypes.PULSE_DURATION_NS_U48),
+    ("arm", BasicAppDataTypes.BOOLEAN),
+]
+
+
+class TestMappingCache:
+    """Test keys, hits, eviction and integration with the mapper."""
+
+    def test_hit_returns_identical_mapping(self, mapping_cache):
+        """Test a second mapper with the same inputs loads the stored result."""
+        first = RegisterMapper(cache=mapping_cache).map(ITEMS, strategy="optimal")
+        assert (mapping_cache.hits, mapping_cache.misses, len(mapping_cache)) == (0, 1, 1)
+
+        second = RegisterMapper(cache=mapping_cache).map(ITEMS, strategy="optimal")
+        assert second == first
+        assert mapping_cache.hits == 1
+
+    def test_key_covers_every_input(self):
+        """Test each mapping input changes the key and dict order does not."""
+        geometry = get_geometry("basic_app")
+        base = MappingCache.key(ITEMS, "best_fit", geometry)
+        variants = [
+            MappingCache.key(ITEMS[::-1], "best_fit", geometry),
+            MappingCache.key(ITEMS, "first_fit", geometry),
+            MappingCache.key(ITEMS, "best_fit", get_geometry("forge")),
+            MappingCache.key(ITEMS, "best_fit", geometry, update_rates={"arm": 0.5}),
+            MappingCache.key(ITEMS, "best_fit", geometry, pins={"arm": (6, (0, 0))}),
+            MappingCache.key(ITEMS, "best_fit", geometry, previous=[]),
+            MappingCache.key(ITEMS, "best_fit", geometry, time_budget=2.0),
+        ]
+        assert len({base, *variants}) == len(variants) + 1
+
+        rates = {"arm": 0.5, "intensity": 0.1}
+        assert (MappingCache.key(ITEMS, "best_fit", geometry, update_rates=rates)
+                == MappingCache.key(ITEMS, "best_fit", geometry, update_rates=dict(reversed(rates.items()))))
+
+    def test_lru_eviction(self, tmp_path):
+        """Test the least recently used entry is evicted first."""
+        cache = MappingCache(tmp_path, max_entries=2)
+        mapper = RegisterMapper(cache=cache)
+        keys = []
+        for strategy in ("first_fit", "best_fit", "optimal"):
+            mapper.map(ITEMS, strategy=strategy)
+            keys.append(MappingCache.key(ITEMS, strategy, mapper.geometry, time_budget=mapper.time_budget))
+            if strategy == "best_fit":
+                # Touch the first entry so best_fit becomes least recently used
+                os.utime(tmp_path / f"{keys[0]}.json", ns=(1, 1))
+                os.utime(tmp_path / f"{keys[1]}.json", ns=(0, 0))
+
+        assert sorted(p.stem for p in cache.entries()) == sorted([keys[0], keys[2]])
+        assert cache.clear() == 2
+        assert len(cache) == 0
+
+    def test_corrupt_entry_is_a_miss(self, mapping_cache):
+        """Test an unreadable entry is removed and recomputed."""
+        mapper = RegisterMapper(cache=mapping_cache)
+        expected = mapper.map(ITEMS)
+        (entry,) = mapping_cache.entries()
+        entry.write_text("{not json")
+
+        assert mapper.map(ITEMS) == expected
+        assert mapping_cache.hits == 0 and len(mapping_cache) == 1
+
+    def test_errors_are_not_cached(self, mapping_cache):
+        """Test mapping errors propagate and leave no entry."""
+        with pytest.raises(ValueError, match="Duplicate"):
+            RegisterMapper(cache=mapping_cache).map(ITEMS + ITEMS[:1])
+        assert len(mapping_cache) == 0
+
+    def test_package_uses_shared_default_directory(self, session_cache_dir):
+        """Test generate_mapping with MappingCache() uses the session directory."""
+        package = BasicAppsRegPackage(
+            app_name="Cached",
+            datatypes=[DataTypeSpec(name=name, datatype=dtype) for name, dtype in ITEMS],
+        )
+        cache = MappingCache()
+        assert cache.directory == default_cache_dir() == session_cache_dir
+
+        mappings = package.generate_mapping(cache=cache)
+        assert MappingCache().get(MappingCache.key(
+            ITEMS, "best_fit", get_geometry("basic_app"), time_budget=RegisterMapper.OPTIMAL_TIME_BUDGET
+        )) == mappings
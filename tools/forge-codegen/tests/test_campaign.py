@@ -0,0 +1,357 @@
+"""
+Unit tests for forge_codegen.campaign (sweep helpers).
+
+Tests:
+- Lazy sweep generators (grid, random, Latin hypercube, coarse-to-fine)
+- Write-minimizing sweep ordering (gray, nearest_neighbor, auto)
+- Adaptive boundary-refining search
+"""
+
+import itertools
+import random
+
+import pytest
+
+from forge_codegen.basic_serialized_datatypes import (
+    BasicAppDataTypes,
+    DeltaPlanner,
+    RegisterCodec,
+    RegisterMapper,
+)
+from forge_codegen.campaign import (
+    AdaptiveSearch,
+    SweepAxis,
+    axes_from_package,
+    chunked,
+    coarse_to_fine_sweep,
+    count_writes,
+    encode_sweep,
+    grid_size,
+    grid_sweep,
+    latin_hypercube_sweep,
+    observer_outcome,
+    order_sweep,
+    random_sweep,
+)
+from forge_codegen.models.package import BasicAppsRegPackage, DataTypeSpec
+
+
+ITEMS = [
+    ("arm", BasicAppDataTypes.BOOLEAN),
+    ("intensity", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16),
+    ("duration", BasicAppDataTypes.PULSE_DURATION_NS_U16),
+    ("delay", BasicAppDataTypes.PULSE_DURATION_NS_U32),
+    ("cooldown", BasicAppDataTypes.PULSE_DURATION_US_U24),
+]
+
+
+@pytest.fixture
+def codec():
+    return RegisterCodec(RegisterMapper().map(ITEMS, strategy="first_fit"))
+
+
+def grid(**axes):
+    names = list(axes)
+    return [dict(zip(names, combo)) for combo in itertools.product(*axes.values())]
+
+
+class TestSweepOrdering:
+    """Tests for order_sweep()."""
+
+    def test_count_writes_matches_delta_planner(self, codec):
+        sweep = grid(intensity=[0, 1000, 2000], duration=[10, 20], delay=[5, 6])
+        random.Random(0).shuffle(sweep)
+
+        expected = DeltaPlanner(codec).schedule(sweep).total_writes
+
+        assert count_writes(codec, sweep) == expected
+
+    def test_count_writes_includes_commit_cr(self):
+        """A spanning field that changes only in its upper segment still writes its commit CR."""
+        wide = RegisterCodec(RegisterMapper().map([("arm", BasicAppDataTypes.BOOLEAN),
+                                                   ("timeout", BasicAppDataTypes.PULSE_DURATION_NS_U48)]))
+        sweep = [{"arm": False, "timeout": step << 16} for step in range(1, 5)]
+        planner = DeltaPlanner(wide)
+        written = [set(planner.update(values)) for values in sweep]
+        assert all(len(crs) == 2 for crs in written[1:])  # segment CR + commit CR
+
+        assert count_writes(wide, sweep) == sum(map(len, written))
+
+        shuffled = grid(arm=[False, True], timeout=[1 << 16, 2 << 16, 5, (2 << 16) + 5])
+        random.Random(4).shuffle(shuffled)
+        result = order_sweep(wide, shuffled)
+        assert result.writes_before == DeltaPlanner(wide).schedule(shuffled).total_writes
+        assert result.writes_after == DeltaPlanner(wide).schedule(result.param_sets).total_writes
+
+    @pytest.mark.parametrize("method", ["gray", "nearest_neighbor", "auto"])
+    def test_order_is_permutation(self, codec, method):
+        sweep = grid(intensity=[0, 1000, 2000], duration=[10, 20, 30], delay=[1, 2])
+        random.Random(1).shuffle(sweep)
+
+        result = order_sweep(codec, sweep, method=method)
+
+        assert sorted(result.order) == list(range(len(sweep)))
+        assert result.param_sets == [sweep[i] for i in result.order]
+        assert result.writes_after == count_writes(codec, result.param_sets)
+        assert result.writes_after <= result.writes_before
+
+    def test_gray_grid_changes_one_field_per_step(self, codec):
+        sweep = grid(intensity=[0, 1000, 2000], duration=[10, 20, 30], delay=[1, 2, 3])
+        random.Random(2).shuffle(sweep)
+
+        result = order_sweep(codec, sweep, method="gray")
+
+        for a, b in zip(result.param_sets, result.param_sets[1:]):
+            assert sum(a[k] != b[k] for k in a) == 1
+
+    def test_reordering_reduces_writes(self, codec):
+        sweep = grid(intensity=list(range(0, 5000, 500)), duration=[10, 20, 30, 40], delay=[1, 2, 3])
+        random.Random(3).shuffle(sweep)
+
+        result = order_sweep(codec, sweep)
+
+        assert result.writes_after < result.writes_before
+        assert result.reduction_percent > 30
+        assert "CR writes" in result.summary()
+
+    def test_known_initial_state(self, codec):
+        sweep = [{"intensity": 0, "duration": 0, "delay": 0}]
+
+        result = order_sweep(codec, sweep, initial=codec.encode({}))
+
+        assert result.writes_after == 0
+
+    def test_unknown_method(self, codec):
+        with pytest.raises(ValueError, match="Unknown ordering method"):
+            order_sweep(codec, [], method="tsp")
+
+    def test_empty_sweep(self, codec):
+        result = order_sweep(codec, [])
+
+        assert result.order == []
+        assert result.writes_before == result.writes_after == 0
+
+
+class TestSweepGenerators:
+    """Tests for lazy sweep generators."""
+
+    AXES = [
+        SweepAxis("intensity", -5000, 5000, steps=5),
+        SweepAxis("duration", 20, 50000, steps=4),
+        SweepAxis("arm", 0, 1, steps=2, is_boolean=True),
+    ]
+
+    def test_grid_covers_every_combination(self):
+        points = list(grid_sweep(self.AXES))
+
+        assert len(points) == grid_size(self.AXES) == 40
+        assert len({tuple(p.values.values()) for p in points}) == 40
+        assert {p.values["intensity"] for p in points} == {-5000, -2500, 0, 2500, 5000}
+        assert {p.values["arm"] for p in points} == {False, True}
+
+    def test_grid_is_lazy_for_huge_spaces(self):
+        axes = [SweepAxis(f"f{i}", 0, 65535, steps=1000) for i in range(4)]
+
+        first = next(grid_sweep(axes, start=123_456_789_012))
+
+        assert grid_size(axes) == 10 ** 12
+        assert first.index == 123_456_789_012
+
+    @pytest.mark.parametrize("make", [
+        lambda axes, start: grid_sweep(axes, start=start),
+        lambda axes, start: random_sweep(axes, count=50, seed=7, start=start),
+        lambda axes, start: latin_hypercube_sweep(axes, count=50, seed=7, start=start),
+        lambda axes, start: coarse_to_fine_sweep(axes, levels=3, start=start),
+    ])
+    def test_resume_matches_uninterrupted_run(self, make):
+        full = list(make(self.AXES, 0))
+        resumed = list(make(self.AXES, 17))
+
+        assert resumed == full[17:]
+
+    def test_random_is_seeded_and_in_range(self):
+        a = [p.values for p in random_sweep(self.AXES, count=200, seed=1)]
+        b = [p.values for p in random_sweep(self.AXES, count=200, seed=1)]
+        c = [p.values for p in random_sweep(self.AXES, count=200, seed=2)]
+
+        assert a == b
+        assert a != c
+        assert all(-5000 <= v["intensity"] <= 5000 for v in a)
+        assert all(20 <= v["duration"] <= 50000 for v in a)
+
+    def test_random_endless(self):
+        points = random_sweep(self.AXES, seed=3)
+
+        assert len(list(next(points) for _ in range(1000))) == 1000
+
+    def test_latin_hypercube_hits_each_stratum_once(self):
+        count = 64
+        axes = [SweepAxis("x", 0, 6399), SweepAxis("y", 0, 6399)]
+        points = list(latin_hypercube_sweep(axes, count=count, seed=5))
+
+        for name in ("x", "y"):
+            strata = sorted(p.values[name] * count // 6400 for p in points)
+            assert strata == list(range(count))
+
+    def test_coarse_to_fine_levels_nest(self):
+        axes = [SweepAxis("x", 0, 100), SweepAxis("y", 0, 100)]
+        points = [p.values for p in coarse_to_fine_sweep(axes, levels=2)]
+        coords = [(v["x"], v["y"]) for v in points]
+
+        assert len(coords) == len(set(coords)) == 25
+        # Level 0 corners come first
+        assert set(coords[:4]) == {(0, 0), (0, 100), (100, 0), (100, 100)}
+        assert (50, 50) in coords[:9]
+
+    def test_latin_hypercube_axes_are_independent(self):
+        """Strata are a keyed bijection per axis, not a lattice: axes do not move in lockstep."""
+        from forge_codegen.campaign.sweep import _permute
+
+        for count in (1, 2, 7, 100, 1000):
+            assert sorted(_permute(i, count, 3, 0) for i in range(count)) == list(range(count))
+
+        count = 256
+        axes = [SweepAxis("x", 0, count - 1), SweepAxis("y", 0, count - 1)]
+        points = [(p.values["x"], p.values["y"]) for p in latin_hypercube_sweep(axes, count=count, seed=5)]
+        assert len({(y - x) % count for x, y in points}) > count // 2
+        steps = {(b[0] - a[0]) % count for a, b in zip(points, points[1:])}
+        assert len(steps) > count // 4
+
+    def test_coarse_to_fine_skips_repeated_values(self):
+        """Narrow axes (booleans) yield each distinct point once, and resume still lines up."""
+        axes = [SweepAxis("arm", 0, 1, is_boolean=True), SweepAxis("x", 0, 100)]
+        points = [(p.values["arm"], p.values["x"]) for p in coarse_to_fine_sweep(axes, levels=3)]
+
+        assert len(points) == len(set(points)) == 2 * 9
+        assert [p.index for p in coarse_to_fine_sweep(axes, levels=3)] == list(range(18))
+        resumed = [(p.values["arm"], p.values["x"]) for p in coarse_to_fine_sweep(axes, levels=3, start=5)]
+        assert resumed == points[5:]
+
+    @pytest.mark.parametrize("make", [
+        lambda start: grid_sweep(TestSweepGenerators.AXES, start=start),
+        lambda start: random_sweep(TestSweepGenerators.AXES, count=5, start=start),
+        lambda start: latin_hypercube_sweep(TestSweepGenerators.AXES, count=5, start=start),
+        lambda start: coarse_to_fine_sweep(TestSweepGenerators.AXES, levels=1, start=start),
+    ])
+    def test_negative_start_rejected(self, make):
+        with pytest.raises(ValueError, match="start"):
+            next(make(-1))
+
+    def test_axes_from_package(self):
+        package = BasicAppsRegPackage(
+            app_name="TestApp",
+            datatypes=[
+                DataTypeSpec(name="intensity", datatype=BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16,
+                             min_value=0, max_value=3300),
+                DataTypeSpec(name="duration", datatype=BasicAppDataTypes.PULSE_DURATION_NS_U8),
+                DataTypeSpec(name="arm", datatype=BasicAppDataTypes.BOOLEAN),
+            ]
+        )
+
+        axes = axes_from_package(package, steps={"intensity": 12})
+
+        assert axes[0] == SweepAxis("intensity", 0, 3300, steps=12)
+        assert (axes[1].min_value, axes[1].max_value) == (0, 255)
+        assert axes[2].is_boolean
+
+    def test_encode_sweep_chunked(self, codec):
+        axes = [SweepAxis("intensity", 0, 5000, steps=10), SweepAxis("duration", 0, 100, steps=5)]
+
+        chunks = list(encode_sweep(codec, grid_sweep(axes), chunk_size=16))
+        single = list(encode_sweep(codec, grid_sweep(axes)))
+
+        assert [len(c) for c in chunks] == [16, 16, 16, 2]
+        assert [w for c in chunks for w in c] == single
+
+    def test_encode_sweep_latches_every_wide_point(self):
+        """Consecutive sweep points (across chunks) each give a commit edge for a spanning field."""
+        wide = RegisterCodec(RegisterMapper().map([("arm", BasicAppDataTypes.BOOLEAN),
+                                                   ("timeout", BasicAppDataTypes.PULSE_DURATION_NS_U48)]))
+        axes = [SweepAxis("timeout", 100, 500, steps=5), SweepAxis("arm", 0, 1, steps=2)]
+        base = wide.encode({})
+        commit_cr, bit = wide.fields["timeout"].commit
+
+        words = [w for chunk in encode_sweep(wide, grid_sweep(axes), chunk_size=3, base=base) for w in chunk]
+
+        latched, value, previous = [], 0, base
+        for snapshot in words:
+            if (snapshot[commit_cr] ^ previous[commit_cr]) >> bit & 1:
+                value = wide.fields["timeout"].read(snapshot)
+            latched.append(value)
+            previous = snapshot
+        assert latched == [point.values["timeout"] for point in grid_sweep(axes)]
+
+    def test_chunked_rejects_zero(self):
+        with pytest.raises(ValueError):
+            list(chunked([1, 2], 0))
+
+    def test_invalid_axis(self):
+        with pytest.raises(ValueError, match="min_value"):
+            SweepAxis("x", 10, 0)
+
+
+class TestAdaptiveSearch:
+    """Tests for AdaptiveSearch boundary refinement."""
+
+    @staticmethod
+    def glitch_model(values):
+        """Synthetic fault region: a disc in intensity x duration space."""
+        dx = values["intensity"] - 3000
+        dy = (values["duration"] - 20000) / 10
+        return "fault" if dx * dx + dy * dy < 1000 ** 2 else "ok"
+
+    AXES = [SweepAxis("intensity", 0, 5000), SweepAxis("duration", 0, 50000)]
+
+    def test_finds_region_with_far_fewer_shots(self):
+        search = AdaptiveSearch(self.AXES, self.glitch_model,
+                                resolution={"intensity": 20, "duration": 200})
+        result = search.run()
+
+        assert result.outcomes["fault"] > 0
+        assert result.reduction_factor >= 10
+        assert result.shots == len(result.samples)
+
+        # Every boundary box straddles the true boundary
+        for region in result.boundary_regions():
+            (x0, x1), (y0, y1) = region["intensity"], region["duration"]
+            corners = {self.glitch_model({"intensity": x, "duration": y})
+                       for x in (x0, x1) for y in (y0, y1)}
+            assert corners == {"fault", "ok"}
+            assert x1 - x0 <= 20 and y1 - y0 <= 200
+
+    def test_fault_points_are_faults(self):
+        result = AdaptiveSearch(self.AXES, self.glitch_model, resolution=500).run()
+
+        assert all(self.glitch_model(p) == "fault" for p in result.points("fault"))
+
+    def test_uniform_space_samples_only_initial_grid(self):
+        result = AdaptiveSearch(self.AXES, lambda values: "ok", initial_level=2).run()
+
+        assert result.shots == 25
+        assert result.boundary == []
+
+    def test_budget_limits_shots(self):
+        result = AdaptiveSearch(self.AXES, self.glitch_model, max_shots=60).run()
+
+        assert result.shots <= 60
+        assert result.budget_exhausted
+
+    def test_fixed_fields_and_booleans(self):
+        seen = []
+
+        def evaluate(values):
+            seen.append(values)
+            return values["arm"] and values["intensity"] > 2500
+
+        axes = [SweepAxis("intensity", 0, 5000), SweepAxis("arm", 0, 1, is_boolean=True)]
+        AdaptiveSearch(axes, evaluate, resolution=100, fixed={"duration": 5}).run()
+
+        assert all(v["duration"] == 5 for v in seen)
+        assert {v["arm"] for v in seen} == {False, True}
+
+    def test_observer_outcome(self):
+        decoded = {"state": 2, "status": 0x80, "fault": True}
+
+        assert observer_outcome(decoded) == "fault"
+        assert observer_outcome(decoded, include_state=True) == (2, True)
+        assert observer_outcome({"state": 1, "fault": False}) == "ok"
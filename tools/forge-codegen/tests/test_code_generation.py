@@ -26,9 +26,12 @@ from forge_codegen.generator.codegen import (
     create_register_package,
     prepare_template_context,
     generate_vhdl,
+    create_jinja_env,
     PLATFORM_MAP,
 )
+from forge_codegen.generator import codegen
 from forge_codegen.basic_serialized_datatypes import BasicAppDataTypes
+from forge_codegen.models.package import BasicAppsRegPackage
 
 
 class TestYAMLParsing:
@@ -380,7 +383,7 @@ datatypes:
         output_dir.mkdir()
 
         # Generate VHDL files
-        template_dir = project_root / "forge" / "templates"
+        template_dir = project_root / "forge_codegen" / "templates"
         generate_vhdl(yaml_path, output_dir, template_dir)
 
         # Check files were created
@@ -412,6 +415,274 @@ datatypes:
         assert "entity SimpleApp_custom_inst_main" in main_content
         assert "CLK_FREQ_HZ" in main_content
 
+    def test_lock_file_keeps_shim_stable(self, tmp_path):
+        """Test adding a field with a lock file only adds lines to the shim."""
+        base_yaml = """
+app_name: "LockApp"
+platform: "moku_go"
+mapping_strategy: "best_fit"
+datatypes:
+  - name: "intensity"
+    datatype: "voltage_output_05v_s16"
+  - name: "delay"
+    datatype: "pulse_duration_ns_u8"
+  - name: "arm"
+    datatype: "boolean"
+  - name: "cooldown"
+    datatype: "pulse_duration_us_u24"
+"""
+        template_dir = project_root / "forge_codegen" / "templates"
+        lock_file = tmp_path / "mapping.json"
+        yaml_path = tmp_path / "lock.yaml"
+        shim_path = tmp_path / "out" / "LockApp_custom_inst_shim.vhd"
+
+        def extraction_lines():
+            return {line.strip() for line in shim_path.read_text().splitlines()
+                    if "<=" in line and "app_reg_" in line}
+
+        yaml_path.write_text(base_yaml)
+        generate_vhdl(yaml_path, tmp_path / "out", template_dir, lock_file=lock_file)
+        before = extraction_lines()
+        assert lock_file.exists()
+
+        yaml_path.write_text(base_yaml + """
+  - name: "level"
+    datatype: "voltage_output_05v_s8"
+""")
+        generate_vhdl(yaml_path, tmp_path / "out", template_dir, lock_file=lock_file)
+        after = extraction_lines()
+
+        # Existing fields are extracted from the same slices; only 'level' is new
+        assert before < after
+        assert [line.split()[0] for line in after - before] == ["level"]
+
+    def test_mapping_cache_reused_across_runs(self, tmp_path, mapping_cache):
+        """Test a second generation run loads the mapping from the cache."""
+        yaml_path = tmp_path / "cached.yaml"
+        yaml_path.write_text("""
+app_name: "CachedApp"
+platform: "moku_go"
+mapping_strategy: "optimal"
+datatypes:
+  - name: "intensity"
+    datatype: "voltage_output_05v_s16"
+  - name: "arm"
+    datatype: "boolean"
+""")
+        template_dir = project_root / "forge_codegen" / "templates"
+        shim_path = tmp_path / "out" / "CachedApp_custom_inst_shim.vhd"
+
+        generate_vhdl(yaml_path, tmp_path / "out", template_dir, cache=mapping_cache)
+        first = [line for line in shim_path.read_text().splitlines() if "app_reg_" in line]
+        generate_vhdl(yaml_path, tmp_path / "out", template_dir, cache=mapping_cache, force=True)
+        second = [line for line in shim_path.read_text().splitlines() if "app_reg_" in line]
+
+        assert (mapping_cache.misses, mapping_cache.hits) == (1, 1)
+        assert first == second
+
+    def test_compiled_templates_reused_across_processes(self, tmp_path):
+        """Test compiled templates load from the bytecode cache and are invalidated by edits."""
+        template_dir = tmp_path / "templates"
+        template_dir.mkdir()
+        (template_dir / "t.j2").write_text("v1 {{ x }}")
+        cache_dir = tmp_path / "cache" / "templates"
+
+        first = create_jinja_env(template_dir, cache_dir)
+        assert first.get_template("t.j2").render(x=1) == "v1 1"
+        assert first.bytecode_cache.misses == 1
+        assert create_jinja_env(template_dir, cache_dir) is first
+
+        # A fresh process (no in-memory environment) loads the compiled code
+        codegen._JINJA_ENVS.clear()
+        second = create_jinja_env(template_dir, cache_dir)
+        assert second.get_template("t.j2").render(x=2) == "v1 2"
+        assert (second.bytecode_cache.hits, second.bytecode_cache.misses) == (1, 0)
+
+        codegen._JINJA_ENVS.clear()
+        (template_dir / "t.j2").write_text("v2 {{ x }}")
+        third = create_jinja_env(template_dir, cache_dir)
+        assert third.get_template("t.j2").render(x=3) == "v2 3"
+        assert third.bytecode_cache.misses == 1
+
+    def test_app_type_packages_only_used_types(self, tmp_path, mapping_cache):
+        """Test app-specific type packages hold only the app's conversions and follow spec edits."""
+        from forge_codegen.generator.type_utilities import generate_voltage_package
+
+        yaml_path = tmp_path / "shaken.yaml"
+        yaml_path.write_text("""
+app_name: "ShakenApp"
+platform: "moku_go"
+datatypes:
+  - name: "intensity"
+    datatype: "voltage_output_05v_s16"
+  - name: "arm"
+    datatype: "boolean"
+""")
+        template_dir = project_root / "forge_codegen" / "templates"
+        out = tmp_path / "out"
+
+        generate_vhdl(yaml_path, out, template_dir, cache=mapping_cache, app_type_packages=True)
+        voltage = (out / "basic_app_voltage_pkg.vhd").read_text()
+        assert re.findall(r"function (\w+)\(", voltage) == ["voltage_output_05v_s16_from_raw",
+                                                            "voltage_output_05v_s16_to_raw"] * 2
+        assert "FROZEN" not in voltage and "FROZEN" in generate_voltage_package()
+        assert len(voltage) < len(generate_voltage_package()) / 3
+        assert (out / "basic_app_types_pkg.vhd").exists()
+        assert not (out / "basic_app_time_pkg.vhd").exists()
+        assert "basic_app_time_pkg" not in (out / "ShakenApp_custom_inst_shim.vhd").read_text()
+
+        # Same types in another app: served from the cache, identical output
+        other = tmp_path / "other.yaml"
+        other.write_text(yaml_path.read_text().replace("ShakenApp", "OtherApp"))
+        generate_vhdl(other, tmp_path / "other", template_dir, cache=mapping_cache, app_type_packages=True)
+        assert (tmp_path / "other" / "basic_app_voltage_pkg.vhd").read_text() == voltage
+        assert len(list((mapping_cache.directory / "type_packages").glob("*.json"))) == 1
+
+        # Switching to a time type swaps the voltage package for a one-unit time package
+        yaml_path.write_text(yaml_path.read_text().replace("voltage_output_05v_s16", "pulse_duration_us_u16"))
+        assert generate_vhdl(yaml_path, out, template_dir, cache=mapping_cache, app_type_packages=True)
+        assert not (out / "basic_app_voltage_pkg.vhd").exists()
+        time_pkg = (out / "basic_app_time_pkg.vhd").read_text()
+        assert re.findall(r"function (\w+)\(", time_pkg) == ["us_to_cycles", "cycles_to_us"] * 2
+        assert generate_vhdl(yaml_path, out, template_dir, cache=mapping_cache, app_type_packages=True) is False
+
+    def test_binary_snapshot_written(self, tmp_path):
+        """Test --snapshot output loads back to the generated mapping."""
+        yaml_path = tmp_path / "snap.yaml"
+        yaml_path.write_text("""
+app_name: "SnapApp"
+platform: "moku_go"
+datatypes:
+  - name: "intensity"
+    datatype: "voltage_output_05v_s16"
+  - name: "arm"
+    datatype: "boolean"
+""")
+        template_dir = project_root / "forge_codegen" / "templates"
+        snapshot = tmp_path / "out" / "regs.fgrb"
+
+        generate_vhdl(yaml_path, tmp_path / "out", template_dir, snapshot=snapshot)
+
+        package = BasicAppsRegPackage.from_binary(snapshot.read_bytes())
+        assert package.app_name == "SnapApp"
+        assert {m.name for m in package.generate_mapping()} == {"intensity", "arm"}
+
+    def test_incremental_generation_skips_unchanged_inputs(self, tmp_path):
+        """Test a rerun with identical inputs writes nothing and output is byte-identical."""
+        yaml_path = tmp_path / "incremental.yaml"
+        yaml_path.write_text("""
+app_name: "IncApp"
+platform: "moku_go"
+mapping_strategy: "best_fit"
+datatypes:
+  - name: "intensity"
+    datatype: "voltage_output_05v_s16"
+  - name: "arm"
+    datatype: "boolean"
+""")
+        template_dir = project_root / "forge_codegen" / "templates"
+        out = tmp_path / "out"
+        shim_path = out / "IncApp_custom_inst_shim.vhd"
+
+        assert generate_vhdl(yaml_path, out, template_dir) is True
+        shim = shim_path.read_bytes()
+        mtime = shim_path.stat().st_mtime_ns
+        assert (out / ".codegen_manifest.json").exists()
+
+        assert generate_vhdl(yaml_path, out, template_dir) is False
+        assert generate_vhdl(yaml_path, out, template_dir, force=True) is True
+        assert shim_path.read_bytes() == shim
+        assert shim_path.stat().st_mtime_ns == mtime  # unchanged content is not rewritten
+
+        # Any input change (or a modified output) triggers regeneration
+        shim_path.write_text("-- edited\n")
+        assert generate_vhdl(yaml_path, out, template_dir) is True
+        assert shim_path.read_bytes() == shim
+        yaml_path.write_text(yaml_path.read_text().replace("best_fit", "first_fit"))
+        assert generate_vhdl(yaml_path, out, template_dir) is True
+        assert generate_vhdl(yaml_path, out, template_dir) is False
+
+    def test_spanning_field_shadow_commit(self, tmp_path):
+        """Test a 48-bit field is latched from both CRs only when its commit bit toggles."""
+        yaml_content = """
+app_name: "WideApp"
+platform: "moku_pro"
+datatypes:
+  - name: "arm"
+    datatype: "boolean"
+  - name: "timeout"
+    datatype: "pulse_duration_ns_u48"
+    default_value: 5000000000
+"""
+        yaml_path = tmp_path / "wide.yaml"
+        yaml_path.write_text(yaml_content)
+
+        template_dir = project_root / "forge_codegen" / "templates"
+        generate_vhdl(yaml_path, tmp_path, template_dir)
+        shim_content = (tmp_path / "WideApp_custom_inst_shim.vhd").read_text()
+
+        assert "signal timeout_shadow : unsigned(47 downto 0);" in shim_content
+        assert "if app_reg_8(15) /= timeout_commit_seen then" in shim_content
+        assert "timeout_shadow <= unsigned(app_reg_7(31 downto 0) & app_reg_8(31 downto 16));" in shim_content
+        assert "timeout <= timeout_shadow;" in shim_content
+        # Defaults beyond the 32-bit VHDL integer range use a bit-string literal
+        assert "timeout_shadow <= unsigned'(x\"00012A05F200\");" in shim_content
+        assert "to_unsigned(5000000000" not in shim_content
+
+    def test_pipelined_shim_splits_slice_and_convert(self, tmp_path):
+        """Test pipeline stages split slicing and conversion, delay the strobes, and the lock file ignores them."""
+        yaml_path = tmp_path / "piped.yaml"
+        yaml_path.write_text("""
+app_name: "PipedApp"
+platform: "moku_pro"
+datatypes:
+  - name: "arm"
+    datatype: "boolean"
+  - name: "timeout"
+    datatype: "pulse_duration_ns_u48"
+  - name: "intensity"
+    datatype: "voltage_output_05v_s16"
+""")
+        template_dir = project_root / "forge_codegen" / "templates"
+        plain_shim = tmp_path / "plain" / "PipedApp_custom_inst_shim.vhd"
+        generate_vhdl(yaml_path, tmp_path / "plain", template_dir, lock_file=tmp_path / "plain.json")
+        generate_vhdl(yaml_path, tmp_path / "piped", template_dir, lock_file=tmp_path / "piped.json",
+                      pipeline_stages=2)
+        generate_vhdl(yaml_path, tmp_path / "auto", template_dir, pipeline_stages="auto")
+        shim = (tmp_path / "piped" / "PipedApp_custom_inst_shim.vhd").read_text()
+
+        plain = plain_shim.read_text()
+        assert "FIELD_PIPELINE_PROC" not in plain
+        # Unpipelined, fields are sliced straight from the CR ports (one pair of parentheses)
+        assert "intensity <= voltage_output_05v_s16_from_raw(app_reg_6(31 downto 16));" in plain
+        assert "arm <= app_reg_6(15);" in plain
+        assert "((" not in plain
+        assert "CR write to signal: 4 cycles" in shim  # 2 stages + update + shadow
+        # Stage 1 registers only the field slices (and the commit bit)
+        assert "intensity_p1 <= app_reg_6(31 downto 16);" in shim
+        assert "timeout_p1 <= app_reg_7(31 downto 0) & app_reg_8(31 downto 16);" in shim
+        assert "timeout_commit_p1 <= app_reg_8(15);" in shim
+        # Stage 2 registers the converted values
+        assert "intensity_p2 <= voltage_output_05v_s16_from_raw(intensity_p1);" in shim
+        assert "timeout_p2 <= unsigned(timeout_p1);" in shim
+        assert "ready_for_updates_p2 <= ready_for_updates_p1;" in shim
+        assert "timeout_commit_p2 <= timeout_commit_p1;" in shim
+
+        # Past the pipeline, the update and shadow logic only move registered values
+        logic = shim.split("end process FIELD_PIPELINE_PROC;")[1].split("MAIN_INST")[0]
+        assert "app_reg_" not in logic and "_from_raw" not in logic
+        assert "elsif ready_for_updates_p2 = '1' then" in logic
+        assert "intensity <= intensity_p2;" in logic
+        assert "if timeout_commit_p2 /= timeout_commit_seen then" in logic
+        assert "timeout_shadow <= timeout_p2;" in logic
+        assert (tmp_path / "piped.json").read_text() == (tmp_path / "plain.json").read_text()
+
+        # auto (Moku:Pro): the slice stage only, conversion in the update register
+        auto = (tmp_path / "auto" / "PipedApp_custom_inst_shim.vhd").read_text()
+        assert "CR write to signal: 3 cycles" in auto
+        assert "intensity_p2" not in auto
+        assert "intensity <= voltage_output_05v_s16_from_raw(intensity_p1);" in auto
+
     def test_generate_vhdl_moku_lab_platform(self, tmp_path):
         """Test generating VHDL for Moku:Lab platform (500 MHz)."""
         yaml_content = """
@@ -428,7 +699,7 @@ datatypes:
         output_dir = tmp_path / "generated"
         output_dir.mkdir()
 
-        template_dir = project_root / "forge" / "templates"
+        template_dir = project_root / "forge_codegen" / "templates"
         generate_vhdl(yaml_path, output_dir, template_dir)
 
         shim_path = output_dir / "LabApp_custom_inst_shim.vhd"
@@ -482,4 +753,342 @@ datatypes:
         assert timeout_sig['default_value'] == 1000
 
 
+
+class TestMultiPlatformGeneration:
+    """Test --platforms: one parse/mapping, per-platform outputs, combined summary."""
+
+    def test_all_platforms_share_one_mapping(self, tmp_path, monkeypatch):
+        """Test every platform gets its own shim from a single YAML parse."""
+        import json
+        from forge_codegen.generator import codegen
+
+        calls = []
+        original = codegen.load_yaml_spec
+        monkeypatch.setattr(codegen, "load_yaml_spec", lambda path: calls.append(path) or original(path))
+
+        yaml_path = tmp_path / "multi.yaml"
+        yaml_path.write_text(DRIVER_YAML)
+        template_dir = project_root / "forge_codegen" / "templates"
+        out = tmp_path / "out"
+
+        result = codegen.generate_platforms(yaml_path, out, template_dir,
+                                            platforms=codegen.resolve_platforms("all"), jobs=2)
+        assert result == {key: True for key in PLATFORM_MAP}
+        assert len(calls) == 1
+
+        shims = {}
+        for key, info in PLATFORM_MAP.items():
+            shim = (out / key / "BPD_Probe_custom_inst_shim.vhd").read_text()
+            assert f"Clock Frequency: {info['clock_mhz']} MHz" in shim
+            shims[key] = [line for line in shim.splitlines() if "app_reg_" in line]
+            assert (out / key / "BPD_Probe_driver.py").exists()
+        assert all(lines == shims["moku_go"] for lines in shims.values())
+
+        summary = json.loads((out / "platforms_summary.json").read_text())
+        assert set(summary["platforms"]) == set(PLATFORM_MAP)
+        assert summary["platforms"]["moku_pro"]["clock_mhz"] == 1250
+
+        assert codegen.generate_platforms(yaml_path, out, template_dir) == {key: False for key in PLATFORM_MAP}
+        assert len(calls) == 1
+
+    def test_resolve_platforms(self):
+        """Test --platforms parsing."""
+        from forge_codegen.generator.codegen import resolve_platforms
+
+        assert resolve_platforms("moku_go, moku_pro,moku_go") == ["moku_go", "moku_pro"]
+        with pytest.raises(ValueError, match="Unknown platform"):
+            resolve_platforms("moku_go,moku_mini")
+
+    def test_auto_pipeline_stages_follow_clock(self, tmp_path):
+        """Test --pipeline-stages auto adds the slice stage on faster platforms, and no more."""
+        from forge_codegen.generator.codegen import resolve_pipeline_stages
+
+        assert {key: resolve_pipeline_stages("auto", info) for key, info in PLATFORM_MAP.items()} == {
+            "moku_go": 0, "moku_lab": 1, "moku_pro": 1, "moku_delta": 1}
+        assert resolve_pipeline_stages("3", PLATFORM_MAP["moku_go"]) == 3
+        with pytest.raises(ValueError, match="pipeline stages"):
+            resolve_pipeline_stages(-1, PLATFORM_MAP["moku_go"])
+
+
+class TestLazyImports:
+    """Test the CLI entry points don't import heavy dependencies at startup."""
+
+    def test_codegen_import_is_light(self):
+        """Test importing codegen and batch leaves jinja2, yaml, pydantic and numpy unloaded."""
+        import subprocess
+
+        code = ("import sys, forge_codegen, forge_codegen.models, forge_codegen.generator.codegen, "
+                "forge_codegen.generator.batch; "
+                "print(' '.join(m for m in ('jinja2', 'yaml', 'pydantic', 'numpy') if m in sys.modules))")
+        result = subprocess.run([sys.executable, "-c", code], cwd=project_root,
+                                capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == ""
+
+        from forge_codegen.models import BasicAppsRegPackage as lazy_package
+        assert lazy_package is BasicAppsRegPackage
+
+
+DRIVER_YAML = """
+app_name: "BPD_Probe"
+platform: "moku_go"
+datatypes:
+  - name: "intensity_voltage"
+    datatype: "voltage_output_05v_s16"
+    default_value: 2400
+  - name: "level"
+    datatype: "voltage_input_20v_u7"
+  - name: "timeout"
+    datatype: "pulse_duration_ns_u48"
+    default_value: 5000000000
+  - name: "arm"
+    datatype: "boolean"
+    default_value: true
+  - name: "class"
+    datatype: "pulse_duration_ms_u16"
+"""
+
+
+def load_driver(tmp_path):
+    """Generate the BPD_Probe driver and import it; returns (module, codec)."""
+    import importlib.util
+
+    yaml_path = tmp_path / "driver.yaml"
+    yaml_path.write_text(DRIVER_YAML)
+    template_dir = project_root / "forge_codegen" / "templates"
+    generate_vhdl(yaml_path, tmp_path / "out", template_dir)
+
+    spec = importlib.util.spec_from_file_location("bpd_driver", tmp_path / "out" / "BPD_Probe_driver.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    codec = create_register_package(load_yaml_spec(yaml_path)).codec()
+    return module, codec
+
+
+class TestPythonDriver:
+    """Test the generated Python register driver against RegisterCodec."""
+
+    def test_driver_matches_codec(self, tmp_path):
+        """Test setters produce the same CR words as RegisterCodec.encode."""
+        module, codec = load_driver(tmp_path)
+        written = {}
+        drv = module.BPDProbeDriver(lambda cr, word: written.__setitem__(cr, word))
+        assert not hasattr(drv, "__dict__")
+        assert drv.flush() == len(codec.cr_numbers)
+
+        values = {"intensity_voltage": -1234, "level": 15000, "timeout": 2 ** 40 + 3, "arm": False, "class": 77}
+        base = dict(written)
+        for name, value in values.items():
+            setattr(drv, name + "_" if name == "class" else name, value)
+        drv.flush()
+
+        assert written == codec.encode(values, base)
+        assert drv.words() == written
+        assert drv.intensity_voltage == codec.decode(written)["intensity_voltage"]
+        assert (drv.timeout, drv.arm, drv.class_) == (2 ** 40 + 3, False, 77)
+
+    def test_flush_writes_only_dirty_crs(self, tmp_path):
+        """Test unchanged values are not rewritten and spanning fields flip their commit bit."""
+        module, codec = load_driver(tmp_path)
+        writes = []
+        drv = module.BPDProbeDriver(lambda cr, word: writes.append(cr), words={})
+        assert drv.flush() == 0
+
+        drv.arm = False  # already cleared
+        assert drv.pending() == ()
+        drv.arm = True
+        assert drv.flush() == 1 and writes == [codec.fields["arm"].cr_number]
+
+        writes.clear()
+        drv.timeout = 5
+        assert drv.flush() == 2
+        assert writes == sorted(writes) == list(codec.fields["timeout"].cr_numbers)
+
+    def test_driver_rejects_out_of_range(self, tmp_path):
+        """Test setters range-check like the codec."""
+        module, _ = load_driver(tmp_path)
+        drv = module.BPDProbeDriver(lambda cr, word: None)
+        with pytest.raises(ValueError, match="out of range"):
+            drv.intensity_voltage = 6000
+
+
+
+class FakeSignal:
+    """Stand-in for a cocotb signal handle: records every assignment."""
+
+    def __init__(self, log, name):
+        self.log, self.name, self._value = log, name, None
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, word):
+        self._value = word
+        self.log.append(self.name)
+
+
+class TestCocotbHelper:
+    """Test the generated cocotb register helper drives the DUT through the compiled mapping."""
+
+    def load_helper(self, tmp_path, monkeypatch):
+        import asyncio
+        import importlib
+
+        _, codec = load_driver(tmp_path)
+        monkeypatch.syspath_prepend(str(tmp_path / "out"))
+        module = importlib.import_module("BPD_Probe_cocotb")
+        monkeypatch.delitem(sys.modules, "BPD_Probe_cocotb")
+        monkeypatch.delitem(sys.modules, "BPD_Probe_driver")
+
+        log = []
+        dut = type("Dut", (), {})()
+        for cr in range(module.CONTROL_COUNT):
+            setattr(dut, f"Control{cr}", FakeSignal(log, cr))
+        return module, codec, dut, log, asyncio.run
+
+    def test_apply_drives_dirty_crs_like_codec(self, tmp_path, monkeypatch):
+        """Test typed setters reach dut.Control<N> with the codec's words, only for dirty CRs."""
+        module, codec, dut, log, run = self.load_helper(tmp_path, monkeypatch)
+        regs = module.BPDProbeCocotbDriver(dut)
+        assert type(regs).__mro__[1].__name__ == "BPDProbeDriver"
+        assert run(regs.apply()) == len(codec.cr_numbers)
+        base = {cr: getattr(dut, f"Control{cr}").value for cr in codec.cr_numbers}
+
+        log.clear()
+        regs.intensity_voltage = -1234
+        regs.timeout = 2 ** 40 + 3
+        run(regs.apply())
+        expected = codec.encode({"intensity_voltage": -1234, "timeout": 2 ** 40 + 3}, base)
+        assert {cr: getattr(dut, f"Control{cr}").value for cr in codec.cr_numbers} == expected
+        assert log == sorted(cr for cr in expected if expected[cr] != base[cr])
+        assert run(regs.apply()) == 0
+
+    def test_reset_zeroes_other_controls(self, tmp_path, monkeypatch):
+        """Test reset() drives every Control<N> once: mapped CRs to defaults, the rest to zero."""
+        module, codec, dut, log, run = self.load_helper(tmp_path, monkeypatch)
+        regs = module.BPDProbeCocotbDriver(dut)
+        regs.arm = True
+        regs.reset(defaults=False)
+
+        assert sorted(log) == list(range(module.CONTROL_COUNT))
+        words = {cr: getattr(dut, f"Control{cr}").value for cr in range(module.CONTROL_COUNT)}
+        commit_cr, bit = codec.fields["timeout"].commit
+        assert words.pop(commit_cr) == 1 << bit  # commit bit flipped, every field zero
+        assert set(words.values()) == {0}
+        assert regs.pending() == ()
+
+    def test_reset_always_commits_spanning_fields(self, tmp_path, monkeypatch):
+        """Test reset() gives every spanning field a commit edge, so the shim's shadow takes the reset value."""
+        module, codec, dut, log, run = self.load_helper(tmp_path, monkeypatch)
+        field = codec.fields["timeout"]
+        commit_cr, bit = field.commit
+        shadow = {"seen": 0, "value": 0}
+
+        def apply():
+            # SHADOW_COMMIT_PROC: load the shadow when the commit bit differs from the last one seen
+            run(regs.apply())
+            words = {cr: getattr(dut, f"Control{cr}").value for cr in codec.cr_numbers}
+            if (words[commit_cr] >> bit & 1) != shadow["seen"]:
+                shadow.update(seen=words[commit_cr] >> bit & 1, value=field.read(words))
+
+        regs = module.BPDProbeCocotbDriver(dut)
+        apply()
+        for value in (111, 222):
+            regs.timeout = value
+            apply()
+            assert shadow["value"] == regs.timeout == value
+        for defaults in (True, False, True):
+            regs.reset(defaults=defaults)
+            apply()
+            assert shadow["value"] == regs.timeout == (5_000_000_000 if defaults else 0)
+
+        # A setter's pending commit flip must not cancel the reset's
+        regs.timeout = 333
+        regs.reset()
+        apply()
+        assert shadow["value"] == regs.timeout == 5_000_000_000
+
+    def test_signal_format(self, tmp_path, monkeypatch):
+        """Test signal_format drives other per-CR inputs, and missing inputs fail up front."""
+        module, codec, _, _, run = self.load_helper(tmp_path, monkeypatch)
+        log = []
+        shim = type("Dut", (), {})()
+        for cr in codec.cr_numbers:
+            setattr(shim, f"app_reg_{cr}", FakeSignal(log, cr))
+
+        regs = module.BPDProbeCocotbDriver(shim, signal_format="app_reg_{cr}")
+        run(regs.apply())
+        assert {cr: getattr(shim, f"app_reg_{cr}").value for cr in codec.cr_numbers} == regs.words()
+        regs.reset()
+        assert sorted(log[len(codec.cr_numbers):]) == list(codec.cr_numbers)
+
+        with pytest.raises(AttributeError, match=r"DUT has no Control\d+.*signal_format"):
+            module.BPDProbeCocotbDriver(shim)
+
+
+class TestHierarchicalOffsetRom:
+    """Test the forge_hierarchical_encoder status offset ROM and its decoder inverse."""
+
+    def test_committed_tables_match_generator(self):
+        """Test the committed VHDL package and decoder table are the generator's current output."""
+        from forge_codegen.generator import type_utilities as tu
+
+        vhdl = tu.repo_root / "libs" / "platform" / "common" / tu.HIERARCHICAL_OFFSET_VHDL
+        table = tu.repo_root / "tools" / "decoder" / tu.HIERARCHICAL_OFFSET_PYTHON
+        assert vhdl.read_text() == tu.generate_hierarchical_offset_package()
+        assert table.read_text() == tu.generate_hierarchical_offset_table()
+
+        rom = tu.hierarchical_offset_rom()
+        assert rom == [(s * 100) // 128 for s in range(128)]
+        assert len(re.findall(r"to_unsigned\(\s*\d+, 7\)", vhdl.read_text())) == 128
+
+    def test_decoder_round_trip_is_bit_exact(self, monkeypatch):
+        """Test decode(encode(state, status)) re-encodes to the same value for every status."""
+        from forge_codegen.generator.type_utilities import hierarchical_offset_rom, repo_root
+
+        monkeypatch.syspath_prepend(str(repo_root / "tools" / "decoder"))
+        from hierarchical_decoder import decode_hierarchical_voltage
+
+        rom = hierarchical_offset_rom()
+        for state in (0, 1, 31, 63):
+            for status in range(256):
+                value = state * 200 + rom[status & 0x7F]
+                value = -value if status & 0x80 else value
+                decoded = decode_hierarchical_voltage(value)
+                assert decoded["state"] == state
+                assert rom[decoded["status_lower"]] == rom[status & 0x7F]
+                assert decoded["fault"] == bool(status & 0x80) or value == 0
+
+        # Noisy remainders past the table clamp to the top status
+        assert decode_hierarchical_voltage(150)["status_lower"] == 127
+
+    def test_example_fallback_decoder_agrees(self, monkeypatch):
+        """Test the BPD cocotb fallback decoder matches hierarchical_decoder for every encoding."""
+        import importlib.util
+
+        from forge_codegen.generator.type_utilities import hierarchical_offset_rom, repo_root
+
+        monkeypatch.syspath_prepend(str(repo_root / "tools" / "decoder"))
+        from hierarchical_decoder import decode_hierarchical_voltage
+
+        path = (repo_root / "examples" / "basic-probe-driver" / "vhdl" / "cocotb_test"
+                / "fsm_observer_tests" / "fsm_observer_constants.py")
+        spec = importlib.util.spec_from_file_location("fsm_observer_constants", path)
+        constants = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(constants)
+        fallback = constants._fallback_decode_hierarchical_voltage
+
+        rom = hierarchical_offset_rom()
+        for state in (0, 5, 63):
+            for status in range(256):
+                value = state * 200 + rom[status & 0x7F]
+                value = -value if status & 0x80 else value
+                expected = decode_hierarchical_voltage(value)
+                assert fallback(value)["status"] == expected["status"], (state, status)
+                assert fallback(value)["state"] == expected["state"]
+        for value in range(0, 400):  # off-table remainders too
+            assert fallback(value)["status"] == decode_hierarchical_voltage(value)["status"]
+
+
 # Run tests with: PYTHONPATH=libs/basic-app-datatypes:. uv run pytest python_tests/test_code_generation.py -v
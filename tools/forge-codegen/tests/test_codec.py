@@ -0,0 +1,340 @@
+"""
+Unit tests for RegisterCodec (typed values <-> CR words).
+
+Tests:
+- Scalar encode/decode round-trips
+- Sign extension and voltage scaling parity with TypeConverter
+- Batch decoding of moku_read-style snapshots (list and array input)
+- BasicAppsRegPackage integration
+- DeltaPlanner minimal-write planning
+"""
+
+import pytest
+
+from forge_codegen.basic_serialized_datatypes import (
+    BasicAppDataTypes,
+    DeltaPlanner,
+    RegisterCodec,
+    RegisterMapper,
+    RegisterMapping,
+    TYPE_REGISTRY,
+    TypeConverter,
+)
+from forge_codegen.basic_serialized_datatypes import codec as codec_module
+from forge_codegen.models.package import BasicAppsRegPackage, DataTypeSpec
+
+
+ITEMS = [
+    ("arm", BasicAppDataTypes.BOOLEAN),
+    ("intensity", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16),
+    ("threshold", BasicAppDataTypes.VOLTAGE_INPUT_25V_S8),
+    ("level", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_U7),
+    ("duration", BasicAppDataTypes.PULSE_DURATION_NS_U16),
+    ("cooldown", BasicAppDataTypes.PULSE_DURATION_US_U24),
+]
+
+
+@pytest.fixture
+def codec():
+    return RegisterCodec(RegisterMapper().map(ITEMS, strategy="best_fit"))
+
+
+class TestScalarCodec:
+    """Tests for encode()/decode() on single snapshots."""
+
+    def test_roundtrip(self, codec):
+        values = {
+            "arm": True,
+            "intensity": -2400,
+            "threshold": 12000,
+            "level": 3300,
+            "duration": 500,
+            "cooldown": 1_000_000,
+        }
+        decoded = codec.decode(codec.encode(values))
+
+        assert decoded["arm"] is True
+        assert decoded["duration"] == 500
+        assert decoded["cooldown"] == 1_000_000
+        # Voltages round-trip through the DAC code (quantized)
+        assert abs(decoded["intensity"] - (-2400)) <= 1
+        assert abs(decoded["threshold"] - 12000) <= 200
+        assert abs(decoded["level"] - 3300) <= 40
+
+    def test_encode_covers_all_crs(self, codec):
+        words = codec.encode({})
+        assert set(words) == set(codec.cr_numbers)
+        assert all(word == 0 for word in words.values())
+
+    def test_encode_preserves_base_bits(self, codec):
+        base = codec.encode({"arm": True, "duration": 42})
+        words = codec.encode({"duration": 43}, base=base)
+        decoded = codec.decode(words)
+
+        assert decoded["arm"] is True
+        assert decoded["duration"] == 43
+
+    def test_negative_voltage_sign_extension(self):
+        mapping = RegisterMapping("v", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16, 6, (31, 16))
+        codec = RegisterCodec([mapping])
+
+        raw = TypeConverter.voltage_output_05v_s16_to_raw(-5000)
+        word = (raw & 0xFFFF) << 16
+
+        assert codec.decode({6: word})["v"] == TypeConverter.raw_to_voltage_output_05v_s16(raw)
+
+    def test_string_keys_and_missing_crs(self, codec):
+        words = codec.encode({"duration": 77})
+        json_style = {str(cr): word for cr, word in words.items() if word}
+
+        assert codec.decode(json_style)["duration"] == 77
+        assert codec.decode({})["arm"] is False
+
+    def test_out_of_range_time_rejected(self, codec):
+        with pytest.raises(ValueError, match="out of range"):
+            codec.encode({"duration": 70000})
+
+    def test_unknown_field_rejected(self, codec):
+        with pytest.raises(KeyError, match="Unknown field"):
+            codec.encode({"nope": 1})
+
+
+class TestBatchDecode:
+    """Tests for decode_batch() column decoding."""
+
+    def test_batch_matches_scalar(self, codec):
+        rows = [
+            {"arm": i % 2 == 0, "intensity": -5000 + 37 * i, "threshold": -25000 + 500 * i,
+             "level": 50 * i, "duration": 13 * i, "cooldown": 1000 * i}
+            for i in range(100)
+        ]
+        snapshots = codec.encode_batch(rows)
+        columns = codec.decode_batch(snapshots)
+
+        for i, snapshot in enumerate(snapshots):
+            expected = codec.decode(snapshot)
+            for name, value in expected.items():
+                assert columns[name][i] == value
+
+    @pytest.mark.parametrize("datatype", [
+        dt for dt in BasicAppDataTypes if TYPE_REGISTRY[dt].unit == 'mV'
+    ])
+    def test_voltage_column_bit_exact(self, datatype):
+        """Vectorized scaling must agree with TypeConverter for every raw code."""
+        width = TYPE_REGISTRY[datatype].bit_width
+        mapping = RegisterMapping("v", datatype, 6, (width - 1, 0))
+        codec = RegisterCodec([mapping])
+
+        snapshots = [{6: word} for word in range(1 << width)]
+        column = codec.decode_batch(snapshots)["v"]
+        expected = [codec.decode(snapshot)["v"] for snapshot in snapshots]
+
+        assert list(column) == expected
+
+    def test_array_input(self, codec):
+        np = pytest.importorskip("numpy")
+
+        rows = [{"intensity": 1000 * (i - 2), "duration": i} for i in range(5)]
+        snapshots = codec.encode_batch(rows)
+        array = np.array([[s[cr] for cr in codec.cr_numbers] for s in snapshots], dtype=np.uint32)
+
+        columns = codec.decode_batch(array)
+
+        assert list(columns["duration"]) == [0, 1, 2, 3, 4]
+        assert columns["arm"].dtype == bool
+
+    def test_array_shape_mismatch(self, codec):
+        np = pytest.importorskip("numpy")
+
+        with pytest.raises(ValueError, match="Expected array of shape"):
+            codec.decode_batch(np.zeros((3, len(codec.cr_numbers) + 1)))
+
+    def test_pure_python_fallback(self, codec, monkeypatch):
+        monkeypatch.setattr(codec_module, "np", None)
+
+        snapshots = codec.encode_batch([{"arm": True, "intensity": 2400}, {"intensity": -2400}])
+        columns = codec.decode_batch(snapshots)
+
+        assert columns["arm"] == [True, False]
+        assert columns["intensity"] == [codec.decode(s)["intensity"] for s in snapshots]
+
+
+class TestPackageIntegration:
+    """Tests for BasicAppsRegPackage.codec() / decode_control_registers()."""
+
+    def test_decode_control_registers_inverts_defaults(self):
+        package = BasicAppsRegPackage(
+            app_name="TestApp",
+            datatypes=[
+                DataTypeSpec(name="enable", datatype=BasicAppDataTypes.BOOLEAN, default_value=True),
+                DataTypeSpec(name="timeout", datatype=BasicAppDataTypes.PULSE_DURATION_MS_U16,
+                             default_value=1000),
+            ]
+        )
+
+        columns = package.decode_control_registers([package.to_control_registers()])
+
+        assert bool(columns["enable"][0]) is True
+        assert columns["timeout"][0] == 1000
+
+    def test_codec_cached(self):
+        package = BasicAppsRegPackage(
+            app_name="TestApp",
+            datatypes=[DataTypeSpec(name="enable", datatype=BasicAppDataTypes.BOOLEAN)]
+        )
+
+        assert package.codec() is package.codec()
+
+
+class TestDeltaPlanner:
+    """Tests for DeltaPlanner minimal-write planning."""
+
+    def test_first_update_writes_everything(self, codec):
+        planner = DeltaPlanner(codec)
+        writes = planner.update({"arm": True})
+
+        assert set(writes) == set(codec.cr_numbers)
+
+    def test_single_field_change_writes_one_cr(self, codec):
+        planner = DeltaPlanner(codec)
+        planner.update({"arm": False, "duration": 100, "cooldown": 10})
+
+        writes = planner.update({"duration": 101})
+
+        assert list(writes) == [codec.fields["duration"].cr_number]
+        assert codec.decode(planner.state)["cooldown"] == 10
+
+    def test_unchanged_update_writes_nothing(self, codec):
+        planner = DeltaPlanner(codec)
+        planner.update({"intensity": 1000})
+
+        assert planner.update({"intensity": 1000}) == {}
+
+    def test_known_initial_state(self, codec):
+        initial = codec.encode({"duration": 5})
+        planner = DeltaPlanner(codec, initial=initial)
+
+        assert planner.update({"duration": 5}) == {}
+
+    def test_plan_is_stateless(self, codec):
+        planner = DeltaPlanner(codec)
+        writes = planner.plan({"arm": False, "duration": 1}, {"arm": True})
+
+        assert list(writes) == [codec.fields["arm"].cr_number]
+        assert planner.state is None
+
+    def test_schedule(self, codec):
+        planner = DeltaPlanner(codec, initial=codec.encode({}))
+        sweep = [{"intensity": v} for v in (0, 1000, 1000, 2000)]
+
+        schedule = planner.schedule(sweep)
+
+        assert len(schedule) == 4
+        assert [len(step) for step in schedule] == [0, 1, 0, 1]
+        assert schedule.total_writes == 2
+        assert schedule.full_writes == 4 * len(codec.cr_numbers)
+        assert schedule.savings_percent > 0
+        # schedule() must not advance the live state
+        assert planner.state == codec.encode({})
+
+    def test_package_plan_delta(self):
+        package = BasicAppsRegPackage(
+            app_name="TestApp",
+            datatypes=[
+                DataTypeSpec(name="intensity", datatype=BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16),
+                DataTypeSpec(name="timeout", datatype=BasicAppDataTypes.PULSE_DURATION_MS_U16),
+                DataTypeSpec(name="delay", datatype=BasicAppDataTypes.PULSE_DURATION_US_U24),
+            ]
+        )
+        writes = package.plan_delta({"intensity": 2400, "delay": 7}, {"intensity": 2500})
+        cr = package.codec().fields["intensity"].cr_number
+
+        assert list(writes) == [cr]
+        assert package.codec().decode(writes)["intensity"] == 2499
+
+
+def latched(codec, name, base, snapshots):
+    """Shim latch model: a spanning field takes its shadow value on each commit-bit edge."""
+    field = codec.fields[name]
+    cr_number, bit = field.commit
+    value, previous, result = field.read(base), base, []
+    for words in snapshots:
+        if (words[cr_number] ^ previous[cr_number]) >> bit & 1:
+            value = field.read(words)
+        result.append(value)
+        previous = words
+    return result
+
+
+class TestSpanningCodec:
+    """Tests for fields split across several CRs (shadow/commit protocol)."""
+
+    ITEMS = [
+        ("arm", BasicAppDataTypes.BOOLEAN),
+        ("timeout", BasicAppDataTypes.PULSE_DURATION_NS_U48),
+    ]
+
+    @pytest.fixture
+    def wide(self):
+        return RegisterCodec(RegisterMapper().map(self.ITEMS))
+
+    def test_roundtrip(self, wide):
+        value = (1 << 47) + 123_456_789
+        words = wide.encode({"timeout": value, "arm": True})
+
+        assert wide.cr_numbers == (6, 7, 8)
+        assert wide.decode(words) == {"arm": True, "timeout": value}
+        assert words[7] == value >> 16
+        assert words[8] >> 16 == value & 0xFFFF
+
+    def test_commit_bit_toggles_on_change_only(self, wide):
+        commit = 1 << 15
+        first = wide.encode({"timeout": 5})
+        assert first[8] & commit
+
+        assert wide.encode({"timeout": 5}, base=first) == first
+        second = wide.encode({"timeout": 6}, base=first)
+        assert not second[8] & commit
+
+    def test_delta_writes_commit_register_last(self, wide):
+        planner = DeltaPlanner(wide)
+        planner.update({"timeout": 1})
+
+        # Only the upper segment changes, but the commit CR must follow it
+        writes = planner.update({"timeout": 1 + (1 << 20)})
+
+        assert list(writes) == [7, 8]
+
+    def test_batch_matches_scalar(self, wide):
+        snapshots = wide.encode_batch([{"timeout": t * 987_654_321} for t in range(20)])
+        columns = wide.decode_batch(snapshots)
+
+        assert list(columns["timeout"]) == [t * 987_654_321 for t in range(20)]
+
+    def test_batch_rows_latch_in_sequence(self, wide):
+        """Writing batch rows in order gives a commit edge (and a latch) for every change."""
+        base = wide.encode({})
+        rows = [{"timeout": 100}, {"timeout": 200}, {"arm": True}, {"timeout": 300}, {"timeout": 300}]
+
+        snapshots = wide.encode_batch(rows, base)
+
+        assert latched(wide, "timeout", base, snapshots) == [100, 200, 0, 300, 300]
+        assert list(wide.encode_sequence(rows, base)) == snapshots
+
+    def test_pure_python_fallback(self, wide, monkeypatch):
+        monkeypatch.setattr(codec_module, "np", None)
+
+        snapshots = wide.encode_batch([{"timeout": 1 << 40}, {"timeout": 3}])
+
+        assert wide.decode_batch(snapshots)["timeout"] == [1 << 40, 3]
+
+    def test_package_default_spans_registers(self):
+        package = BasicAppsRegPackage(
+            app_name="TestApp",
+            datatypes=[DataTypeSpec(name="timeout", datatype=BasicAppDataTypes.PULSE_DURATION_NS_U48,
+                                    default_value=5_000_000_000)]
+        )
+
+        words = package.to_control_registers()
+
+        assert package.codec().decode(words)["timeout"] == 5_000_000_000
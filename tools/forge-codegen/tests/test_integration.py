@@ -86,7 +86,7 @@ datatypes:
         # Step 5: Generate VHDL
         output_dir = tmp_path / "vhdl"
         output_dir.mkdir()
-        template_dir = project_root / "forge" / "templates"
+        template_dir = project_root / "forge_codegen" / "templates"
 
         generate_vhdl(yaml_path, output_dir, template_dir)
 
@@ -237,7 +237,7 @@ datatypes:
 
         output_dir = tmp_path / "vhdl" / platform
         output_dir.mkdir(parents=True)
-        template_dir = project_root / "forge" / "templates"
+        template_dir = project_root / "forge_codegen" / "templates"
 
         # Generate VHDL
         generate_vhdl(yaml_path, output_dir, template_dir)
@@ -283,7 +283,7 @@ datatypes:
 
             output_dir = tmp_path / platform
             output_dir.mkdir()
-            template_dir = project_root / "forge" / "templates"
+            template_dir = project_root / "forge_codegen" / "templates"
 
             generate_vhdl(yaml_path, output_dir, template_dir)
 
@@ -15,7 +15,14 @@ from forge_codegen.models.mapper import (
     BADRegisterConfig,
     BADRegisterMapper,
 )
-from forge_codegen.basic_serialized_datatypes import BasicAppDataTypes
+from forge_codegen.basic_serialized_datatypes import (
+    BasicAppDataTypes,
+    FreeSpace,
+    MappingReport,
+    RegisterGeometry,
+    RegisterMapper,
+    get_geometry,
+)
 from forge_codegen.models import AppRegister, RegisterType
 
 
@@ -420,3 +427,540 @@ class TestEdgeCases:
         # 50 bits = 2 registers (32 + 18)
         assert len(report.register_map) == 2
         assert report.total_bits_used == 50
+
+
+class TestOptimalStrategy:
+    """Test the 'optimal' (exact bin packing) strategy."""
+
+    # best_fit packs 24, 24+8, 8 -> 3 registers; optimal is 24+8, 24+8 -> 2
+    ITEMS = [
+        ("delay_a", BasicAppDataTypes.PULSE_DURATION_US_U24),
+        ("delay_b", BasicAppDataTypes.PULSE_DURATION_US_U24),
+        ("level_a", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S8),
+        ("level_b", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S8),
+    ]
+
+    @staticmethod
+    def registers_used(mappings):
+        return len({m.cr_number for m in mappings})
+
+    def test_beats_best_fit(self):
+        """Test optimal uses fewer registers than best_fit."""
+        mapper = RegisterMapper()
+
+        assert self.registers_used(mapper.map(self.ITEMS, strategy="best_fit")) == 3
+        assert self.registers_used(mapper.map(self.ITEMS, strategy="optimal")) == 2
+
+    def test_fits_when_heuristics_overflow(self):
+        """Test 12 x 24-bit + 12 x 8-bit (exactly 384 bits) packs into 12 registers."""
+        items = [(f"d{i}", BasicAppDataTypes.PULSE_DURATION_US_U24) for i in range(12)]
+        items += [(f"v{i}", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S8) for i in range(12)]
+        mapper = RegisterMapper()
+
+        with pytest.raises(ValueError):
+            mapper.map(items, strategy="best_fit")
+
+        mappings = mapper.map(items, strategy="optimal")
+        assert self.registers_used(mappings) == 12
+        assert all(6 <= m.cr_number <= 17 for m in mappings)
+
+    def test_no_overlapping_bits(self):
+        """Test every bit is assigned at most once, MSB-first."""
+        items = self.ITEMS + [(f"flag_{i}", BasicAppDataTypes.BOOLEAN) for i in range(40)]
+        mappings = RegisterMapper().map(items, strategy="optimal")
+
+        used = set()
+        for m in mappings:
+            bits = {(m.cr_number, bit) for bit in range(m.bit_slice[1], m.bit_slice[0] + 1)}
+            assert not bits & used
+            used |= bits
+        assert len(mappings) == len(items)
+        # 104 bits -> 4 registers
+        assert self.registers_used(mappings) == 4
+
+    def test_time_budget_falls_back(self):
+        """Test a zero time budget still returns a valid packing no worse than best_fit."""
+        items = [(f"v{i}", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_U15) for i in range(17)]
+        items += [(f"w{i}", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_U7) for i in range(3)]
+        mapper = RegisterMapper(time_budget=0)
+
+        optimal = self.registers_used(mapper.map(items, strategy="optimal"))
+
+        assert optimal <= self.registers_used(mapper.map(items, strategy="best_fit"))
+
+    def test_compare_strategies(self):
+        """Test gap report between heuristics and optimal."""
+        comparison = RegisterMapper().compare_strategies(self.ITEMS)
+
+        assert comparison.optimal_registers == 2
+        assert comparison.proven_optimal
+        assert comparison.lower_bound == 2
+        assert comparison.gap["best_fit"] == 1
+        assert "optimal=2" in comparison.summary()
+
+    def test_pydantic_wrapper(self):
+        """Test BADRegisterMapper accepts strategy='optimal' and exposes the comparison."""
+        registers = [BADRegisterConfig(name=name, datatype=dtype) for name, dtype in self.ITEMS]
+        mapper = BADRegisterMapper(registers=registers, strategy="optimal")
+
+        assert len(mapper.generate_report().register_map) == 2
+        assert mapper.compare_strategies().gap["first_fit"] >= 0
+
+
+class TestUpdateFrequencyStrategy:
+    """Test the 'update_frequency' (hot/cold) strategy."""
+
+    ITEMS = [
+        ("arm_enable", BasicAppDataTypes.BOOLEAN),
+        ("ext_trigger_in", BasicAppDataTypes.BOOLEAN),
+        ("intensity", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16),
+        ("trig_out_duration", BasicAppDataTypes.PULSE_DURATION_NS_U16),
+        ("cooldown", BasicAppDataTypes.PULSE_DURATION_US_U24),
+        ("threshold", BasicAppDataTypes.VOLTAGE_INPUT_25V_S16),
+        ("timeout", BasicAppDataTypes.PULSE_DURATION_MS_U16),
+        ("level", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S8),
+    ]
+    RATES = {"arm_enable": 1.0, "ext_trigger_in": 1.0, "intensity": 1.0, "timeout": 0.01}
+
+    def test_hot_fields_share_one_register(self):
+        """Test every-shot fields land in the same CR."""
+        mappings = RegisterMapper().map(self.ITEMS, strategy="update_frequency", update_rates=self.RATES)
+        crs = {m.name: m.cr_number for m in mappings}
+
+        assert crs["arm_enable"] == crs["ext_trigger_in"] == crs["intensity"] == 6
+
+    def test_fewer_expected_writes_than_best_fit(self):
+        """Test expected CR writes per update drop vs best_fit."""
+        mapper = RegisterMapper()
+
+        def expected_writes(strategy):
+            mappings = mapper.map(self.ITEMS, strategy=strategy, update_rates=self.RATES)
+            return mapper.generate_report(mappings, update_rates=self.RATES).expected_writes_per_update
+
+        assert expected_writes("best_fit") == pytest.approx(2.01)
+        # Hot CR always written, timeout's CR 1% of the time
+        assert expected_writes("update_frequency") == pytest.approx(1.01)
+
+    def test_report_shows_expected_writes(self):
+        """Test report formats include expected writes only when rates are given."""
+        mapper = RegisterMapper()
+        mappings = mapper.map(self.ITEMS, strategy="update_frequency", update_rates=self.RATES)
+
+        report = mapper.generate_report(mappings, update_rates=self.RATES)
+        assert "Expected CR writes per update: 1.01" in report.to_ascii_art()
+        assert report.to_json()["summary"]["expected_writes_per_update"] == pytest.approx(1.01)
+
+        plain = mapper.generate_report(mappings)
+        assert plain.expected_writes_per_update is None
+        assert "expected_writes_per_update" not in plain.to_json()["summary"]
+
+    def test_invalid_rate_rejected(self):
+        """Test update rates outside [0, 1] are rejected."""
+        with pytest.raises(ValueError, match="must be in"):
+            RegisterMapper().map(self.ITEMS, strategy="update_frequency", update_rates={"intensity": 2.0})
+
+    def test_pydantic_update_rate(self):
+        """Test update_rate flows from BADRegisterConfig into the mapping and report."""
+        registers = [
+            BADRegisterConfig(name=name, datatype=dtype, update_rate=self.RATES.get(name))
+            for name, dtype in self.ITEMS
+        ]
+        mapper = BADRegisterMapper(registers=registers, strategy="update_frequency")
+
+        assert mapper.update_rates() == self.RATES
+        assert mapper.generate_report().expected_writes_per_update == pytest.approx(1.01)
+
+        with pytest.raises(ValueError):
+            BADRegisterConfig(name="x", datatype=BasicAppDataTypes.BOOLEAN, update_rate=1.5)
+
+
+class TestIncrementalMapping:
+    """Test incremental mapping against a previous mapping (lock)."""
+
+    ITEMS = [
+        ("intensity", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16),
+        ("delay", BasicAppDataTypes.PULSE_DURATION_NS_U8),
+        ("arm", BasicAppDataTypes.BOOLEAN),
+        ("cooldown", BasicAppDataTypes.PULSE_DURATION_US_U24),
+    ]
+
+    @staticmethod
+    def lock(mappings):
+        """Round-trip through the JSON lock format."""
+        mapper = RegisterMapper()
+        data = json.loads(json.dumps(mapper.generate_report(mappings).to_json()))
+        return MappingReport.from_json(data).mappings
+
+    @staticmethod
+    def slots(mappings):
+        return {m.name: (m.cr_number, m.bit_slice) for m in mappings}
+
+    def test_from_json_roundtrip(self):
+        """Test MappingReport.from_json inverts to_json."""
+        mappings = RegisterMapper().map(self.ITEMS)
+
+        assert self.lock(mappings) == mappings
+
+    def test_from_json_rejects_bad_entry(self):
+        """Test malformed lock entries are reported."""
+        with pytest.raises(ValueError, match="Invalid mapping entry"):
+            MappingReport.from_json({"mappings": [{"name": "x", "datatype": "nope",
+                                                   "cr_number": 6, "bit_slice": [0, 0]}]})
+
+    def test_added_field_keeps_existing_slots(self):
+        """Test adding a field leaves every existing slot untouched."""
+        mapper = RegisterMapper()
+        previous = self.lock(mapper.map(self.ITEMS))
+        items = self.ITEMS + [("level", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S8)]
+
+        # A full remap moves 'arm' to another register...
+        assert self.slots(mapper.map(items))["arm"] != self.slots(previous)["arm"]
+
+        # ...the incremental one does not
+        mappings = mapper.map(items, previous=previous)
+        slots = self.slots(mappings)
+        for name, slot in self.slots(previous).items():
+            assert slots[name] == slot
+        assert slots["level"][0] in {m.cr_number for m in previous}
+
+    def test_removed_and_resized_fields(self):
+        """Test removed fields free their slot and resized fields are re-placed."""
+        mapper = RegisterMapper()
+        previous = self.lock(mapper.map(self.ITEMS))
+        items = [
+            ("intensity", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16),
+            ("delay", BasicAppDataTypes.PULSE_DURATION_NS_U16),  # 8 -> 16 bits
+            ("arm", BasicAppDataTypes.BOOLEAN),
+        ]
+        mappings = mapper.map(items, previous=previous)
+        slots, old = self.slots(mappings), self.slots(previous)
+
+        assert slots["intensity"] == old["intensity"]
+        assert slots["arm"] == old["arm"]
+        assert slots["delay"] != old["delay"]
+        assert mappings[1].bit_width() == 16
+
+        occupied = set()
+        for m in mappings:
+            bits = {(m.cr_number, b) for b in range(m.bit_slice[1], m.bit_slice[0] + 1)}
+            assert not bits & occupied
+            occupied |= bits
+
+    def test_no_free_slot(self):
+        """Test an error when new fields cannot fit around locked ones."""
+        items = [(f"v{i}", BasicAppDataTypes.PULSE_DURATION_US_U24) for i in range(12)]
+        mapper = RegisterMapper()
+        previous = mapper.map(items)
+
+        with pytest.raises(ValueError, match="No free 16-bit slot"):
+            mapper.map(items + [("extra", BasicAppDataTypes.PULSE_DURATION_NS_U16)], previous=previous)
+
+
+class TestSpanningFields:
+    """Test fields wider than one register (split across consecutive CRs)."""
+
+    ITEMS = [
+        ("arm", BasicAppDataTypes.BOOLEAN),
+        ("timeout", BasicAppDataTypes.PULSE_DURATION_NS_U48),
+        ("intensity", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16),
+    ]
+
+    @staticmethod
+    def occupied_bits(mappings):
+        used = set()
+        for m in mappings:
+            bits = {(cr, b) for cr, msb, lsb in m.parts() for b in range(lsb, msb + 1)}
+            if m.commit_bit is not None:
+                bits.add(m.commit_bit)
+            assert not bits & used
+            used |= bits
+        return used
+
+    @pytest.mark.parametrize("strategy", ["first_fit", "best_fit", "type_clustering", "optimal",
+                                          "update_frequency"])
+    def test_layout(self, strategy):
+        """Test a 48-bit field takes a full CR plus the top half of the next, then the commit bit."""
+        mappings = RegisterMapper().map(self.ITEMS, strategy=strategy)
+        timeout = next(m for m in mappings if m.name == "timeout")
+
+        assert timeout.is_spanning
+        assert timeout.segments == ((7, 31, 0), (8, 31, 16))
+        assert timeout.commit_bit == (8, 15)
+        assert timeout.bit_width() == 48
+        assert timeout.to_vhdl_slice() == "app_reg_7(31 downto 0) & app_reg_8(31 downto 16)"
+        self.occupied_bits(mappings)
+
+    def test_report_lists_every_segment(self):
+        """Test the report shows a spanning field in each CR it touches."""
+        mapper = RegisterMapper()
+        report = mapper.generate_report(mapper.map(self.ITEMS))
+
+        assert set(report.register_map) == {6, 7, 8}
+        art = report.to_ascii_art()
+        assert "[31:0] timeout[47:16] (32-bit)" in art
+        assert "[31:16] timeout[15:0] (16-bit) | [15:15] timeout.commit (1-bit)" in art
+
+    def test_lock_roundtrip(self):
+        """Test segments and commit bit survive the JSON lock format."""
+        mapper = RegisterMapper()
+        mappings = mapper.map(self.ITEMS)
+        data = json.loads(json.dumps(mapper.generate_report(mappings).to_json()))
+
+        assert MappingReport.from_json(data).mappings == mappings
+
+    def test_report_pipeline_latency(self):
+        """Test shim pipeline stages add to the reported latency, and spanning fields add their shadow."""
+        mapper = RegisterMapper()
+        report = mapper.generate_report(mapper.map(self.ITEMS))
+        plain = mapper.generate_report(mapper.map(self.ITEMS[:1]))
+        assert (plain.latency_cycles, report.latency_cycles) == (1, 2)
+        assert "pipeline" not in json.dumps(report.to_json())
+
+        piped = MappingReport(report.mappings, report.total_bits_used, pipeline_stages=3)
+        assert piped.latency_cycles == 5
+        assert "Shim pipeline: 3 stage(s), +3 cycles (CR write to signal: 5 cycles)" in piped.to_ascii_art()
+        data = json.loads(json.dumps(piped.to_json()))
+        assert data["summary"]["latency_cycles"] == 5
+        assert MappingReport.from_json(data).pipeline_stages == 3
+        with pytest.raises(ValueError, match="pipeline_stages"):
+            MappingReport(report.mappings, report.total_bits_used, pipeline_stages=-1)
+
+    def test_incremental_keeps_spanning_slot(self):
+        """Test a locked spanning field stays put and a new one takes free CRs."""
+        mapper = RegisterMapper()
+        previous = mapper.map(self.ITEMS)
+        items = self.ITEMS + [
+            ("holdoff", BasicAppDataTypes.PULSE_DURATION_NS_U48),
+            ("level", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S8),
+        ]
+        mappings = mapper.map(items, previous=previous)
+        by_name = {m.name: m for m in mappings}
+
+        assert by_name["timeout"] == next(m for m in previous if m.name == "timeout")
+        assert by_name["holdoff"].segments == ((9, 31, 0), (10, 31, 16))
+        self.occupied_bits(mappings)
+
+    def test_not_enough_registers(self):
+        """Test an error when the span would run past CR17."""
+        items = [(f"t{i}", BasicAppDataTypes.PULSE_DURATION_NS_U48) for i in range(6)]
+        items.append(("extra", BasicAppDataTypes.PULSE_DURATION_NS_U8))
+
+        with pytest.raises(ValueError, match="consecutive registers"):
+            RegisterMapper().map(items)
+
+    def test_compare_strategies_counts_span(self):
+        """Test strategy comparison counts every register of the span."""
+        comparison = RegisterMapper().compare_strategies(self.ITEMS)
+
+        assert comparison.optimal_registers == 3
+        assert comparison.registers_used["best_fit"] == 3
+
+
+class TestPinnedPlacement:
+    """Test pinned (control_register/bit_range) fields mixed with auto-packing."""
+
+    ITEMS = [
+        ("arm", BasicAppDataTypes.BOOLEAN),
+        ("timeout", BasicAppDataTypes.PULSE_DURATION_S_U16),
+        ("intensity", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16),
+        ("cooldown", BasicAppDataTypes.PULSE_DURATION_US_U24),
+    ]
+
+    def test_pins_honoured_and_rest_packed_around(self):
+        """Test pinned fields keep their slots and the others fill free bits."""
+        pins = {"arm": (6, (0, 0)), "timeout": (7, (15, 0))}
+        mappings = RegisterMapper().map(self.ITEMS, pins=pins)
+        slots = {m.name: (m.cr_number, m.bit_slice) for m in mappings}
+
+        assert slots["arm"] == (6, (0, 0))
+        assert slots["timeout"] == (7, (15, 0))
+        assert slots["cooldown"] == (6, (31, 8))
+        assert slots["intensity"] == (7, (31, 16))
+        assert [m.name for m in mappings] == [name for name, _ in self.ITEMS]
+
+    def test_pins_win_over_previous(self):
+        """Test a pin moves a locked field and the displaced field is re-placed."""
+        mapper = RegisterMapper()
+        previous = mapper.map(self.ITEMS)
+        taken = next(m for m in previous if m.name == "intensity")
+
+        mappings = mapper.map(self.ITEMS, previous=previous,
+                              pins={"timeout": (taken.cr_number, taken.bit_slice)})
+        slots = {m.name: (m.cr_number, m.bit_slice) for m in mappings}
+
+        assert slots["timeout"] == (taken.cr_number, taken.bit_slice)
+        assert slots["intensity"] != slots["timeout"]
+
+    def test_optimal_packs_around_pins(self):
+        """Test optimal solves the free space left by pins instead of falling back to first-fit."""
+        geometry = RegisterGeometry("tiny", first_cr=1, last_cr=3)
+        u15 = BasicAppDataTypes.VOLTAGE_OUTPUT_05V_U15
+        items = [(f"f{i}", dtype) for i, dtype in enumerate([
+            BasicAppDataTypes.BOOLEAN, u15, BasicAppDataTypes.BOOLEAN, BasicAppDataTypes.PULSE_DURATION_US_U24,
+            u15, BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S8, u15, u15,
+        ])]
+        mapper = RegisterMapper(geometry=geometry)
+        pins = {"f0": (1, (0, 0))}
+
+        mappings = mapper.map(items, strategy="optimal", pins=pins)
+        used = {}
+        for m in mappings:
+            mask = ((1 << m.bit_width()) - 1) << m.bit_slice[1]
+            assert not used.get(m.cr_number, 0) & mask
+            used[m.cr_number] = used.get(m.cr_number, 0) | mask
+        assert {m.name: (m.cr_number, m.bit_slice) for m in mappings}["f0"] == (1, (0, 0))
+        assert sum(m.bit_width() for m in mappings) == 94
+
+        # Width-descending first-fit cannot, and the message does not mention a previous mapping
+        with pytest.raises(ValueError, match=r"No free 8-bit slot for 'f5' around the pinned fields$"):
+            mapper.map(items, strategy="best_fit", pins=pins)
+        with pytest.raises(ValueError, match="remap without the previous mapping"):
+            mapper.map(items, strategy="best_fit", pins=pins, previous=mapper.map(items[:1], pins=pins))
+
+    def test_overlap_message_names_both_fields(self):
+        """Test overlapping pins report both fields and their slots."""
+        pins = {"timeout": (7, (15, 0)), "intensity": (7, (20, 5))}
+
+        with pytest.raises(ValueError, match=r"'intensity' \(CR7\[20:5\]\) and 'timeout' \(CR7\[15:0\]\) overlap"):
+            RegisterMapper().map(self.ITEMS, pins=pins)
+
+    @pytest.mark.parametrize("pin, message", [
+        ((5, (15, 0)), "outside CR6-CR17"),
+        ((7, (32, 17)), "invalid bit range"),
+        ((7, (16, 0)), "is 17 bits, but pulse_duration_s_u16 is 16 bits"),
+    ])
+    def test_invalid_pin(self, pin, message):
+        """Test out-of-range and wrong-width pins are rejected."""
+        with pytest.raises(ValueError, match=message):
+            RegisterMapper().map(self.ITEMS, pins={"timeout": pin})
+
+    def test_unknown_pin(self):
+        """Test pins for fields that are not mapped are rejected."""
+        with pytest.raises(ValueError, match="Pin for unknown field 'nope'"):
+            RegisterMapper().map(self.ITEMS, pins={"nope": (6, (0, 0))})
+
+    def test_fully_pinned_large_spec(self):
+        """Test 384 pinned 1-bit fields validate, and one duplicate bit is caught."""
+        items = [(f"f{i}", BasicAppDataTypes.BOOLEAN) for i in range(384)]
+        pins = {f"f{i}": (6 + i // 32, (i % 32, i % 32)) for i in range(384)}
+
+        mappings = RegisterMapper().map(items, pins=pins)
+        assert len({(m.cr_number, m.bit_slice) for m in mappings}) == 384
+
+        pins["f383"] = (6, (5, 5))
+        with pytest.raises(ValueError, match=r"'f383' \(CR6\[5\]\) and 'f5' \(CR6\[5\]\) overlap"):
+            RegisterMapper().map(items, pins=pins)
+
+    def test_pydantic_pin_notation(self):
+        """Test BADRegisterConfig parses YAML-style pins."""
+        mapper = BADRegisterMapper(registers=[
+            BADRegisterConfig(name="arm", datatype=BasicAppDataTypes.BOOLEAN,
+                              control_register="CR9", bit_range="[3]"),
+            BADRegisterConfig(name="timeout", datatype=BasicAppDataTypes.PULSE_DURATION_S_U16,
+                              control_register=8, bit_range="[15:0]"),
+        ])
+
+        assert mapper.pins() == {"arm": (9, (3, 3)), "timeout": (8, (15, 0))}
+        slots = {m.name: (m.cr_number, m.bit_slice) for m in mapper.to_register_mappings()}
+        assert slots == {"arm": (9, (3, 3)), "timeout": (8, (15, 0))}
+
+    def test_pydantic_pin_requires_both(self):
+        """Test control_register without bit_range is rejected."""
+        with pytest.raises(ValueError, match="must be given together"):
+            BADRegisterConfig(name="arm", datatype=BasicAppDataTypes.BOOLEAN, control_register="CR9")
+
+
+class TestRegisterGeometry:
+    """Test configurable register geometry and the bitset free-space model."""
+
+    ITEMS = [
+        ("a", BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16),
+        ("b", BasicAppDataTypes.PULSE_DURATION_NS_U8),
+        ("c", BasicAppDataTypes.BOOLEAN),
+    ]
+
+    def test_profiles(self):
+        """Test the default profile matches the historical CR6-CR17 layout."""
+        assert RegisterMapper().geometry == get_geometry("basic_app")
+        assert get_geometry("basic_app").total_bits == 384
+        assert get_geometry("forge").describe() == "CR1-CR15 (15 x 32 bits)"
+        with pytest.raises(ValueError, match="Unknown register geometry"):
+            get_geometry("moku_nano")
+
+    @pytest.mark.parametrize("strategy", ["first_fit", "best_fit", "optimal", "update_frequency"])
+    def test_mapping_starts_at_first_cr(self, strategy):
+        """Test every strategy numbers registers from the geometry's first CR."""
+        mapper = RegisterMapper(geometry=get_geometry("forge"))
+        mappings = mapper.map(self.ITEMS, strategy=strategy)
+        assert {m.cr_number for m in mappings} == {1}
+
+        report = mapper.generate_report(mappings)
+        assert report.total_bits_available == 15 * 32
+        assert "Registers used: 1/15" in report.to_ascii_art()
+        assert "CR15  [31:0] UNUSED" in report.to_ascii_art()
+
+    def test_pins_checked_against_geometry(self):
+        """Test pins outside the geometry are rejected with its range."""
+        mapper = RegisterMapper(geometry=get_geometry("forge"))
+        assert mapper.map(self.ITEMS, pins={"c": (1, (0, 0))})[2].cr_number == 1
+        with pytest.raises(ValueError, match="outside CR1-CR15"):
+            mapper.map(self.ITEMS, pins={"c": (16, (0, 0))})
+
+    def test_narrow_registers(self):
+        """Test a 16-bit geometry packs and spans by its own width."""
+        mapper = RegisterMapper(geometry=RegisterGeometry("narrow", first_cr=0, last_cr=7, bits_per_register=16))
+        items = [("x", BasicAppDataTypes.PULSE_DURATION_NS_U32), ("y", BasicAppDataTypes.PULSE_DURATION_NS_U8)]
+        by_name = {m.name: m for m in mapper.map(items)}
+
+        assert by_name["y"].cr_number == 0
+        assert by_name["x"].segments == ((1, 15, 0), (2, 15, 0))
+        assert by_name["x"].commit_bit == (3, 15)
+
+    def test_json_roundtrip_keeps_geometry(self):
+        """Test a non-default geometry survives to_json/from_json (default is omitted)."""
+        geometry = get_geometry("forge")
+        mapper = RegisterMapper(geometry=geometry)
+        report = mapper.generate_report(mapper.map(self.ITEMS))
+
+        restored = MappingReport.from_json(json.loads(json.dumps(report.to_json())))
+        assert restored.geometry == geometry
+        assert "geometry" not in RegisterMapper().generate_report(RegisterMapper().map(self.ITEMS)).to_json()
+
+    def test_free_space_finds_highest_run(self):
+        """Test FreeSpace returns the first register and highest free run."""
+        space = FreeSpace(RegisterGeometry("t", first_cr=4, last_cr=6))
+        space.claim(4, 0xFFFF0000)
+        space.claim(4, 0x00000F00)
+        assert space.find_slot(8) == (4, 7)
+        assert space.find_slot(17) == (5, 31)
+        space.claim(5, 1 << 31)
+        assert space.find_slot(32) == (6, 31)
+        assert space.find_empty_run(2) is None
+        assert not space.fits(7, 1)
+        assert space.free_runs() == [(4, 15, 4), (4, 7, 8), (5, 30, 31)]
+
+    def test_large_geometry(self):
+        """Test thousands of fields across hundreds of registers map without overlap."""
+        geometry = RegisterGeometry("large", first_cr=0, last_cr=1023)
+        items = [(f"f{i}", dtype) for i, dtype in enumerate([
+            BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16,
+            BasicAppDataTypes.PULSE_DURATION_NS_U8,
+            BasicAppDataTypes.BOOLEAN,
+        ] * 1000)]
+        mapper = RegisterMapper(geometry=geometry)
+
+        for strategy in ("best_fit", "optimal", "update_frequency"):
+            mappings = mapper.map(items, strategy=strategy)
+            slots = [(m.cr_number, bit) for m in mappings for bit in range(m.bit_slice[1], m.bit_slice[0] + 1)]
+            assert len(slots) == len(set(slots)) == 25000
+
+        added = mapper.map(items + [("extra", BasicAppDataTypes.PULSE_DURATION_NS_U8)], previous=mappings)
+        assert set(added[:-1]) == set(mappings)
+
+    def test_pydantic_geometry(self):
+        """Test BADRegisterMapper resolves and validates its geometry profile."""
+        registers = [BADRegisterConfig(name="arm", datatype=BasicAppDataTypes.BOOLEAN)]
+        mapper = BADRegisterMapper(registers=registers, geometry="forge")
+        assert mapper.to_register_mappings()[0].cr_number == 1
+        with pytest.raises(ValueError, match="Unknown register geometry"):
+            BADRegisterMapper(registers=registers, geometry="moku_nano")
@@ -318,6 +318,77 @@ class TestBasicAppsRegPackage:
         assert 'display_name: null' not in content
         assert 'units: null' not in content
 
+    def test_update_rate_hint(self):
+        """Test update_rate drives the 'update_frequency' strategy."""
+        package = BasicAppsRegPackage(
+            app_name="HotCold",
+            datatypes=[
+                DataTypeSpec(name="timeout", datatype=BasicAppDataTypes.PULSE_DURATION_MS_U16),
+                DataTypeSpec(name="threshold", datatype=BasicAppDataTypes.VOLTAGE_INPUT_25V_S16),
+                DataTypeSpec(name="arm_enable", datatype=BasicAppDataTypes.BOOLEAN, update_rate=1.0),
+                DataTypeSpec(name="intensity", datatype=BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16,
+                             update_rate=1.0),
+            ],
+            mapping_strategy="update_frequency"
+        )
+        crs = {m.name: m.cr_number for m in package.generate_mapping()}
+
+        assert crs["arm_enable"] == crs["intensity"]
+
+        with pytest.raises(ValueError):
+            DataTypeSpec(name="x", datatype=BasicAppDataTypes.BOOLEAN, update_rate=-0.1)
+
+    def test_update_rate_yaml_roundtrip(self, tmp_path):
+        """Test update_rate survives to_yaml/from_yaml."""
+        package = BasicAppsRegPackage(
+            app_name="HotCold",
+            datatypes=[DataTypeSpec(name="arm", datatype=BasicAppDataTypes.BOOLEAN, update_rate=0.5)]
+        )
+        yaml_path = tmp_path / "hot.yaml"
+        package.to_yaml(yaml_path)
+
+        assert BasicAppsRegPackage.from_yaml(yaml_path).datatypes[0].update_rate == 0.5
+
+    def test_pinned_yaml_roundtrip(self, tmp_path):
+        """Test control_register/bit_range pins survive to_yaml/from_yaml and drive the mapping."""
+        package = BasicAppsRegPackage(
+            app_name="Pinned",
+            datatypes=[
+                DataTypeSpec(name="arm", datatype=BasicAppDataTypes.BOOLEAN,
+                             control_register="CR10", bit_range="[0]"),
+                DataTypeSpec(name="intensity", datatype=BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16),
+            ]
+        )
+        yaml_path = tmp_path / "pinned.yaml"
+        package.to_yaml(yaml_path)
+
+        assert "control_register: CR10" in yaml_path.read_text()
+        loaded = BasicAppsRegPackage.from_yaml(yaml_path)
+        assert (loaded.datatypes[0].control_register, loaded.datatypes[0].bit_range) == (10, (0, 0))
+
+        slots = {m.name: (m.cr_number, m.bit_slice) for m in loaded.generate_mapping()}
+        assert slots["arm"] == (10, (0, 0))
+        assert slots["intensity"] == (6, (31, 16))
+
+    def test_register_geometry(self, tmp_path):
+        """Test register_geometry drives the bit limit, the mapping and YAML output."""
+        datatypes = [
+            DataTypeSpec(name=f"reg_{i}", datatype=BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16)
+            for i in range(26)
+        ]
+        with pytest.raises(ValueError, match="exceeds 384-bit limit"):
+            BasicAppsRegPackage(app_name="Wide", datatypes=datatypes)
+
+        package = BasicAppsRegPackage(app_name="Wide", datatypes=datatypes, register_geometry="forge")
+        assert {m.cr_number for m in package.generate_mapping()} == set(range(1, 14))
+
+        yaml_path = tmp_path / "wide.yaml"
+        package.to_yaml(yaml_path)
+        assert BasicAppsRegPackage.from_yaml(yaml_path).register_geometry == "forge"
+
+        with pytest.raises(ValueError, match="Unknown register geometry"):
+            BasicAppsRegPackage(app_name="Wide", datatypes=datatypes[:1], register_geometry="moku_nano")
+
 
 class TestMokuConfigIntegration:
     """Test integration with moku-models."""
@@ -412,6 +483,66 @@ class TestMokuConfigIntegration:
         assert len(config.slots[1].control_registers) == len(control_regs)
 
 
+class TestTrustedSnapshot:
+    """Test the validate-once snapshot fast path."""
+
+    @pytest.fixture
+    def yaml_path(self, tmp_path):
+        package = BasicAppsRegPackage(
+            app_name="Trusted",
+            datatypes=[
+                DataTypeSpec(name="arm", datatype=BasicAppDataTypes.BOOLEAN, default_value=True,
+                             control_register="CR9", bit_range="[3]"),
+                DataTypeSpec(name="intensity", datatype=BasicAppDataTypes.VOLTAGE_OUTPUT_05V_S16,
+                             default_value=2400, min_value=0, max_value=5000, update_rate=0.5),
+            ],
+            register_geometry="forge",
+        )
+        path = tmp_path / "trusted.yaml"
+        package.to_yaml(path)
+        return path
+
+    def test_second_load_uses_snapshot(self, yaml_path, tmp_path):
+        """Test the first load validates and the second is built from the snapshot."""
+        first = BasicAppsRegPackage.from_yaml_trusted(yaml_path, tmp_path / "snap")
+        second = BasicAppsRegPackage.from_yaml_trusted(yaml_path, tmp_path / "snap")
+
+        assert len(list((tmp_path / "snap").glob("*.pkg"))) == 1
+        assert not first._trusted and second._trusted
+        assert second.model_dump() == first.model_dump()
+        assert second.datatypes[0].datatype is BasicAppDataTypes.BOOLEAN
+        assert second.generate_mapping() == first.generate_mapping()
+
+    def test_changed_yaml_is_revalidated(self, yaml_path, tmp_path):
+        """Test edited YAML misses the snapshot and goes through validation."""
+        BasicAppsRegPackage.from_yaml_trusted(yaml_path, tmp_path / "snap")
+        yaml_path.write_text(yaml_path.read_text().replace("default_value: 2400", "default_value: 99999"))
+
+        with pytest.raises(ValueError, match="above max"):
+            BasicAppsRegPackage.from_yaml_trusted(yaml_path, tmp_path / "snap")
+
+    def test_stale_or_corrupt_snapshot_is_ignored(self, yaml_path, tmp_path):
+        """Test snapshots from another schema, or truncated ones, are not loaded."""
+        BasicAppsRegPackage.from_yaml_trusted(yaml_path, tmp_path / "snap")
+        (snapshot,) = (tmp_path / "snap").glob("*.pkg")
+        data = snapshot.read_bytes()
+
+        snapshot.write_bytes(data[:6] + bytes(32) + data[38:])
+        assert BasicAppsRegPackage.load_snapshot(snapshot) is None
+        snapshot.write_bytes(data[:-5])
+        assert BasicAppsRegPackage.load_snapshot(snapshot) is None
+
+        reloaded = BasicAppsRegPackage.from_yaml_trusted(yaml_path, tmp_path / "snap")
+        assert not reloaded._trusted
+        assert BasicAppsRegPackage.load_snapshot(snapshot)._trusted
+
+    def test_duplicate_names_reported_once(self):
+        """Test the duplicate check names each repeated field."""
+        datatypes = [DataTypeSpec(name=f"f{i % 300}", datatype=BasicAppDataTypes.BOOLEAN) for i in range(302)]
+        with pytest.raises(ValueError, match=r"Duplicate datatype names found: \{'f[01]', 'f[01]'\}"):
+            BasicAppsRegPackage(app_name="Dup", datatypes=datatypes, register_geometry="cloud_compile")
+
+
 class TestEdgeCases:
     """Edge case tests."""
 
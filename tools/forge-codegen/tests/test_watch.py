@@ -0,0 +1,99 @@
+"""
+Tests for codegen watch mode (change detection, debouncing, stage reuse).
+"""
+
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+from forge_codegen.generator.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    WatchSession,
+    wait_for_changes,
+)
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "forge_codegen" / "templates"
+
+SPEC = """
+app_name: "WatchApp"
+platform: "moku_go"
+mapping_strategy: "best_fit"
+datatypes:
+  - name: "intensity"
+    datatype: "voltage_output_05v_s16"
+  - name: "arm"
+    datatype: "boolean"
+"""
+
+
+def write_burst(paths, gap=0.02):
+    """Write each path in turn from a background thread, gap seconds apart."""
+    def run():
+        for path in paths:
+            time.sleep(gap)
+            path.write_text(path.read_text() + "\n")
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+class TestWatchMode:
+    """Test incremental regeneration and the file watchers."""
+
+    def test_session_reruns_only_affected_stages(self, tmp_path):
+        """Test template edits only re-render, and comment-only spec edits skip the mapping."""
+        templates = tmp_path / "templates"
+        shutil.copytree(TEMPLATE_DIR, templates)
+        yaml_path = tmp_path / "watch.yaml"
+        yaml_path.write_text(SPEC)
+        shim_path = tmp_path / "out" / "WatchApp_custom_inst_shim.vhd"
+        session = WatchSession(yaml_path, tmp_path / "out", templates)
+
+        assert session.regenerate() == ["load", "map", "render"]
+        assert "arm" in shim_path.read_text()
+
+        shim_template = templates / "shim.vhd.j2"
+        shim_template.write_text("-- watched\n" + shim_template.read_text())
+        assert session.regenerate({shim_template.resolve()}) == ["render"]
+        assert shim_path.read_text().startswith("-- watched\n")
+
+        yaml_path.write_text(SPEC + "# comment only\n")
+        assert session.regenerate({yaml_path.resolve()}) == ["load", "render"]
+
+        yaml_path.write_text(SPEC.replace('"arm"', '"armed"'))
+        assert session.regenerate({yaml_path.resolve()}) == ["load", "map", "render"]
+        assert "armed" in shim_path.read_text()
+
+        # A broken save keeps the last good state; the next good save carries on
+        yaml_path.write_text("datatypes: [")
+        with pytest.raises(yaml.YAMLError):
+            session.regenerate({yaml_path.resolve()})
+        yaml_path.write_text(SPEC.replace('"arm"', '"armed"'))
+        assert session.regenerate({yaml_path.resolve()}) == ["render"]
+
+    @pytest.mark.parametrize("watcher_class", [PollingWatcher, InotifyWatcher])
+    def test_watcher_debounces_bursts(self, tmp_path, watcher_class):
+        """Test a burst of saves to several files is reported as one change set."""
+        spec, template, other = tmp_path / "a.yaml", tmp_path / "b.j2", tmp_path / "notes.txt"
+        for path in (spec, template, other):
+            path.write_text("x")
+        match = lambda path: path.suffix in (".yaml", ".j2")  # noqa: E731
+        try:
+            watcher = watcher_class([tmp_path], match, interval=0.005) if watcher_class is PollingWatcher \
+                else watcher_class([tmp_path], match)
+        except OSError as e:
+            pytest.skip(f"inotify unavailable: {e}")
+        try:
+            assert watcher.wait(timeout=0.05) == set()
+            thread = write_burst([spec, other, template])
+            changed = wait_for_changes(watcher, debounce=0.2, timeout=2)
+            thread.join()
+            assert changed == {spec.resolve(), template.resolve()}
+            assert wait_for_changes(watcher, debounce=0.05, timeout=0.1) == set()
+        finally:
+            watcher.close()